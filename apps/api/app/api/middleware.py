@@ -0,0 +1,61 @@
+"""ASGI middleware shared by every API route."""
+
+from __future__ import annotations
+
+from time import perf_counter
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import get_settings
+from app.services.metrics_service import observe_request
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_budget_ms(route: str) -> float | None:
+  """Return the latency budget for ``route``; ``0`` in settings disables the check."""
+  settings = get_settings()
+  budget = settings.metrics_route_budgets_ms.get(route, settings.metrics_default_budget_ms)
+  return budget if budget > 0 else None
+
+
+def route_template(scope: Scope) -> str:
+  """Return the route template ``scope`` was dispatched to, e.g. ``/api/v1/strategies/{strategy_id}``."""
+  template = getattr(scope.get("route"), "path", None)
+  if template is None:
+    if "endpoint" in scope and not scope.get("path_params"):
+      # Plain Starlette routes such as /docs have no parameters to collapse.
+      return scope["path"]
+    return UNMATCHED_ROUTE
+  if ":path}" in template:
+    # A path convertor spans segments, so the prefix cannot be recovered by counting.
+    return template
+  # Newer FastAPI resolves included routers lazily, leaving only the router-relative
+  # template on the route.  Each template segment matched exactly one path segment, so
+  # whatever precedes them in the request path is the include prefix (empty when the
+  # template is already complete).
+  return scope["path"].rsplit("/", template.count("/"))[0] + template
+
+
+class LatencyMetricsMiddleware:
+  """Record every HTTP request in the latency histograms.
+
+  Requests are labelled with the matched route template rather than the raw path, so
+  ids in URLs do not create new series; paths no route matched share one label.
+  Streaming responses are timed until their last chunk is sent.
+  """
+
+  def __init__(self, app: ASGIApp) -> None:
+    self.app = app
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    start = perf_counter()
+    try:
+      await self.app(scope, receive, send)
+    finally:
+      route = route_template(scope)
+      observe_request(scope["method"], route, perf_counter() - start, route_budget_ms(route))
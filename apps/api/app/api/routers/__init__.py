@@ -1,13 +1,25 @@
 """API routers package."""
 
-from app.api.routers import analytics, auth, education, health, strategy_versions, templates, workspaces
+from app.api.routers import (
+  analytics,
+  auth,
+  education,
+  graph_validation,
+  health,
+  metrics,
+  strategy_versions,
+  templates,
+  workspaces
+)
 
 __all__ = [
   "auth",
   "health",
   "workspaces",
   "strategy_versions",
+  "graph_validation",
   "templates",
   "education",
-  "analytics"
+  "analytics",
+  "metrics"
 ]
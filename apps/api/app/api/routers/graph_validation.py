@@ -0,0 +1,50 @@
+"""Batch graph validation endpoints."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app.api.schemas.graph_validation import GraphValidationBatchRequest, GraphValidationBatchResult
+from app.auth.dependencies import require_compliance_consent
+from app.auth.schemas import AuthenticatedUser
+from app.config import get_settings
+from app.services.graph_validation_service import render_issues, validate_graphs_batch
+from app.services.strategy_version_service import determine_plan
+
+router = APIRouter(prefix="/graphs", tags=["Graph Validation"])
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+@router.post("/validate-batch", response_class=StreamingResponse)
+async def validate_graph_batch(
+  payload: GraphValidationBatchRequest,
+  user: AuthenticatedUser = Depends(require_compliance_consent)
+) -> StreamingResponse:
+  """Validate many graphs in parallel and stream one NDJSON result per graph as it finishes."""
+  max_graphs = get_settings().validation_batch_max_graphs
+  if len(payload.graphs) > max_graphs:
+    raise HTTPException(
+      status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+      detail=f"Batch validation accepts at most {max_graphs} graphs"
+    )
+
+  # Like single-graph validation, the plan comes from the caller's roles, never the body.
+  plan = determine_plan(user)
+
+  async def stream() -> AsyncIterator[str]:
+    work = ((item.graph, plan) for item in payload.graphs)
+    async for index, outcome in validate_graphs_batch(work):
+      result = GraphValidationBatchResult(
+        index=index,
+        id=payload.graphs[index].id,
+        plan=plan,
+        issues=render_issues(outcome.issues),
+        executionOrder=outcome.execution_order
+      )
+      yield result.model_dump_json() + "\n"
+
+  return StreamingResponse(stream(), media_type=NDJSON_MEDIA_TYPE)
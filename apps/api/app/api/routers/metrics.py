@@ -0,0 +1,13 @@
+"""Prometheus scrape endpoint."""
+
+from fastapi import APIRouter, Response
+
+from app.services.metrics_service import PROMETHEUS_CONTENT_TYPE, get_metrics_registry
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", summary="Prometheus metrics", include_in_schema=False)
+def read_metrics() -> Response:
+  """Return latency histograms and budget violation counters in the text format."""
+  return Response(content=get_metrics_registry().render(), media_type=PROMETHEUS_CONTENT_TYPE)
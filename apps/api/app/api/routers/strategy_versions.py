@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import hashlib
+from collections.abc import Callable
+from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.schemas.strategy_versions import (
+  HistoryView,
+  IssueFormat,
   StrategyVersionCreateRequest,
   StrategyVersionCreateResponse,
+  StrategyVersionDetailResponse,
+  StrategyVersionDiffResponse,
+  StrategyVersionHistoryEntry,
+  StrategyVersionImportResponse,
   StrategyVersionListResponse,
   StrategyVersionSummary,
   StrategyVersionValidateRequest,
@@ -17,20 +27,76 @@ from app.api.schemas.strategy_versions import (
 )
 from app.auth.dependencies import require_compliance_consent
 from app.auth.schemas import AuthenticatedUser
-from app.db.session import get_db
+from app.config import get_settings
+from app.db.session import get_db, get_session_factory
 from app.models.strategy import StrategyVersion
 from app.services import strategy_version_service
+from app.services.graph_validation_service import compact_issues, render_issues
 
 router = APIRouter(prefix="/strategies/{strategy_id}/versions", tags=["Strategy Versions"])
 
+# Clients may cache history privately but must revalidate with If-None-Match each time.
+HISTORY_CACHE_CONTROL = "private, no-cache"
 
-def _to_summary(model: StrategyVersion) -> StrategyVersionSummary:
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _etag(*parts: Any) -> str:
+  digest = hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+  return f'"{digest[:32]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+  if not if_none_match:
+    return False
+  candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+  return "*" in candidates or etag in candidates
+
+
+async def _history_etag(
+  session: AsyncSession,
+  strategy_id: UUID,
+  user: AuthenticatedUser,
+  *variant: Any
+) -> str:
+  latest_version, updated_at = await strategy_version_service.history_marker(session, strategy_id, user)
+  stamp = updated_at.isoformat() if updated_at else ""
+  return _etag(strategy_id, latest_version, stamp, *variant)
+
+
+def _not_modified(etag: str) -> Response:
+  return Response(
+    status_code=status.HTTP_304_NOT_MODIFIED,
+    headers={"ETag": etag, "Cache-Control": HISTORY_CACHE_CONTROL}
+  )
+
+
+def _to_summary(model: StrategyVersion, issue_format: IssueFormat = "full") -> StrategyVersionSummary:
+  if issue_format == "compact":
+    issues = compact_issues(model.validation_issues)
+  else:
+    issues = render_issues(model.validation_issues)
   return StrategyVersionSummary(
     id=model.id,
     version=model.version,
     label=model.label,
-    graph=model.graph_json,
-    validationIssues=list(model.validation_issues or []),
+    graph=model.graph,
+    validationIssues=issues,
+    executionOrder=model.execution_order,
+    createdAt=model.created_at,
+    updatedAt=model.updated_at
+  )
+
+
+def _to_history_entry(model: StrategyVersion) -> StrategyVersionHistoryEntry:
+  return StrategyVersionHistoryEntry(
+    id=model.id,
+    version=model.version,
+    label=model.label,
+    nodeCount=model.node_count,
+    edgeCount=model.edge_count,
+    errorCount=model.error_count,
+    warningCount=model.warning_count,
     createdAt=model.created_at,
     updatedAt=model.updated_at
   )
@@ -39,12 +105,43 @@ def _to_summary(model: StrategyVersion) -> StrategyVersionSummary:
 @router.get("", response_model=StrategyVersionListResponse)
 async def list_strategy_versions(
   strategy_id: UUID,
+  response: Response,
+  issue_format: IssueFormat = Query("full", alias="issueFormat"),
+  view: HistoryView = Query("full"),
+  limit: int | None = Query(None, ge=1, le=200),
+  cursor: str | None = Query(None),
+  if_none_match: str | None = Header(None),
   user: AuthenticatedUser = Depends(require_compliance_consent),
   session: AsyncSession = Depends(get_db)
-) -> StrategyVersionListResponse:
-  """Return the version history for the requested strategy."""
-  versions = await strategy_version_service.list_versions(session, strategy_id, user)
-  return StrategyVersionListResponse(versions=[_to_summary(version) for version in versions])
+) -> StrategyVersionListResponse | Response:
+  """Return one page of version history for the requested strategy, newest first.
+
+  Follow ``nextCursor`` to load older versions.  ``view=summary`` omits graphs and
+  issues in favour of counts; fetch a version's graph via ``GET /{version_id}``.
+  Pass ``issueFormat=compact`` to receive issues as ``[code, nodeId, edgeId, params]``
+  arrays instead of rendered messages.  Responses carry an ``ETag``; sending it back
+  in ``If-None-Match`` returns ``304 Not Modified`` without loading any versions.
+  """
+  page_size = limit or get_settings().version_history_page_size
+  etag = await _history_etag(session, strategy_id, user, "list", view, issue_format, page_size, cursor)
+  if _etag_matches(if_none_match, etag):
+    return _not_modified(etag)
+
+  page = await strategy_version_service.list_version_page(
+    session,
+    strategy_id,
+    user,
+    limit=page_size,
+    cursor=cursor,
+    include_graphs=view == "full"
+  )
+  if view == "summary":
+    versions = [_to_history_entry(version) for version in page.versions]
+  else:
+    versions = [_to_summary(version, issue_format) for version in page.versions]
+  response.headers["ETag"] = etag
+  response.headers["Cache-Control"] = HISTORY_CACHE_CONTROL
+  return StrategyVersionListResponse(versions=versions, nextCursor=page.next_cursor)
 
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=StrategyVersionCreateResponse)
@@ -71,13 +168,92 @@ async def create_strategy_version(
 async def validate_strategy_graph(
   strategy_id: UUID,  # pylint: disable=unused-argument
   payload: StrategyVersionValidateRequest,
+  issue_format: IssueFormat = Query("full", alias="issueFormat"),
   user: AuthenticatedUser = Depends(require_compliance_consent)
 ) -> StrategyVersionValidateResponse:
   """Validate the provided graph without persisting a new version."""
-  issues = await strategy_version_service.validate_version_graph(payload.graph, user)
+  issues = await strategy_version_service.validate_version_graph(
+    payload.graph, user, compact=issue_format == "compact"
+  )
   return StrategyVersionValidateResponse(issues=issues)
 
 
+@router.get("/diff", response_model=StrategyVersionDiffResponse)
+async def diff_strategy_versions(
+  strategy_id: UUID,
+  from_version_id: UUID = Query(..., alias="from"),
+  to_version_id: UUID = Query(..., alias="to"),
+  user: AuthenticatedUser = Depends(require_compliance_consent),
+  session: AsyncSession = Depends(get_db)
+) -> StrategyVersionDiffResponse:
+  """Return added, removed and changed nodes, edges and parameters between two versions."""
+  diff = await strategy_version_service.diff_versions(
+    session, strategy_id, from_version_id, to_version_id, user
+  )
+  return StrategyVersionDiffResponse(
+    fromVersion=diff.before.version,
+    toVersion=diff.after.version,
+    **diff.changes
+  )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_strategy_versions(
+  strategy_id: UUID,
+  user: AuthenticatedUser = Depends(require_compliance_consent),
+  session: AsyncSession = Depends(get_db),
+  session_factory: Callable[[], AsyncSession] = Depends(get_session_factory)
+) -> StreamingResponse:
+  """Stream the full version history, oldest first, as one NDJSON record per version."""
+  lines = await strategy_version_service.export_version_history(
+    session, session_factory, strategy_id, user
+  )
+  return StreamingResponse(
+    lines,
+    media_type=NDJSON_MEDIA_TYPE,
+    headers={"Content-Disposition": f'attachment; filename="strategy-{strategy_id}-versions.ndjson"'}
+  )
+
+
+@router.post("/import", status_code=status.HTTP_201_CREATED, response_model=StrategyVersionImportResponse)
+async def import_strategy_versions(
+  strategy_id: UUID,
+  request: Request,
+  user: AuthenticatedUser = Depends(require_compliance_consent),
+  session: AsyncSession = Depends(get_db)
+) -> StrategyVersionImportResponse:
+  """Append versions from an NDJSON body produced by the export endpoint.
+
+  The body is consumed as it arrives and inserted in batches; imported versions are
+  renumbered after the strategy's latest version and re-validated.
+  """
+  summary = await strategy_version_service.import_version_history(
+    session, strategy_id, user, request.stream()
+  )
+  return StrategyVersionImportResponse(imported=summary.imported, latestVersion=summary.latest_version)
+
+
+@router.get("/{version_id}", response_model=StrategyVersionDetailResponse)
+async def get_strategy_version(
+  strategy_id: UUID,
+  version_id: UUID,
+  response: Response,
+  issue_format: IssueFormat = Query("full", alias="issueFormat"),
+  if_none_match: str | None = Header(None),
+  user: AuthenticatedUser = Depends(require_compliance_consent),
+  session: AsyncSession = Depends(get_db)
+) -> StrategyVersionDetailResponse | Response:
+  """Return a single version including its graph, honouring ``If-None-Match``."""
+  etag = await _history_etag(session, strategy_id, user, "version", version_id, issue_format)
+  if _etag_matches(if_none_match, etag):
+    return _not_modified(etag)
+
+  version = await strategy_version_service.get_version(session, strategy_id, version_id, user)
+  response.headers["ETag"] = etag
+  response.headers["Cache-Control"] = HISTORY_CACHE_CONTROL
+  return StrategyVersionDetailResponse(version=_to_summary(version, issue_format))
+
+
 @router.post("/{version_id}/revert", status_code=status.HTTP_201_CREATED, response_model=StrategyVersionCreateResponse)
 async def revert_strategy_version(
   strategy_id: UUID,
@@ -5,7 +5,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.dependencies import require_compliance_consent
 from app.auth.schemas import AuthenticatedUser
-from app.db.session import get_db
+from app.db.session import commit_session, get_db
+from app.services.provisioning_service import request_workspace_provisioning
 from app.services.workspace_service import bootstrap_workspace_payload
 
 router = APIRouter(prefix="/workspaces", tags=["Workspaces"])
@@ -20,3 +21,15 @@ async def bootstrap_workspace(
   payload, _ = await bootstrap_workspace_payload(session, user)
 
   return payload
+
+
+@router.post("/provision", status_code=status.HTTP_202_ACCEPTED)
+async def provision_workspace(
+  user: AuthenticatedUser = Depends(require_compliance_consent),
+  session: AsyncSession = Depends(get_db)
+) -> dict[str, object]:
+  """Queue demo workspace provisioning on the workers once consent is recorded."""
+  # The worker seeds rows referencing the user synced by this request, so commit first.
+  await commit_session(session)
+  queued = await request_workspace_provisioning(user.id)
+  return {"queued": queued}
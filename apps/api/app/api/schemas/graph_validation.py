@@ -0,0 +1,32 @@
+"""Pydantic schemas for batch graph validation."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from app.api.schemas.strategy_versions import CanvasValidationIssue
+
+
+class GraphValidationBatchItem(BaseModel):
+  """Single graph submitted for batch validation."""
+
+  id: str | None = None
+  graph: dict[str, Any]
+
+
+class GraphValidationBatchRequest(BaseModel):
+  """Graphs to validate in one request."""
+
+  graphs: list[GraphValidationBatchItem] = Field(min_length=1)
+
+
+class GraphValidationBatchResult(BaseModel):
+  """One NDJSON line streamed back per validated graph."""
+
+  index: int
+  id: str | None = None
+  plan: str
+  issues: list[CanvasValidationIssue]
+  executionOrder: list[str] | None = None
@@ -3,21 +3,30 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class CanvasValidationIssue(BaseModel):
   """Validation issue payload returned to the frontend."""
 
   nodeId: str | None = None
+  edgeId: str | None = None
   code: str
   message: str
   severity: str = "error"
 
 
+# Compact issue form: [code, nodeId, edgeId, params] (plus a legacy message for old rows).
+CompactValidationIssue = list[Any]
+
+IssueFormat = Literal["full", "compact"]
+
+HistoryView = Literal["full", "summary"]
+
+
 class StrategyVersionSummary(BaseModel):
   """Summary of a stored version."""
 
@@ -25,7 +34,8 @@ class StrategyVersionSummary(BaseModel):
   version: int
   label: str
   graph: dict[str, Any]
-  validationIssues: list[CanvasValidationIssue]
+  validationIssues: list[CanvasValidationIssue] | list[CompactValidationIssue]
+  executionOrder: list[str] | None = None
   createdAt: datetime
   updatedAt: datetime | None = None
 
@@ -33,10 +43,25 @@ class StrategyVersionSummary(BaseModel):
     populate_by_name = True
 
 
+class StrategyVersionHistoryEntry(BaseModel):
+  """Graph-free history entry returned by the summary view."""
+
+  id: UUID
+  version: int
+  label: str
+  nodeCount: int | None = None
+  edgeCount: int | None = None
+  errorCount: int | None = None
+  warningCount: int | None = None
+  createdAt: datetime
+  updatedAt: datetime | None = None
+
+
 class StrategyVersionListResponse(BaseModel):
-  """Response containing recent versions."""
+  """Response containing one page of recent versions."""
 
-  versions: list[StrategyVersionSummary]
+  versions: list[StrategyVersionSummary] | list[StrategyVersionHistoryEntry]
+  nextCursor: str | None = None
 
 
 class StrategyVersionCreateRequest(BaseModel):
@@ -54,6 +79,72 @@ class StrategyVersionCreateResponse(BaseModel):
   version: StrategyVersionSummary
 
 
+class StrategyVersionDetailResponse(BaseModel):
+  """Response containing a single version fetched on demand."""
+
+  version: StrategyVersionSummary
+
+
+class StrategyVersionTransferRecord(BaseModel):
+  """One NDJSON line of a version history export or import.
+
+  Records carry the full graph so they can be replayed into any environment.
+  ``validationIssues`` is informational: issues are recomputed on import.
+  """
+
+  version: int
+  label: str = Field(max_length=64)
+  isAutosave: bool = False
+  authorId: UUID | None = None
+  notes: str | None = None
+  graph: dict[str, Any]
+  educatorCallouts: list[dict[str, Any]] = Field(default_factory=list)
+  validationIssues: list[Any] = Field(default_factory=list)
+  executionOrder: list[str] | None = None
+  createdAt: datetime | None = None
+  updatedAt: datetime | None = None
+
+
+class StrategyVersionImportResponse(BaseModel):
+  """Outcome of a streamed history import."""
+
+  imported: int
+  latestVersion: int
+
+
+class ValueChange(BaseModel):
+  """Old and new value of a field; ``None`` stands for an absent value."""
+
+  before: Any = None
+  after: Any = None
+
+
+class GraphItemChange(BaseModel):
+  """Fields and block parameters that differ on a node or edge kept in both versions."""
+
+  id: str
+  fields: dict[str, ValueChange] = Field(default_factory=dict)
+  parameters: dict[str, ValueChange] = Field(default_factory=dict)
+
+
+class GraphCollectionDiff(BaseModel):
+  """Added, removed and changed items of one graph collection."""
+
+  added: list[dict[str, Any]] = Field(default_factory=list)
+  removed: list[dict[str, Any]] = Field(default_factory=list)
+  changed: list[GraphItemChange] = Field(default_factory=list)
+
+
+class StrategyVersionDiffResponse(BaseModel):
+  """Structural diff between two versions of a strategy."""
+
+  fromVersion: int
+  toVersion: int
+  nodes: GraphCollectionDiff
+  edges: GraphCollectionDiff
+  properties: dict[str, ValueChange] = Field(default_factory=dict)
+
+
 class StrategyVersionValidateRequest(BaseModel):
   """Payload for validation requests."""
 
@@ -63,4 +154,4 @@ class StrategyVersionValidateRequest(BaseModel):
 class StrategyVersionValidateResponse(BaseModel):
   """Validation issues returned to the client."""
 
-  issues: list[CanvasValidationIssue]
+  issues: list[CanvasValidationIssue] | list[CompactValidationIssue]
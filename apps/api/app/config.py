@@ -27,6 +27,26 @@ class Settings(BaseSettings):
   supabase_jwt_secret: str = "local-secret"
   supabase_api_audience: str = "authenticated"
   supabase_anon_key: str | None = None
+  validation_cache_size: int = 512
+  validation_cache_ttl_seconds: float = 300.0
+  validation_offload_threshold: int = 200
+  validation_budget_ms: int = 250
+  validation_max_workers: int = 2
+  validation_max_pending: int = 8
+  validation_batch_max_workers: int | None = None
+  validation_batch_max_graphs: int = 500
+  version_keyframe_interval: int = 20
+  json_compression_threshold_bytes: int = 0
+  version_history_page_size: int = 50
+  autosave_coalesce_seconds: float = 0.0
+  version_transfer_batch_size: int = 500
+  version_transfer_max_line_bytes: int = 4 * 1024 * 1024
+  version_diff_cache_size: int = 256
+  bootstrap_cache_size: int = 1024
+  bootstrap_cache_ttl_seconds: float = 30.0
+  bootstrap_cache_redis_ttl_seconds: float = 0.0
+  metrics_default_budget_ms: float = 500.0
+  metrics_route_budgets_ms: dict[str, float] = {"/api/v1/workspaces/bootstrap": 150.0}
 
   model_config = SettingsConfigDict(
     env_file=ENV_FILES,
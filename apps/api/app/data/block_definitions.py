@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from functools import lru_cache
+import hashlib
 import json
+import logging
 from pathlib import Path
-from typing import Any
+import threading
+import time
+from typing import Any, Callable
 
 PACKAGE_RELATIVE_BLOCKS_PATH = Path("packages/shared/src/data/block-definitions.json")
 
+logger = logging.getLogger(__name__)
+
 
 def _repository_root() -> Path:
   return Path(__file__).resolve().parents[4]
@@ -54,16 +59,97 @@ class BlockDefinition:
   limits: dict[str, int]
 
 
-@lru_cache(maxsize=1)
-def load_block_definitions() -> dict[str, BlockDefinition]:
-  """Load block definitions from the shared JSON contract."""
-  payload_path = _repository_root() / PACKAGE_RELATIVE_BLOCKS_PATH
-  if not payload_path.exists():
-    raise FileNotFoundError(f"Block definitions file not found: {payload_path}")
+@dataclass(frozen=True)
+class CompiledBlockRegistry:
+  """Precomputed lookup tables used by the graph validator.
+
+  Signal types are interned to bit positions so that port compatibility becomes a
+  bitwise test instead of building sets for every edge.
+  """
+
+  definitions: dict[str, BlockDefinition]
+  signal_type_ids: dict[str, int]
+  output_masks: dict[str, int]
+  input_masks: dict[str, int]
+  required_inputs: dict[str, tuple[tuple[BlockPortDefinition, int], ...]]
+  compatibility: dict[tuple[str, str], bool]
+  output_port_bits: dict[str, dict[str, int]]
+  input_port_bits: dict[str, dict[str, int]]
+  signal_types: tuple[str, ...] = ()
+  generation: int = 1
+  # Digest of the definitions source.  Unlike ``generation``, which counts reloads in
+  # one process, it identifies the same definitions across processes and restarts.
+  fingerprint: str = ""
+
+  def signal_bit(self, signal_type: str) -> int:
+    """Return the bitmask for a signal type, or ``0`` when it is unknown."""
+    index = self.signal_type_ids.get(signal_type)
+    return 0 if index is None else 1 << index
+
+  def is_compatible(self, source_kind: str, target_kind: str) -> bool:
+    """Return whether any output of ``source_kind`` can feed ``target_kind``."""
+    return self.compatibility.get((source_kind, target_kind), False)
+
 
-  with payload_path.open(encoding="utf-8") as handle:
-    data = json.load(handle)
+def compile_block_registry(
+  definitions: dict[str, BlockDefinition],
+  signal_types: tuple[str, ...],
+  generation: int = 1,
+  fingerprint: str = ""
+) -> CompiledBlockRegistry:
+  """Intern signal types and precompute per-kind masks and the kind×kind table."""
+  signal_type_ids: dict[str, int] = {}
+  for signal_type in signal_types:
+    signal_type_ids.setdefault(signal_type, len(signal_type_ids))
+  for definition in definitions.values():
+    for port in (*definition.inputs, *definition.outputs):
+      signal_type_ids.setdefault(port.type, len(signal_type_ids))
 
+  def mask_for(ports: tuple[BlockPortDefinition, ...]) -> int:
+    mask = 0
+    for port in ports:
+      mask |= 1 << signal_type_ids[port.type]
+    return mask
+
+  output_masks = {kind: mask_for(definition.outputs) for kind, definition in definitions.items()}
+  input_masks = {kind: mask_for(definition.inputs) for kind, definition in definitions.items()}
+  required_inputs = {
+    kind: tuple(
+      (port, 1 << signal_type_ids[port.type]) for port in definition.inputs if port.required
+    )
+    for kind, definition in definitions.items()
+  }
+  output_port_bits = {
+    kind: {port.id: 1 << signal_type_ids[port.type] for port in definition.outputs}
+    for kind, definition in definitions.items()
+  }
+  input_port_bits = {
+    kind: {port.id: 1 << signal_type_ids[port.type] for port in definition.inputs}
+    for kind, definition in definitions.items()
+  }
+  compatibility = {
+    (source_kind, target_kind): not input_masks[target_kind] or bool(output_masks[source_kind] & input_masks[target_kind])
+    for source_kind in definitions
+    for target_kind in definitions
+  }
+
+  return CompiledBlockRegistry(
+    definitions=definitions,
+    signal_type_ids=signal_type_ids,
+    output_masks=output_masks,
+    input_masks=input_masks,
+    required_inputs=required_inputs,
+    compatibility=compatibility,
+    output_port_bits=output_port_bits,
+    input_port_bits=input_port_bits,
+    signal_types=signal_types,
+    generation=generation,
+    fingerprint=fingerprint
+  )
+
+
+def parse_block_definitions(data: dict[str, Any]) -> tuple[dict[str, BlockDefinition], tuple[str, ...]]:
+  """Parse the shared JSON contract into block definitions and signal types."""
   definitions: dict[str, BlockDefinition] = {}
   for raw in data.get("blocks", []):
     inputs = tuple(
@@ -110,13 +196,102 @@ def load_block_definitions() -> dict[str, BlockDefinition]:
       limits=limits
     )
 
-  return definitions
+  return definitions, tuple(data.get("signalTypes", []))
+
+
+class BlockDefinitionRegistry:
+  """Parses the block definitions file once and reloads it when its mtime changes.
+
+  Each successful (re)load publishes a new :class:`CompiledBlockRegistry` with an
+  incremented generation; readers always see either the old or the new registry.
+  A reload that fails to parse keeps serving the previous generation.
+  """
+
+  def __init__(
+    self,
+    path: Path,
+    check_interval_seconds: float = 1.0,
+    clock: Callable[[], float] = time.monotonic
+  ) -> None:
+    self.path = path
+    self.check_interval_seconds = check_interval_seconds
+    self._clock = clock
+    self._lock = threading.Lock()
+    self._compiled: CompiledBlockRegistry | None = None
+    self._mtime_ns: int | None = None
+    self._next_check = 0.0
+    self._generation = 0
+
+  @property
+  def generation(self) -> int:
+    """Generation of the currently published registry (``0`` before first load)."""
+    return self._generation
+
+  def current(self) -> CompiledBlockRegistry:
+    """Return the compiled registry, reloading first if the file changed."""
+    compiled = self._compiled
+    if compiled is not None and self._clock() < self._next_check:
+      return compiled
+    return self._refresh()
+
+  def _refresh(self) -> CompiledBlockRegistry:
+    with self._lock:
+      self._next_check = self._clock() + self.check_interval_seconds
+      try:
+        mtime_ns = self.path.stat().st_mtime_ns
+      except FileNotFoundError:
+        if self._compiled is None:
+          raise FileNotFoundError(f"Block definitions file not found: {self.path}") from None
+        logger.warning("Block definitions file disappeared; keeping generation %s", self._generation)
+        return self._compiled
+
+      if self._compiled is not None and mtime_ns == self._mtime_ns:
+        return self._compiled
+
+      try:
+        source = self.path.read_bytes()
+        definitions, signal_types = parse_block_definitions(json.loads(source))
+      except (ValueError, KeyError, TypeError):
+        if self._compiled is None:
+          raise
+        logger.exception("Failed to reload block definitions; keeping generation %s", self._generation)
+        return self._compiled
+
+      generation = self._generation + 1
+      self._compiled = compile_block_registry(
+        definitions,
+        signal_types,
+        generation=generation,
+        fingerprint=hashlib.sha256(source).hexdigest()
+      )
+      self._mtime_ns = mtime_ns
+      self._generation = generation
+      if generation > 1:
+        logger.info("Reloaded block definitions", extra={"generation": generation})
+      return self._compiled
+
+
+_block_registry: BlockDefinitionRegistry | None = None
+
+
+def get_block_registry() -> BlockDefinitionRegistry:
+  """Return the process-wide registry for the shared block definitions file."""
+  global _block_registry
+  if _block_registry is None:
+    _block_registry = BlockDefinitionRegistry(_repository_root() / PACKAGE_RELATIVE_BLOCKS_PATH)
+  return _block_registry
+
+
+def load_block_registry() -> CompiledBlockRegistry:
+  """Return the compiled registry for the shared block definitions."""
+  return get_block_registry().current()
+
+
+def load_block_definitions() -> dict[str, BlockDefinition]:
+  """Load block definitions from the shared JSON contract."""
+  return load_block_registry().definitions
 
 
-@lru_cache(maxsize=1)
 def get_signal_types() -> tuple[str, ...]:
   """Return the ordered tuple of supported signal types."""
-  payload_path = _repository_root() / PACKAGE_RELATIVE_BLOCKS_PATH
-  with payload_path.open(encoding="utf-8") as handle:
-    data = json.load(handle)
-  return tuple(data.get("signalTypes", []))
+  return load_block_registry().signal_types
@@ -0,0 +1,33 @@
+"""Rewrite stored graph payloads after changing ``JSON_COMPRESSION_THRESHOLD_BYTES``.
+
+Usage: ``python -m app.db.recompress [--batch-size N]``
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from app.db.session import session_scope
+from app.services.version_storage_service import recompress_stored_payloads
+
+logger = logging.getLogger("strategybuilder.recompress")
+
+
+async def _run(batch_size: int) -> int:
+  async with session_scope() as session:
+    return await recompress_stored_payloads(session, batch_size=batch_size)
+
+
+def main(argv: list[str] | None = None) -> None:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--batch-size", type=int, default=200)
+  args = parser.parse_args(argv)
+  logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s - %(message)s")
+  rewritten = asyncio.run(_run(args.batch_size))
+  logger.info("Rewrote %d rows", rewritten)
+
+
+if __name__ == "__main__":
+  main()
@@ -24,6 +24,22 @@ async def _get_existing_columns(connection: AsyncConnection, table_name: str) ->
   return {row[0] for row in result}
 
 
+async def _index_exists(connection: AsyncConnection, index_name: str) -> bool:
+  """Return whether ``index_name`` exists in the current schema."""
+
+  result = await connection.execute(
+    text(
+      """
+      SELECT 1
+      FROM pg_indexes
+      WHERE schemaname = current_schema() AND indexname = :index
+      """
+    ),
+    {"index": index_name}
+  )
+  return result.first() is not None
+
+
 async def _run_statements(connection: AsyncConnection, statements: Iterable[str]) -> None:
   """Execute the raw SQL statements sequentially."""
 
@@ -31,6 +47,49 @@ async def _run_statements(connection: AsyncConnection, statements: Iterable[str]
     await connection.execute(text(statement))
 
 
+async def renumber_duplicate_versions(connection: AsyncConnection) -> None:
+  """Renumber strategies whose history repeats a version number.
+
+  Before the per-strategy counter, concurrent saves could allocate the same number
+  twice, which would make the unique ``(strategy_id, version)`` index fail to build.
+  Affected strategies get ``1..n`` in ``(created_at, id)`` order, and every counter is
+  raised to at least its highest stored version so new saves never collide.
+  """
+
+  await _run_statements(
+    connection,
+    [
+      """
+      WITH duplicated AS (
+        SELECT DISTINCT strategy_id
+        FROM strategy_versions
+        GROUP BY strategy_id, version
+        HAVING count(*) > 1
+      ),
+      ranked AS (
+        SELECT id, row_number() OVER (PARTITION BY strategy_id ORDER BY created_at, id) AS renumbered
+        FROM strategy_versions
+        WHERE strategy_id IN (SELECT strategy_id FROM duplicated)
+      )
+      UPDATE strategy_versions
+      SET version = ranked.renumbered
+      FROM ranked
+      WHERE strategy_versions.id = ranked.id
+      """,
+      """
+      UPDATE strategies
+      SET latest_version = counters.max_version
+      FROM (
+        SELECT strategy_id, max(version) AS max_version
+        FROM strategy_versions
+        GROUP BY strategy_id
+      ) AS counters
+      WHERE strategies.id = counters.strategy_id AND strategies.latest_version < counters.max_version
+      """
+    ]
+  )
+
+
 async def ensure_strategy_versions_schema(connection: AsyncConnection) -> None:
   """Backfill new columns for ``strategy_versions`` if they are missing.
 
@@ -62,6 +121,14 @@ async def ensure_strategy_versions_schema(connection: AsyncConnection) -> None:
       "ALTER TABLE strategy_versions ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
     )
     statements.append("UPDATE strategy_versions SET version = 1 WHERE version IS NULL")
+
+  if statements:
+    await _run_statements(connection, statements)
+    statements = []
+  if not await _index_exists(connection, "strategy_versions_strategy_id_version_idx"):
+    # Legacy rows may repeat version numbers; fix them or the unique index cannot
+    # build.  Once it exists duplicates are impossible, so later startups skip the scan.
+    await renumber_duplicate_versions(connection)
     statements.append(
       "CREATE UNIQUE INDEX IF NOT EXISTS strategy_versions_strategy_id_version_idx "
       "ON strategy_versions (strategy_id, version)"
@@ -85,6 +152,49 @@ async def ensure_strategy_versions_schema(connection: AsyncConnection) -> None:
       "ALTER TABLE strategy_versions ADD COLUMN validation_issues JSONB NOT NULL DEFAULT '[]'::jsonb"
     )
 
+  if "validation_fingerprint" not in existing:
+    statements.append("ALTER TABLE strategy_versions ADD COLUMN validation_fingerprint VARCHAR(64)")
+
+  if "execution_order" not in existing:
+    statements.append("ALTER TABLE strategy_versions ADD COLUMN execution_order JSONB")
+
+  if "graph_delta" not in existing:
+    statements.append("ALTER TABLE strategy_versions ADD COLUMN graph_delta JSONB")
+    statements.append("ALTER TABLE strategy_versions ALTER COLUMN graph_json DROP NOT NULL")
+
+  if "graph_hash" not in existing:
+    # ``graph_blobs`` itself is created by ``Base.metadata.create_all``.
+    statements.append(
+      "ALTER TABLE strategy_versions ADD COLUMN graph_hash VARCHAR(64) REFERENCES graph_blobs (hash)"
+    )
+
+  if "delta_depth" not in existing:
+    statements.append(
+      "ALTER TABLE strategy_versions ADD COLUMN delta_depth INTEGER NOT NULL DEFAULT 0"
+    )
+
+  if "is_autosave" not in existing:
+    statements.append(
+      "ALTER TABLE strategy_versions ADD COLUMN is_autosave BOOLEAN NOT NULL DEFAULT FALSE"
+    )
+    # Autosaves used to be recognisable only by their generated label.
+    statements.append(
+      "UPDATE strategy_versions SET is_autosave = TRUE "
+      "WHERE label = 'Auto Save' OR label LIKE 'Auto Save v%'"
+    )
+
+  if "author_id" not in existing:
+    statements.append("ALTER TABLE strategy_versions ADD COLUMN author_id UUID")
+
+  for column in ("node_count", "edge_count", "error_count", "warning_count"):
+    if column not in existing:
+      statements.append(f"ALTER TABLE strategy_versions ADD COLUMN {column} INTEGER")
+
+  statements.append(
+    "CREATE INDEX IF NOT EXISTS strategy_versions_history_idx "
+    "ON strategy_versions (strategy_id, created_at, id)"
+  )
+
   if "updated_at" not in existing:
     statements.append(
       "ALTER TABLE strategy_versions ADD COLUMN updated_at TIMESTAMPTZ NOT NULL DEFAULT now()"
@@ -92,3 +202,28 @@ async def ensure_strategy_versions_schema(connection: AsyncConnection) -> None:
 
   if statements:
     await _run_statements(connection, statements)
+
+
+async def ensure_strategies_schema(connection: AsyncConnection) -> None:
+  """Backfill the ``latest_version`` counter on ``strategies`` if it is missing."""
+
+  if connection.dialect.name != "postgresql":
+    return
+
+  existing = await _get_existing_columns(connection, "strategies")
+  if "latest_version" in existing:
+    return
+
+  await _run_statements(
+    connection,
+    [
+      "ALTER TABLE strategies ADD COLUMN latest_version INTEGER NOT NULL DEFAULT 0",
+      """
+      UPDATE strategies
+      SET latest_version = COALESCE(
+        (SELECT max(version) FROM strategy_versions WHERE strategy_versions.strategy_id = strategies.id),
+        0
+      )
+      """
+    ]
+  )
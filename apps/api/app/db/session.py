@@ -1,12 +1,14 @@
 """Database session and engine helpers."""
 
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Awaitable, Callable
 from contextlib import asynccontextmanager
 
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import get_settings
 
+AFTER_COMMIT_KEY = "after_commit_callbacks"
+
 _settings = get_settings()
 _engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
@@ -28,14 +30,32 @@ def get_session_factory() -> async_sessionmaker[AsyncSession]:
   return _session_factory
 
 
+def call_after_commit(session: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+  """Run ``callback`` once ``session`` commits through ``commit_session``.
+
+  Used for side effects such as cache invalidation that must not be observed before
+  the data they describe is visible.  Callbacks are discarded if the session rolls
+  back.
+  """
+  session.info.setdefault(AFTER_COMMIT_KEY, []).append(callback)
+
+
+async def commit_session(session: AsyncSession) -> None:
+  """Commit ``session`` and then run its ``call_after_commit`` callbacks in order."""
+  await session.commit()
+  for callback in session.info.pop(AFTER_COMMIT_KEY, []):
+    await callback()
+
+
 @asynccontextmanager
 async def session_scope() -> AsyncIterator[AsyncSession]:
   """Provide a transactional scope around a series of operations."""
   session = get_session_factory()()
   try:
     yield session
-    await session.commit()
+    await commit_session(session)
   except Exception:  # pragma: no cover - re-raised for caller handling
+    session.info.pop(AFTER_COMMIT_KEY, None)
     await session.rollback()
     raise
   finally:
@@ -0,0 +1,119 @@
+"""Custom column types shared by the ORM models."""
+
+from __future__ import annotations
+
+import base64
+import json
+import zlib
+from typing import Any
+
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import JSON, TypeDecorator
+
+from app.config import get_settings
+
+COMPRESSION_MARKER = "$zlib"
+# Envelope id for a value stored uncompressed because it uses ``COMPRESSION_MARKER`` itself.
+LITERAL_ENVELOPE = 0
+
+# Fragments that dominate serialized strategy graphs, ordered so the most frequent ones
+# sit at the end of the dictionary where zlib finds them cheapest.  Dictionary ids are
+# persisted with every compressed value: never edit a published vocabulary, add a new
+# id and point ``CURRENT_DICTIONARY`` at it instead.
+#
+# Frozen on purpose: the fragments were picked by hand from block-definitions.json and
+# the graph wire format as they stood for v1.  Generating them from the definitions at
+# import time would change the dictionary whenever a block changes, and rows already
+# compressed against the old bytes could no longer be inflated.
+_VOCABULARY_V1 = (
+  "Streams OHLCV candles via realtime. EMA crossover to confirm momentum. ",
+  "Generates trade signals when trend conditions align. ",
+  "Applies position sizing and stop logic. Routes simulated orders to the paper trading engine. ",
+  "BTC-USD ETH-USD AAPL SPY 1m 5m 1h 1d paper-trading ",
+  "Market Data Feed Momentum Indicator Volatility Indicator Entry Condition Risk Controls Paper Broker ",
+  '"timeseries" "price" "momentum" "volatility" "signal" "risk" "orders" ',
+  '"fastLength": "slowLength": "window": "multiplier": "threshold": "volatilityFloor": ',
+  '"maxRiskPerTrade": "stopMultiple": "symbol": "granularity": "venue": ',
+  '"market-data" "momentum-indicator" "volatility-indicator" "entry-condition" ',
+  '"risk-controls" "paper-broker" ',
+  '"set":[{"id":"', '"remove":["', '"order":["', '"replace":{', '"placement":"', '"title":"',
+  '"body":"', '"position":{"x":', ',"y":', '"sourceHandle":"', '"targetHandle":"',
+  '{"nodes":[', '],"edges":[', '{"id":"edge-', '","source":"', '","target":"',
+  '"},"description":"', '{"id":"', '","label":"', '","type":"', '","metadata":{"parameters":{'
+)
+
+_DICTIONARIES: dict[int, bytes] = {1: "".join(_VOCABULARY_V1).encode("utf-8")}
+CURRENT_DICTIONARY = 1
+
+
+def _encode(value: Any) -> bytes:
+  return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def compress_json(value: Any, *, dictionary: int = CURRENT_DICTIONARY) -> dict[str, Any]:
+  """Return the compressed envelope stored in place of ``value``."""
+  return _compress_encoded(_encode(value), dictionary)
+
+
+def _compress_encoded(encoded: bytes, dictionary: int) -> dict[str, Any]:
+  compressor = zlib.compressobj(level=6, zdict=_DICTIONARIES[dictionary])
+  payload = compressor.compress(encoded) + compressor.flush()
+  return {COMPRESSION_MARKER: dictionary, "data": base64.b64encode(payload).decode("ascii")}
+
+
+def escape_json(value: Any) -> dict[str, Any]:
+  """Return the literal envelope that stores ``value`` uncompressed."""
+  return {COMPRESSION_MARKER: LITERAL_ENVELOPE, "value": value}
+
+
+def is_compressed(value: Any) -> bool:
+  """Return ``True`` when ``value`` is a stored envelope rather than a plain value.
+
+  ``CompressedJSON`` escapes every top-level object that uses ``COMPRESSION_MARKER``,
+  so a stored object carrying the marker is always an envelope.
+  """
+  return isinstance(value, dict) and COMPRESSION_MARKER in value
+
+
+def decompress_json(value: Any) -> Any:
+  """Decode a compressed or literal envelope; other values are returned unchanged."""
+  if not is_compressed(value):
+    return value
+  dictionary = value[COMPRESSION_MARKER]
+  if dictionary == LITERAL_ENVELOPE and "value" in value:
+    return value["value"]
+  if dictionary not in _DICTIONARIES or not isinstance(value.get("data"), str):
+    # Written before values using the marker were escaped; it is plain data.
+    return value
+  decompressor = zlib.decompressobj(zdict=_DICTIONARIES[dictionary])
+  raw = decompressor.decompress(base64.b64decode(value["data"])) + decompressor.flush()
+  return json.loads(raw)
+
+
+class CompressedJSON(TypeDecorator):
+  """JSON column that transparently zlib-compresses values above a size threshold.
+
+  Compression is opt-in via ``JSON_COMPRESSION_THRESHOLD_BYTES``.  Values are stored
+  as a ``{"$zlib": <dictionary id>, "data": <base64>}`` envelope inside the existing
+  JSON column, so plain and compressed rows coexist and no DDL is required.  Plain
+  objects that themselves use the ``$zlib`` key are stored as a literal
+  ``{"$zlib": 0, "value": ...}`` envelope so they are never mistaken for one.
+  """
+
+  impl = JSON
+  cache_ok = True
+
+  def process_bind_param(self, value: Any, dialect: Dialect) -> Any:
+    if value is None:
+      return value
+    threshold = get_settings().json_compression_threshold_bytes
+    if threshold > 0:
+      encoded = _encode(value)
+      if len(encoded) >= threshold:
+        return _compress_encoded(encoded, CURRENT_DICTIONARY)
+    if is_compressed(value):
+      return escape_json(value)
+    return value
+
+  def process_result_value(self, value: Any, dialect: Dialect) -> Any:
+    return decompress_json(value)
@@ -6,10 +6,22 @@ import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.routers import analytics, auth, education, health, strategy_versions, templates, workspaces
+from app.api.routers import (
+  analytics,
+  auth,
+  education,
+  graph_validation,
+  health,
+  metrics,
+  strategy_versions,
+  templates,
+  workspaces
+)
+from app.api.middleware import LatencyMetricsMiddleware
 from app.db.base import Base
 from app.db.session import get_engine
-from app.db.schema import ensure_strategy_versions_schema
+from app.db.schema import ensure_strategies_schema, ensure_strategy_versions_schema
+from app.services.graph_validation_service import shutdown_validation_pool
 
 # Ensure models are imported for metadata generation
 from app import models as _  # noqa: F401  # pylint: disable=unused-import
@@ -25,8 +37,10 @@ async def lifespan(_app: FastAPI):
   engine = get_engine()
   async with engine.begin() as connection:
     await connection.run_sync(Base.metadata.create_all)
+    await ensure_strategies_schema(connection)
     await ensure_strategy_versions_schema(connection)
   yield
+  shutdown_validation_pool()
 
 
 def create_app() -> FastAPI:
@@ -40,11 +54,16 @@ def create_app() -> FastAPI:
     allow_methods=["*"],
     allow_headers=["*"]
   )
+  # Added last so it is the outermost layer and times CORS handling as well.
+  app.add_middleware(LatencyMetricsMiddleware)
+
+  app.include_router(metrics.router)
 
   app.include_router(health.router, prefix=API_PREFIX)
   app.include_router(auth.router, prefix=API_PREFIX)
   app.include_router(workspaces.router, prefix=API_PREFIX)
   app.include_router(strategy_versions.router, prefix=API_PREFIX)
+  app.include_router(graph_validation.router, prefix=API_PREFIX)
   app.include_router(templates.router, prefix=API_PREFIX)
   app.include_router(education.router, prefix=API_PREFIX)
   app.include_router(analytics.router, prefix=API_PREFIX)
@@ -1,6 +1,7 @@
 """Database models package."""
 
 from app.models.compliance_event import ComplianceEvent
+from app.models.graph_blob import GraphBlob
 from app.models.onboarding_event import OnboardingEvent
 from app.models.strategy import Strategy, StrategyVersion
 from app.models.user import User
@@ -11,6 +12,7 @@ __all__ = [
   "Workspace",
   "Strategy",
   "StrategyVersion",
+  "GraphBlob",
   "ComplianceEvent",
   "OnboardingEvent"
 ]
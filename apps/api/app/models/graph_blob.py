@@ -0,0 +1,20 @@
+"""Content-addressed storage for strategy graphs."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+from app.db.types import CompressedJSON
+
+
+class GraphBlob(Base):
+  """Full strategy graph stored once per canonical hash."""
+
+  __tablename__ = "graph_blobs"
+
+  hash: Mapped[str] = mapped_column(String(length=64), primary_key=True)
+  graph_json: Mapped[dict] = mapped_column(CompressedJSON, nullable=False)
+  created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
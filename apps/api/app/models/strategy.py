@@ -7,12 +7,14 @@ from datetime import datetime
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.types import JSON
 
 from app.db.base import Base
+from app.db.types import CompressedJSON
+from app.models.graph_blob import GraphBlob
 
 if TYPE_CHECKING:
   from app.models.workspace import Workspace
@@ -27,6 +29,8 @@ class Strategy(Base):
   workspace_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("workspaces.id"))
   name: Mapped[str] = mapped_column(String(length=140), nullable=False)
   description: Mapped[str | None] = mapped_column(Text, nullable=True)
+  # Highest allocated version number; bumped atomically with UPDATE ... RETURNING.
+  latest_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
   created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
   updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -40,16 +44,56 @@ class StrategyVersion(Base):
   """Specific revision of a strategy's graph configuration."""
 
   __tablename__ = "strategy_versions"
+  __table_args__ = (
+    Index("strategy_versions_strategy_id_version_idx", "strategy_id", "version", unique=True),
+    # Keyset pagination for the history panel walks (created_at, id) within a strategy.
+    Index("strategy_versions_history_idx", "strategy_id", "created_at", "id"),
+  )
 
   id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
   strategy_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("strategies.id"))
   version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
   label: Mapped[str] = mapped_column(String(length=64), nullable=False, default="Auto Save")
-  graph_json: Mapped[dict] = mapped_column(JSON, nullable=False)
-  educator_callouts: Mapped[list[dict[str, str]]] = mapped_column(JSON, default=list)
+  # Unlabelled autosaves may be coalesced and thinned; labelled saves and reverts are kept.
+  is_autosave: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+  author_id: Mapped[uuid.UUID | None] = mapped_column(UUID(as_uuid=True), nullable=True)
+  # Keyframes reference a shared ``GraphBlob``; other rows store ``graph_delta`` against the
+  # previous version.  ``graph_json`` is only populated on rows written before blobs existed.
+  graph_hash: Mapped[str | None] = mapped_column(
+    String(length=64), ForeignKey("graph_blobs.hash"), nullable=True
+  )
+  graph_json: Mapped[dict | None] = mapped_column(CompressedJSON, nullable=True)
+  graph_delta: Mapped[dict | None] = mapped_column(CompressedJSON, nullable=True)
+  delta_depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+  educator_callouts: Mapped[list[dict[str, str]]] = mapped_column(CompressedJSON, default=list)
   notes: Mapped[str | None] = mapped_column(Text, nullable=True)
-  validation_issues: Mapped[list[dict[str, object]]] = mapped_column(JSON, default=list)
+  # Compact issues ([code, nodeId, edgeId, params]); older rows hold rendered dicts.
+  validation_issues: Mapped[list[object]] = mapped_column(CompressedJSON, default=list)
+  # Block definitions fingerprint ``validation_issues`` were computed under; autosaves only
+  # carry issues forward incrementally while it matches the live registry.
+  validation_fingerprint: Mapped[str | None] = mapped_column(String(length=64), nullable=True)
+  execution_order: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
+  # Denormalised totals so history summaries never load graphs or issues.
+  node_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+  edge_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+  error_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+  warning_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
   created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
   updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
 
   strategy: Mapped[Strategy] = relationship("Strategy", back_populates="versions")
+  blob: Mapped[GraphBlob | None] = relationship(GraphBlob, lazy="joined")
+
+  # Resolved graph for delta rows and freshly written keyframes; see ``version_storage_service``.
+  materialized_graph = None
+
+  @property
+  def graph(self) -> dict | None:
+    """Return the full graph, or ``None`` if a delta row has not been resolved yet."""
+    if self.materialized_graph is not None:
+      return self.materialized_graph
+    if self.graph_json is not None:
+      return self.graph_json
+    if self.graph_hash is not None and self.blob is not None:
+      return self.blob.graph_json
+    return None
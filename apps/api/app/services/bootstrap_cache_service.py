@@ -0,0 +1,127 @@
+"""Per-user cache of workspace bootstrap payloads.
+
+Bootstrap runs on every login and dashboard load, yet its payload only changes when
+the workspace's strategy history does.  Payloads are kept in an in-process LRU and,
+when ``BOOTSTRAP_CACHE_REDIS_TTL_SECONDS`` is set, in Redis so every API process
+shares them.  Version writes call ``invalidate`` for the owning user once their
+transaction commits; entries held by other processes' local tier expire within
+``BOOTSTRAP_CACHE_TTL_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from typing import Any, Callable
+
+from redis import asyncio as redis_asyncio
+from redis.exceptions import RedisError
+
+from app.config import get_settings
+from app.services.ttl_cache import TTLCache
+
+REDIS_KEY_PREFIX = "strategybuilder:bootstrap:"
+
+logger = logging.getLogger("strategybuilder.performance")
+
+
+class BootstrapPayloadCache:
+  """Two-tier cache of bootstrap payloads keyed by user id.
+
+  Cached payloads are shared between requests, so callers must copy before mutating.
+  Redis failures are logged and treated as misses; the cache never fails a bootstrap.
+  """
+
+  def __init__(
+    self,
+    max_entries: int = 1024,
+    ttl_seconds: float = 30.0,
+    redis_client: Any | None = None,
+    redis_ttl_seconds: float = 0.0,
+    clock: Callable[[], float] = time.monotonic
+  ) -> None:
+    self.redis_ttl_seconds = redis_ttl_seconds
+    self._redis = redis_client
+    self._local: TTLCache[str, dict[str, Any]] = TTLCache(max_entries, ttl_seconds, clock)
+    self._audited: TTLCache[str, bool] = TTLCache(max_entries, ttl_seconds, clock)
+
+  async def get(self, user_id: str) -> dict[str, Any] | None:
+    """Return the cached payload for ``user_id``, checking Redis after the local tier."""
+    payload = self._local.get(user_id, record=False)
+    if payload is None and self._redis is not None:
+      try:
+        raw = await self._redis.get(f"{REDIS_KEY_PREFIX}{user_id}")
+      except RedisError:
+        logger.warning("workspaces.bootstrap.cache_unavailable", exc_info=True)
+        raw = None
+      if raw is not None:
+        payload = json.loads(raw)
+        self._local.put(user_id, payload)
+    self._local.record(payload is not None)
+    return payload
+
+  async def put(self, user_id: str, payload: dict[str, Any]) -> None:
+    """Store ``payload`` in both tiers."""
+    self._local.put(user_id, payload)
+    if self._redis is None:
+      return
+    try:
+      await self._redis.set(
+        f"{REDIS_KEY_PREFIX}{user_id}",
+        json.dumps(payload, separators=(",", ":"), default=str),
+        px=int(self.redis_ttl_seconds * 1000)
+      )
+    except RedisError:
+      logger.warning("workspaces.bootstrap.cache_unavailable", exc_info=True)
+
+  async def invalidate(self, user_id: str) -> None:
+    """Drop the payload for ``user_id`` from both tiers."""
+    self._local.pop(user_id)
+    if self._redis is None:
+      return
+    try:
+      await self._redis.delete(f"{REDIS_KEY_PREFIX}{user_id}")
+    except RedisError:
+      logger.warning("workspaces.bootstrap.cache_unavailable", exc_info=True)
+
+  def claim_audit(self, user_id: str) -> bool:
+    """Return ``True`` at most once per user per TTL window, marking the claim.
+
+    Bootstraps served from the cache use this to write their audit event once per
+    window instead of on every hit.  Claims are local to the process and survive
+    ``invalidate``, which only concerns the payload.
+    """
+    if self._audited.get(user_id, record=False):
+      return False
+    self._audited.put(user_id, True)
+    return True
+
+  def clear(self) -> None:
+    """Drop all local entries and reset counters."""
+    self._local.clear()
+    self._audited.clear()
+
+  def stats(self) -> dict[str, int]:
+    """Return hit/miss counters and current local size."""
+    return self._local.stats()
+
+
+_bootstrap_cache: BootstrapPayloadCache | None = None
+
+
+def get_bootstrap_cache() -> BootstrapPayloadCache:
+  """Return the process-wide bootstrap cache configured from settings."""
+  global _bootstrap_cache
+  if _bootstrap_cache is None:
+    settings = get_settings()
+    redis_client = None
+    if settings.bootstrap_cache_redis_ttl_seconds > 0:
+      redis_client = redis_asyncio.from_url(settings.redis_url)
+    _bootstrap_cache = BootstrapPayloadCache(
+      max_entries=settings.bootstrap_cache_size,
+      ttl_seconds=settings.bootstrap_cache_ttl_seconds,
+      redis_client=redis_client,
+      redis_ttl_seconds=settings.bootstrap_cache_redis_ttl_seconds
+    )
+  return _bootstrap_cache
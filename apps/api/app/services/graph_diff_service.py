@@ -0,0 +1,121 @@
+"""Structural diffs between two strategy graphs for the version compare view."""
+
+from __future__ import annotations
+
+from collections.abc import Hashable
+from typing import Any
+
+from app.config import get_settings
+from app.services.graph_validation_service import canonical_graph_hash
+from app.services.ttl_cache import TTLCache
+
+_MISSING = object()
+
+
+def _index_items(items: Any) -> dict[str, dict[str, Any]]:
+  """Index nodes or edges by id in one pass.
+
+  Items without a usable id (or repeating one already seen) are keyed by their content
+  hash instead, so invalid graphs still diff instead of failing the compare view.
+  """
+  indexed: dict[str, dict[str, Any]] = {}
+  if not isinstance(items, list):
+    return indexed
+  for item in items:
+    if not isinstance(item, dict):
+      continue
+    item_id = item.get("id")
+    if not isinstance(item_id, str) or not item_id or item_id in indexed:
+      item_id = f"#{canonical_graph_hash(item)}"
+    indexed[item_id] = item
+  return indexed
+
+
+def _value_changes(before: dict[str, Any], after: dict[str, Any], prefix: str = "") -> dict[str, Any]:
+  changes: dict[str, Any] = {}
+  for key in dict.fromkeys([*before, *after]):
+    old, new = before.get(key, _MISSING), after.get(key, _MISSING)
+    if old != new:
+      changes[f"{prefix}{key}"] = {
+        "before": None if old is _MISSING else old,
+        "after": None if new is _MISSING else new
+      }
+  return changes
+
+
+def _item_change(item_id: str, before: dict[str, Any], after: dict[str, Any]) -> dict[str, Any]:
+  """Describe a changed node or edge, splitting block parameters out of ``metadata``."""
+  before_metadata = before.get("metadata") if isinstance(before.get("metadata"), dict) else {}
+  after_metadata = after.get("metadata") if isinstance(after.get("metadata"), dict) else {}
+  before_parameters = before_metadata.get("parameters")
+  after_parameters = after_metadata.get("parameters")
+
+  fields = _value_changes(
+    {key: value for key, value in before.items() if key != "metadata"},
+    {key: value for key, value in after.items() if key != "metadata"}
+  )
+  fields.update(_value_changes(
+    {key: value for key, value in before_metadata.items() if key != "parameters"},
+    {key: value for key, value in after_metadata.items() if key != "parameters"},
+    prefix="metadata."
+  ))
+  parameters = _value_changes(
+    before_parameters if isinstance(before_parameters, dict) else {},
+    after_parameters if isinstance(after_parameters, dict) else {}
+  )
+  return {"id": item_id, "fields": fields, "parameters": parameters}
+
+
+def _diff_items(before: Any, after: Any) -> dict[str, list[Any]]:
+  before_index = _index_items(before)
+  after_index = _index_items(after)
+  added = [item for item_id, item in after_index.items() if item_id not in before_index]
+  removed = [item for item_id, item in before_index.items() if item_id not in after_index]
+  changed = [
+    _item_change(item_id, before_index[item_id], item)
+    for item_id, item in after_index.items()
+    if item_id in before_index and before_index[item_id] != item
+  ]
+  return {"added": added, "removed": removed, "changed": changed}
+
+
+def diff_graph_structure(before: dict[str, Any], after: dict[str, Any]) -> dict[str, Any]:
+  """Return added, removed and changed nodes and edges between two graphs.
+
+  Both sides are indexed by id, so the diff is linear in the size of the graphs.
+  Changed items list only the fields and block parameters that differ; other
+  top-level graph keys (viewport, metadata) are reported under ``properties``.
+  """
+  before = before if isinstance(before, dict) else {}
+  after = after if isinstance(after, dict) else {}
+  return {
+    "nodes": _diff_items(before.get("nodes"), after.get("nodes")),
+    "edges": _diff_items(before.get("edges"), after.get("edges")),
+    "properties": _value_changes(
+      {key: value for key, value in before.items() if key not in ("nodes", "edges")},
+      {key: value for key, value in after.items() if key not in ("nodes", "edges")}
+    )
+  }
+
+
+class GraphDiffCache(TTLCache[Hashable, dict[str, Any]]):
+  """Thread-safe LRU of computed diffs keyed by version pair.
+
+  Keys include each version's ``updated_at``, so an autosave overwritten in place
+  misses rather than serving a stale diff, and entries never need to expire.  They
+  are shared between requests, so callers must treat them as read-only.
+  """
+
+  def __init__(self, max_entries: int = 256) -> None:
+    super().__init__(max_entries)
+
+
+_diff_cache: GraphDiffCache | None = None
+
+
+def get_diff_cache() -> GraphDiffCache:
+  """Return the process-wide diff cache configured from settings."""
+  global _diff_cache
+  if _diff_cache is None:
+    _diff_cache = GraphDiffCache(max_entries=get_settings().version_diff_cache_size)
+  return _diff_cache
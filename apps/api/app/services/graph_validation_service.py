@@ -2,73 +2,445 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
 from dataclasses import dataclass
-from typing import Any
+from enum import IntEnum
+from functools import partial
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Callable, Iterable
 
-from app.data.block_definitions import BlockDefinition, BlockParameterDefinition, load_block_definitions
+from app.config import get_settings
+from app.data.block_definitions import (
+  BlockDefinition,
+  BlockParameterDefinition,
+  CompiledBlockRegistry,
+  load_block_registry
+)
+from app.services.metrics_service import time_operation
+from app.services.ttl_cache import TTLCache
 
 
-@dataclass
+class IssueCode(IntEnum):
+  """Integer validation issue codes; values are persisted, so never renumber them."""
+
+  MISSING_ID = 1
+  UNKNOWN_BLOCK = 2
+  MISSING_INPUT = 3
+  INVALID_PARAMETER = 4
+  PARAMETER_BELOW_MIN = 5
+  PARAMETER_ABOVE_MAX = 6
+  PARAMETER_NOT_ALLOWED = 7
+  DANGLING_EDGE = 8
+  INCOMPATIBLE_CONNECTION = 9
+  QUOTA_EXCEEDED = 10
+  CYCLE_DETECTED = 11
+  UNKNOWN_PORT = 12
+  VALIDATION_DEFERRED = 13
+
+  @property
+  def slug(self) -> str:
+    """String code exposed to clients (for example ``missing_input``)."""
+    return self.name.lower()
+
+
+# Message templates receive the issue params positionally plus ``node``, ``edge`` and
+# ``all`` (params joined with commas).
+ISSUE_MESSAGES: dict[IssueCode, str] = {
+  IssueCode.MISSING_ID: "Node is missing an id",
+  IssueCode.UNKNOWN_BLOCK: "Block type is not supported",
+  IssueCode.MISSING_INPUT: "Required input '{0}' is not connected",
+  IssueCode.INVALID_PARAMETER: "Parameter '{0}' is not a number",
+  IssueCode.PARAMETER_BELOW_MIN: "{0} must be ≥ {1}",
+  IssueCode.PARAMETER_ABOVE_MAX: "{0} must be ≤ {1}",
+  IssueCode.PARAMETER_NOT_ALLOWED: "{0} must be one of {1}",
+  IssueCode.DANGLING_EDGE: "Edge {edge} references missing nodes",
+  IssueCode.INCOMPATIBLE_CONNECTION: "{0} cannot connect to {1}",
+  IssueCode.QUOTA_EXCEEDED: "{0} exceeds the {1} plan quota ({2}/{3})",
+  IssueCode.CYCLE_DETECTED: "Nodes {all} form a cycle",
+  IssueCode.UNKNOWN_PORT: "{0} has no {1} named '{2}'",
+  IssueCode.VALIDATION_DEFERRED: "Validation is still running for this graph; results will appear on the next save"
+}
+
+WARNING_CODES = frozenset({IssueCode.VALIDATION_DEFERRED})
+
+
+@dataclass(slots=True)
 class ValidationIssue:
-  """Structured validation issue returned to clients."""
+  """Validation issue held as an integer code plus message parameters.
+
+  The stored and compact transport form is ``[code, nodeId, edgeId, params]``;
+  human-readable text is only rendered by :attr:`message` and :meth:`to_payload`.
+  """
 
-  node_id: str | None
-  code: str
-  message: str
-  severity: str = "error"
+  code: IssueCode
+  node_id: str | None = None
+  edge_id: str | None = None
+  params: tuple[Any, ...] = ()
+  # Verbatim message for issues stored before coded issues existed.
+  legacy_message: str | None = None
+
+  @property
+  def severity(self) -> str:
+    """Severity derived from the issue code."""
+    return "warning" if self.code in WARNING_CODES else "error"
+
+  @property
+  def message(self) -> str:
+    """Render the human-readable message."""
+    if self.legacy_message is not None:
+      return self.legacy_message
+    try:
+      return ISSUE_MESSAGES[self.code].format(
+        *self.params,
+        node=self.node_id,
+        edge=self.edge_id,
+        all=", ".join(str(param) for param in self.params)
+      )
+    except (IndexError, KeyError):
+      return self.code.slug
 
   def to_payload(self) -> dict[str, Any]:
-    """Serialise the issue for API responses."""
+    """Serialise the issue with rendered text for API responses."""
     return {
       "nodeId": self.node_id,
-      "code": self.code,
+      "edgeId": self.edge_id,
+      "code": self.code.slug,
       "message": self.message,
       "severity": self.severity
     }
 
+  def to_compact(self) -> tuple[Any, ...]:
+    """Serialise the issue to its compact stored form."""
+    compact = (int(self.code), self.node_id, self.edge_id, self.params)
+    if self.legacy_message is not None:
+      return (*compact, self.legacy_message)
+    return compact
+
+  @classmethod
+  def from_stored(cls, entry: Any) -> "ValidationIssue | None":
+    """Rehydrate a compact issue or a legacy ``to_payload`` dict; ``None`` if unrecognised."""
+    try:
+      if isinstance(entry, (list, tuple)) and len(entry) in (4, 5):
+        return cls(
+          code=IssueCode(entry[0]),
+          node_id=entry[1],
+          edge_id=entry[2],
+          params=tuple(entry[3]),
+          legacy_message=entry[4] if len(entry) == 5 else None
+        )
+      if isinstance(entry, dict):
+        return cls(
+          code=IssueCode[str(entry["code"]).upper()],
+          node_id=entry.get("nodeId"),
+          edge_id=entry.get("edgeId"),
+          legacy_message=entry.get("message")
+        )
+    except (KeyError, ValueError, TypeError):
+      return None
+    return None
+
+
+def render_issues(stored: Iterable[Any] | None) -> list[dict[str, Any]]:
+  """Render stored issues (compact or legacy) into full client payloads."""
+  rendered: list[dict[str, Any]] = []
+  for entry in stored or ():
+    issue = ValidationIssue.from_stored(entry)
+    if issue is not None:
+      rendered.append(issue.to_payload())
+    elif isinstance(entry, dict):
+      rendered.append(entry)
+  return rendered
+
+
+def compact_issues(stored: Iterable[Any] | None) -> list[tuple[Any, ...]]:
+  """Normalise stored issues (compact or legacy) into the compact transport form."""
+  compacted: list[tuple[Any, ...]] = []
+  for entry in stored or ():
+    issue = ValidationIssue.from_stored(entry)
+    if issue is not None:
+      compacted.append(issue.to_compact())
+  return compacted
+
+
+def count_issues(stored: Iterable[Any] | None) -> dict[str, int]:
+  """Return per-severity totals for stored issues without rendering their messages."""
+  totals = {"error": 0, "warning": 0}
+  for entry in stored or ():
+    issue = ValidationIssue.from_stored(entry)
+    if issue is not None:
+      severity = issue.severity
+    elif isinstance(entry, dict):
+      severity = entry.get("severity", "error")
+    else:
+      continue
+    totals[severity] = totals.get(severity, 0) + 1
+  return totals
+
+
+# Issue codes owned by a single node or edge and safe to carry across autosaves.
+NODE_SCOPED_CODES = frozenset({
+  IssueCode.MISSING_INPUT,
+  IssueCode.INVALID_PARAMETER,
+  IssueCode.PARAMETER_BELOW_MIN,
+  IssueCode.PARAMETER_ABOVE_MAX,
+  IssueCode.PARAMETER_NOT_ALLOWED
+})
+EDGE_SCOPED_CODES = frozenset({
+  IssueCode.DANGLING_EDGE,
+  IssueCode.INCOMPATIBLE_CONNECTION,
+  IssueCode.UNKNOWN_PORT
+})
+# Issue codes that are cheap enough to recompute on every pass.
+GRAPH_SCOPED_CODES = frozenset({
+  IssueCode.MISSING_ID,
+  IssueCode.UNKNOWN_BLOCK,
+  IssueCode.QUOTA_EXCEEDED,
+  IssueCode.CYCLE_DETECTED
+})
+
+
+@dataclass
+class ValidationResult:
+  """Validation issues plus the topological execution order.
+
+  ``execution_order`` lists node ids so every node follows its inputs; it is
+  ``None`` when the graph contains a cycle.
+  """
+
+  issues: list[ValidationIssue]
+  execution_order: list[str] | None
+
+
+@dataclass
+class GraphDelta:
+  """Nodes and edges that must be re-checked after an edit."""
+
+  nodes: set[str]
+  edges: set[str]
+
+
+def _index_by_id(items: Any) -> dict[str, dict[str, Any]] | None:
+  if not isinstance(items, list):
+    return None
+  indexed: dict[str, dict[str, Any]] = {}
+  for item in items:
+    item_id = item.get("id") if isinstance(item, dict) else None
+    if not item_id or item_id in indexed:
+      return None
+    indexed[item_id] = item
+  return indexed
+
+
+def diff_graphs(previous: dict[str, Any], current: dict[str, Any]) -> GraphDelta | None:
+  """Return the nodes/edges affected by moving from ``previous`` to ``current``.
+
+  Returns ``None`` when either graph has missing or duplicate ids, in which case the
+  delta cannot be attributed and callers should fall back to a full validation.
+  """
+  if not isinstance(previous, dict) or not isinstance(current, dict):
+    return None
+  previous_nodes = _index_by_id(previous.get("nodes", []))
+  current_nodes = _index_by_id(current.get("nodes", []))
+  previous_edges = _index_by_id(previous.get("edges", []))
+  current_edges = _index_by_id(current.get("edges", []))
+  if previous_nodes is None or current_nodes is None or previous_edges is None or current_edges is None:
+    return None
+
+  changed_nodes = {
+    node_id for node_id, node in current_nodes.items() if previous_nodes.get(node_id) != node
+  }
+  touched_nodes = changed_nodes | (previous_nodes.keys() - current_nodes.keys())
+
+  affected_nodes = set(changed_nodes)
+  affected_edges: set[str] = set()
+  for edge_id, edge in current_edges.items():
+    previous_edge = previous_edges.get(edge_id)
+    if previous_edge != edge or edge.get("source") in touched_nodes or edge.get("target") in touched_nodes:
+      affected_edges.add(edge_id)
+      affected_nodes.add(edge.get("target"))
+      if previous_edge is not None:
+        affected_nodes.add(previous_edge.get("target"))
+  for edge_id, edge in previous_edges.items():
+    if edge_id not in current_edges:
+      affected_nodes.add(edge.get("target"))
+
+  return GraphDelta(nodes=affected_nodes, edges=affected_edges)
+
+
+def _index_previous_issues(
+  stored: Iterable[Any]
+) -> tuple[dict[str, list[ValidationIssue]], dict[str, list[ValidationIssue]]] | None:
+  node_issues: dict[str, list[ValidationIssue]] = {}
+  edge_issues: dict[str, list[ValidationIssue]] = {}
+  for entry in stored:
+    issue = ValidationIssue.from_stored(entry)
+    if issue is not None and issue.code in GRAPH_SCOPED_CODES:
+      continue
+    if issue is not None and issue.code in NODE_SCOPED_CODES and issue.node_id:
+      node_issues.setdefault(issue.node_id, []).append(issue)
+    elif issue is not None and issue.code in EDGE_SCOPED_CODES and issue.edge_id:
+      edge_issues.setdefault(issue.edge_id, []).append(issue)
+    else:
+      # Legacy or unknown issue that cannot be attributed to the delta.
+      return None
+  return node_issues, edge_issues
+
+
+# Phases of ``GraphValidator.analyse`` in execution order, as reported to ``phase_hook``.
+ANALYSIS_PHASES = ("index_nodes", "build_adjacency", "node_checks", "edges", "quota", "topology")
+
+PhaseHook = Callable[[str], AbstractContextManager[Any]]
+
+
+def _no_phase_hook(_phase: str) -> AbstractContextManager[Any]:
+  return nullcontext()
+
 
 class GraphValidator:
   """Validates strategy graphs against starter block definitions and quotas."""
 
-  def __init__(self, plan: str = "free") -> None:
+  def __init__(self, plan: str = "free", registry: CompiledBlockRegistry | None = None) -> None:
     self.plan = plan
-    self.definitions = load_block_definitions()
+    self.registry = registry or load_block_registry()
+    self.definitions = self.registry.definitions
 
   def validate(self, graph: dict[str, Any]) -> list[ValidationIssue]:
     """Run all validation checks and return issues."""
-    issues: list[ValidationIssue] = []
+    return self.analyse(graph).issues
+
+  def analyse(self, graph: dict[str, Any], *, phase_hook: PhaseHook | None = None) -> ValidationResult:
+    """Run all validation checks and compute the execution order.
 
+    ``phase_hook`` is entered as a context manager around each of ``ANALYSIS_PHASES``,
+    which lets the benchmark suite time the real code path phase by phase.
+    """
+    phase = phase_hook or _no_phase_hook
     nodes = graph.get("nodes", []) if isinstance(graph, dict) else []
     edges = graph.get("edges", []) if isinstance(graph, dict) else []
 
-    node_map: dict[str, dict[str, Any]] = {}
-    for node in nodes:
-      node_id = node.get("id")
-      if not node_id:
-        issues.append(ValidationIssue(node_id=None, code="missing_id", message="Node is missing an id"))
-        continue
-      node_map[node_id] = node
-      node_type = node.get("type")
-      if node_type not in self.definitions:
-        issues.append(ValidationIssue(node_id=node_id, code="unknown_block", message="Block type is not supported"))
+    with phase("index_nodes"):
+      issues, node_map = self._index_nodes(nodes)
+    if not node_map:
+      return ValidationResult(issues=issues, execution_order=[])
+
+    with phase("build_adjacency"):
+      adjacency = self._build_adjacency(edges, node_map)
 
+    with phase("node_checks"):
+      for node_id, node in node_map.items():
+        definition = self.definitions.get(node.get("type"))
+        if not definition:
+          # Unknown block already recorded
+          continue
+        issues.extend(self._validate_required_inputs(node_id, node, definition, adjacency, node_map))
+        issues.extend(self._validate_parameters(node_id, node, definition))
+
+    with phase("edges"):
+      issues.extend(self._validate_edges(edges, node_map))
+    with phase("quota"):
+      issues.extend(self._validate_quota(node_map))
+    with phase("topology"):
+      cycle_issues, execution_order = self._validate_topology(node_map, adjacency)
+    issues.extend(cycle_issues)
+
+    return ValidationResult(issues=issues, execution_order=execution_order)
+
+  def validate_incremental(
+    self,
+    graph: dict[str, Any],
+    previous_graph: dict[str, Any],
+    previous_issues: Iterable[Any],
+    *,
+    previous_fingerprint: str | None = None
+  ) -> list[ValidationIssue]:
+    """Re-validate only what changed since ``previous_graph``."""
+    return self.analyse_incremental(
+      graph, previous_graph, previous_issues, previous_fingerprint=previous_fingerprint
+    ).issues
+
+  def analyse_incremental(
+    self,
+    graph: dict[str, Any],
+    previous_graph: dict[str, Any],
+    previous_issues: Iterable[Any],
+    *,
+    previous_fingerprint: str | None = None
+  ) -> ValidationResult:
+    """Re-validate only what changed since ``previous_graph``.
+
+    Node and edge issues outside the delta are carried over from ``previous_issues``;
+    node presence, quota and cycle checks are always recomputed. The result matches
+    :meth:`analyse`, which is used as a fallback whenever the delta cannot be
+    attributed safely, or when ``previous_fingerprint`` shows the previous issues were
+    computed under different block definitions.
+    """
+    if previous_fingerprint is not None and previous_fingerprint != self.registry.fingerprint:
+      return self.analyse(graph)
+    delta = diff_graphs(previous_graph, graph)
+    carried = _index_previous_issues(previous_issues) if delta is not None else None
+    if delta is None or carried is None:
+      return self.analyse(graph)
+    carried_node_issues, carried_edge_issues = carried
+
+    nodes = graph.get("nodes", [])
+    edges = graph.get("edges", [])
+
+    issues, node_map = self._index_nodes(nodes)
     if not node_map:
-      return issues
+      return ValidationResult(issues=issues, execution_order=[])
 
+    # Cycle detection is global, so the full inbound adjacency is still needed.
     adjacency = self._build_adjacency(edges, node_map)
 
     for node_id, node in node_map.items():
       definition = self.definitions.get(node.get("type"))
       if not definition:
-        # Unknown block already recorded
         continue
-      issues.extend(self._validate_required_inputs(node_id, node, definition, adjacency, node_map))
-      issues.extend(self._validate_parameters(node_id, node, definition))
+      if node_id in delta.nodes:
+        issues.extend(self._validate_required_inputs(node_id, node, definition, adjacency, node_map))
+        issues.extend(self._validate_parameters(node_id, node, definition))
+      else:
+        issues.extend(carried_node_issues.get(node_id, ()))
+
+    for edge in edges:
+      edge_id = edge.get("id")
+      if edge_id in delta.edges:
+        issues.extend(self._validate_edge(edge, node_map))
+      else:
+        issues.extend(carried_edge_issues.get(edge_id, ()))
 
-    issues.extend(self._validate_edges(edges, node_map))
     issues.extend(self._validate_quota(node_map))
+    cycle_issues, execution_order = self._validate_topology(node_map, adjacency)
+    issues.extend(cycle_issues)
 
-    return issues
+    return ValidationResult(issues=issues, execution_order=execution_order)
+
+  def _index_nodes(
+    self,
+    nodes: list[dict[str, Any]]
+  ) -> tuple[list[ValidationIssue], dict[str, dict[str, Any]]]:
+    issues: list[ValidationIssue] = []
+    node_map: dict[str, dict[str, Any]] = {}
+    for node in nodes:
+      node_id = node.get("id")
+      if not node_id:
+        issues.append(ValidationIssue(IssueCode.MISSING_ID))
+        continue
+      node_map[node_id] = node
+      node_type = node.get("type")
+      if node_type not in self.definitions:
+        issues.append(ValidationIssue(IssueCode.UNKNOWN_BLOCK, node_id=node_id))
+    return issues, node_map
 
   def _build_adjacency(
     self,
@@ -92,35 +464,54 @@ class GraphValidator:
     node_map: dict[str, dict[str, Any]]
   ) -> list[ValidationIssue]:
     issues: list[ValidationIssue] = []
-    inbound_edges = adjacency.get(node_id, [])
-    for port in definition.inputs:
-      if not port.required:
-        continue
-      if not self._has_matching_edge(port.type, inbound_edges, node_map):
+    required_ports = self.registry.required_inputs.get(definition.kind, ())
+    if not required_ports:
+      return issues
+    connected_ports, unhandled_mask = self._index_inbound_ports(
+      definition.kind, adjacency.get(node_id, []), node_map
+    )
+    for port, port_bit in required_ports:
+      if port.id not in connected_ports and not unhandled_mask & port_bit:
         issues.append(
           ValidationIssue(
+            IssueCode.MISSING_INPUT,
             node_id=node_id,
-            code="missing_input",
-            message=f"Required input '{port.label}' is not connected"
+            params=(port.label,)
           )
         )
     return issues
 
-  def _has_matching_edge(
+  def _index_inbound_ports(
     self,
-    signal_type: str,
+    target_kind: str,
     edges: list[dict[str, Any]],
     node_map: dict[str, dict[str, Any]]
-  ) -> bool:
+  ) -> tuple[set[str], int]:
+    """Return the input ports fed by handle-addressed edges plus the mask of the rest.
+
+    Edges with a ``targetHandle`` satisfy only that port, and only when the signal
+    they carry matches it. Edges without one fall back to kind-level matching via
+    the returned mask.
+    """
+    input_ports = self.registry.input_port_bits.get(target_kind, {})
+    connected_ports: set[str] = set()
+    unhandled_mask = 0
     for edge in edges:
-      source_id = edge.get("source")
-      source_type = node_map.get(source_id, {}).get("type")
-      source_def = self.definitions.get(source_type)
-      if not source_def:
-        continue
-      if any(output.type == signal_type for output in source_def.outputs):
-        return True
-    return False
+      source_mask = self._source_signal_mask(edge, node_map)
+      target_handle = edge.get("targetHandle")
+      if target_handle:
+        if source_mask & input_ports.get(target_handle, 0):
+          connected_ports.add(target_handle)
+      else:
+        unhandled_mask |= source_mask
+    return connected_ports, unhandled_mask
+
+  def _source_signal_mask(self, edge: dict[str, Any], node_map: dict[str, dict[str, Any]]) -> int:
+    source_type = node_map.get(edge.get("source"), {}).get("type")
+    source_handle = edge.get("sourceHandle")
+    if source_handle:
+      return self.registry.output_port_bits.get(source_type, {}).get(source_handle, 0)
+    return self.registry.output_masks.get(source_type, 0)
 
   def _validate_parameters(
     self,
@@ -150,26 +541,26 @@ class GraphValidator:
       except (TypeError, ValueError):
         issues.append(
           ValidationIssue(
+            IssueCode.INVALID_PARAMETER,
             node_id=node_id,
-            code="invalid_parameter",
-            message=f"Parameter '{parameter.label}' is not a number"
+            params=(parameter.label,)
           )
         )
         return issues
       if parameter.min is not None and numeric_value < parameter.min:
         issues.append(
           ValidationIssue(
+            IssueCode.PARAMETER_BELOW_MIN,
             node_id=node_id,
-            code="parameter_below_min",
-            message=f"{parameter.label} must be ≥ {parameter.min}"
+            params=(parameter.label, parameter.min)
           )
         )
       if parameter.max is not None and numeric_value > parameter.max:
         issues.append(
           ValidationIssue(
+            IssueCode.PARAMETER_ABOVE_MAX,
             node_id=node_id,
-            code="parameter_above_max",
-            message=f"{parameter.label} must be ≤ {parameter.max}"
+            params=(parameter.label, parameter.max)
           )
         )
     elif parameter.type == "enum":
@@ -177,9 +568,9 @@ class GraphValidator:
       if options and value not in options:
         issues.append(
           ValidationIssue(
+            IssueCode.PARAMETER_NOT_ALLOWED,
             node_id=node_id,
-            code="parameter_not_allowed",
-            message=f"{parameter.label} must be one of {', '.join(options)}"
+            params=(parameter.label, ", ".join(options))
           )
         )
     return issues
@@ -191,37 +582,111 @@ class GraphValidator:
   ) -> list[ValidationIssue]:
     issues: list[ValidationIssue] = []
     for edge in edges:
-      source_id = edge.get("source")
-      target_id = edge.get("target")
-      if source_id not in nodes or target_id not in nodes:
-        issues.append(
-          ValidationIssue(
-            node_id=None,
-            code="dangling_edge",
-            message=f"Edge {edge.get('id')} references missing nodes"
-          )
+      issues.extend(self._validate_edge(edge, nodes))
+    return issues
+
+  def _validate_edge(
+    self,
+    edge: dict[str, Any],
+    nodes: dict[str, dict[str, Any]]
+  ) -> list[ValidationIssue]:
+    source_id = edge.get("source")
+    target_id = edge.get("target")
+    if source_id not in nodes or target_id not in nodes:
+      return [
+        ValidationIssue(
+          IssueCode.DANGLING_EDGE,
+          edge_id=edge.get("id")
         )
-        continue
-      source_def = self.definitions.get(nodes[source_id].get("type"))
-      target_def = self.definitions.get(nodes[target_id].get("type"))
-      if not source_def or not target_def:
-        continue
-      if not self._edge_is_compatible(source_def, target_def):
-        issues.append(
-          ValidationIssue(
-            node_id=target_id,
-            code="incompatible_connection",
-            message=f"{source_def.label} cannot connect to {target_def.label}"
-          )
+      ]
+    source_def = self.definitions.get(nodes[source_id].get("type"))
+    target_def = self.definitions.get(nodes[target_id].get("type"))
+    if not source_def or not target_def:
+      return []
+
+    source_handle = edge.get("sourceHandle")
+    target_handle = edge.get("targetHandle")
+    if not source_handle and not target_handle:
+      compatible = self.registry.is_compatible(source_def.kind, target_def.kind)
+    else:
+      source_mask = self.registry.output_masks[source_def.kind]
+      if source_handle:
+        source_mask = self.registry.output_port_bits[source_def.kind].get(source_handle, 0)
+        if not source_mask:
+          return [self._unknown_port_issue(edge, source_id, source_def, source_handle, "output")]
+      target_mask = self.registry.input_masks[target_def.kind]
+      if target_handle:
+        target_mask = self.registry.input_port_bits[target_def.kind].get(target_handle, 0)
+        if not target_mask:
+          return [self._unknown_port_issue(edge, target_id, target_def, target_handle, "input")]
+      compatible = not target_mask or bool(source_mask & target_mask)
+
+    if not compatible:
+      return [
+        ValidationIssue(
+          IssueCode.INCOMPATIBLE_CONNECTION,
+          node_id=target_id,
+          edge_id=edge.get("id"),
+          params=(source_def.label, target_def.label)
         )
-    return issues
+      ]
+    return []
 
-  def _edge_is_compatible(self, source: BlockDefinition, target: BlockDefinition) -> bool:
-    source_types = {port.type for port in source.outputs}
-    target_types = {port.type for port in target.inputs}
-    if not target_types:
-      return True
-    return bool(source_types.intersection(target_types))
+  def _unknown_port_issue(
+    self,
+    edge: dict[str, Any],
+    node_id: str,
+    definition: BlockDefinition,
+    handle: str,
+    direction: str
+  ) -> ValidationIssue:
+    return ValidationIssue(
+      IssueCode.UNKNOWN_PORT,
+      node_id=node_id,
+      edge_id=edge.get("id"),
+      params=(definition.label, direction, handle)
+    )
+
+  def _validate_topology(
+    self,
+    nodes: dict[str, dict[str, Any]],
+    adjacency: dict[str, list[dict[str, Any]]]
+  ) -> tuple[list[ValidationIssue], list[str] | None]:
+    """Return cycle issues and a Kahn topological order (``None`` when cyclic)."""
+    successors: dict[str, list[str]] = {node_id: [] for node_id in nodes}
+    indegree = dict.fromkeys(nodes, 0)
+    for target, inbound_edges in adjacency.items():
+      for edge in inbound_edges:
+        successors[edge["source"]].append(target)
+        indegree[target] += 1
+
+    ready = deque(node_id for node_id, degree in indegree.items() if degree == 0)
+    order: list[str] = []
+    while ready:
+      node_id = ready.popleft()
+      order.append(node_id)
+      for successor in successors[node_id]:
+        indegree[successor] -= 1
+        if indegree[successor] == 0:
+          ready.append(successor)
+
+    if len(order) == len(nodes):
+      return [], order
+
+    # Only nodes on or downstream of a cycle keep a positive in-degree.
+    remaining = [node_id for node_id in nodes if indegree[node_id] > 0]
+    position = {node_id: index for index, node_id in enumerate(nodes)}
+    cycles = [
+      sorted(component, key=position.__getitem__)
+      for component in _strongly_connected_components(remaining, successors)
+      if len(component) > 1 or component[0] in successors[component[0]]
+    ]
+    cycles.sort(key=lambda component: position[component[0]])
+    issues = [
+      ValidationIssue(IssueCode.CYCLE_DETECTED, params=tuple(component))
+      for component in cycles
+    ]
+    return issues, None
 
   def _validate_quota(self, nodes: dict[str, dict[str, Any]]) -> list[ValidationIssue]:
     issues: list[ValidationIssue] = []
@@ -238,15 +703,394 @@ class GraphValidator:
       if limit is not None and count > limit:
         issues.append(
           ValidationIssue(
-            node_id=None,
-            code="quota_exceeded",
-            message=f"{block.label} exceeds the {self.plan} plan quota ({count}/{limit})"
+            IssueCode.QUOTA_EXCEEDED,
+            params=(block.label, self.plan, count, limit)
           )
         )
     return issues
 
 
-def validate_graph(graph: dict[str, Any], plan: str) -> list[dict[str, Any]]:
-  """Convenience helper that returns serialisable validation payload."""
-  validator = GraphValidator(plan=plan)
-  return [issue.to_payload() for issue in validator.validate(graph)]
+def _strongly_connected_components(
+  nodes: Iterable[str],
+  successors: dict[str, list[str]]
+) -> list[list[str]]:
+  """Iterative Tarjan SCC search; linear in nodes plus edges and safe for deep graphs."""
+  index: dict[str, int] = {}
+  lowlink: dict[str, int] = {}
+  stack: list[str] = []
+  on_stack: set[str] = set()
+  components: list[list[str]] = []
+
+  for root in nodes:
+    if root in index:
+      continue
+    index[root] = lowlink[root] = len(index)
+    stack.append(root)
+    on_stack.add(root)
+    work = [(root, iter(successors[root]))]
+    while work:
+      node_id, pending = work[-1]
+      descended = False
+      for successor in pending:
+        if successor not in index:
+          index[successor] = lowlink[successor] = len(index)
+          stack.append(successor)
+          on_stack.add(successor)
+          work.append((successor, iter(successors[successor])))
+          descended = True
+          break
+        if successor in on_stack:
+          lowlink[node_id] = min(lowlink[node_id], index[successor])
+      if descended:
+        continue
+      work.pop()
+      if work:
+        parent = work[-1][0]
+        lowlink[parent] = min(lowlink[parent], lowlink[node_id])
+      if lowlink[node_id] == index[node_id]:
+        component: list[str] = []
+        while True:
+          member = stack.pop()
+          on_stack.discard(member)
+          component.append(member)
+          if member == node_id:
+            break
+        components.append(component)
+
+  return components
+
+
+_validators: dict[str, GraphValidator] = {}
+_validators_lock = threading.Lock()
+
+
+def get_validator(plan: str) -> GraphValidator:
+  """Return the shared validator for ``plan``, rebuilt when block definitions reload.
+
+  Validators hold no per-call state, so one instance per plan is safe to share
+  across requests and worker threads.  The lookup and rebuild happen under a lock so
+  concurrent callers never race to replace an entry.
+  """
+  registry = load_block_registry()
+  with _validators_lock:
+    validator = _validators.get(plan)
+    if validator is None or validator.registry is not registry:
+      validator = GraphValidator(plan=plan, registry=registry)
+      _validators[plan] = validator
+    return validator
+
+
+@dataclass
+class ValidationOutcome:
+  """Compact validation issues plus the execution order for persistence."""
+
+  issues: list[tuple[Any, ...]]
+  execution_order: list[str] | None = None
+  # Block definitions fingerprint the issues were computed under; ``None`` when deferred.
+  fingerprint: str | None = None
+
+  def copy(self) -> "ValidationOutcome":
+    """Return a copy that callers may mutate without affecting cached entries."""
+    # Compact issues are tuples, so copying the containers is sufficient.
+    return ValidationOutcome(
+      issues=list(self.issues),
+      execution_order=None if self.execution_order is None else list(self.execution_order),
+      fingerprint=self.fingerprint
+    )
+
+
+class ValidationCache(TTLCache[str, ValidationOutcome]):
+  """Size- and TTL-bounded LRU of validation outcomes keyed by graph hash.
+
+  Outcomes are copied in and out, so callers may mutate what they receive.
+  """
+
+  def __init__(
+    self,
+    max_entries: int = 512,
+    ttl_seconds: float = 300.0,
+    clock: Callable[[], float] = time.monotonic
+  ) -> None:
+    super().__init__(max_entries, ttl_seconds, clock)
+
+  def get(self, key: str, *, record: bool = True) -> ValidationOutcome | None:
+    """Return a copy of the cached outcome, or ``None`` when missing or expired."""
+    outcome = super().get(key, record=record)
+    return None if outcome is None else outcome.copy()
+
+  def put(self, key: str, value: ValidationOutcome) -> None:
+    """Store a copy of ``value``."""
+    super().put(key, value.copy())
+
+
+_validation_cache: ValidationCache | None = None
+
+
+def get_validation_cache() -> ValidationCache:
+  """Return the process-wide validation cache configured from settings."""
+  global _validation_cache
+  if _validation_cache is None:
+    settings = get_settings()
+    _validation_cache = ValidationCache(
+      max_entries=settings.validation_cache_size,
+      ttl_seconds=settings.validation_cache_ttl_seconds
+    )
+  return _validation_cache
+
+
+def canonical_graph_hash(graph: Any) -> str:
+  """Return a key-order-independent SHA-256 digest of the graph payload."""
+  encoded = json.dumps(graph, sort_keys=True, separators=(",", ":"), default=str)
+  return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def validation_cache_key(graph: Any, plan: str, generation: int) -> str:
+  """Build the cache key for a graph validated under ``plan`` and a definitions generation."""
+  return f"{generation}:{plan}:{canonical_graph_hash(graph)}"
+
+
+def validate_graph_outcome(
+  graph: dict[str, Any],
+  plan: str,
+  *,
+  previous_graph: dict[str, Any] | None = None,
+  previous_issues: Iterable[Any] | None = None,
+  previous_fingerprint: str | None = None
+) -> ValidationOutcome:
+  """Validate a graph and return serialisable issues plus its execution order.
+
+  Results are served from the validation cache when the same graph was validated
+  recently. Otherwise, when the previous graph and its stored issues are supplied
+  and were computed under the current block definitions (``previous_fingerprint``),
+  only the delta between the two graphs is re-validated.
+  """
+  validator = get_validator(plan)
+  cache = get_validation_cache()
+  cache_key = validation_cache_key(graph, plan, validator.registry.generation)
+  cached = cache.get(cache_key)
+  if cached is not None:
+    return cached
+
+  fingerprint = validator.registry.fingerprint
+  if previous_graph is not None and previous_issues is not None and previous_fingerprint == fingerprint:
+    result = validator.analyse_incremental(
+      graph, previous_graph, previous_issues, previous_fingerprint=previous_fingerprint
+    )
+  else:
+    result = validator.analyse(graph)
+  outcome = ValidationOutcome(
+    issues=[issue.to_compact() for issue in result.issues],
+    execution_order=result.execution_order,
+    fingerprint=fingerprint
+  )
+  cache.put(cache_key, outcome)
+  return outcome.copy()
+
+
+def validate_graph(
+  graph: dict[str, Any],
+  plan: str,
+  *,
+  previous_graph: dict[str, Any] | None = None,
+  previous_issues: Iterable[Any] | None = None,
+  previous_fingerprint: str | None = None
+) -> list[dict[str, Any]]:
+  """Convenience helper that returns rendered validation payload."""
+  outcome = validate_graph_outcome(
+    graph,
+    plan,
+    previous_graph=previous_graph,
+    previous_issues=previous_issues,
+    previous_fingerprint=previous_fingerprint
+  )
+  return render_issues(outcome.issues)
+
+
+performance_logger = logging.getLogger("strategybuilder.performance")
+
+
+class ValidationPool:
+  """Bounded thread pool that keeps large validations off the event loop.
+
+  Admission is capped at ``max_pending`` queued or running validations so autosave
+  storms cannot build an unbounded backlog behind the workers.
+  """
+
+  def __init__(self, max_workers: int = 2, max_pending: int = 8) -> None:
+    self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="graph-validation")
+    self._slots = threading.BoundedSemaphore(max_pending)
+
+  def try_submit(self, function: Callable[[], Any]) -> Future | None:
+    """Schedule ``function`` or return ``None`` when the admission budget is exhausted."""
+    if not self._slots.acquire(blocking=False):
+      return None
+    try:
+      future = self._executor.submit(function)
+    except RuntimeError:
+      self._slots.release()
+      raise
+    future.add_done_callback(lambda _: self._slots.release())
+    return future
+
+  def shutdown(self) -> None:
+    """Stop accepting work and release worker threads."""
+    self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_validation_pool: ValidationPool | None = None
+
+
+def get_validation_pool() -> ValidationPool:
+  """Return the process-wide validation pool configured from settings."""
+  global _validation_pool
+  if _validation_pool is None:
+    settings = get_settings()
+    _validation_pool = ValidationPool(
+      max_workers=settings.validation_max_workers,
+      max_pending=settings.validation_max_pending
+    )
+  return _validation_pool
+
+
+_batch_executor: ProcessPoolExecutor | None = None
+
+
+def _warm_batch_worker() -> None:
+  # Compile the block registry once per worker instead of on its first graph.
+  load_block_registry()
+
+
+def batch_worker_count() -> int:
+  """Return the batch pool size: the configured value, else one worker per core."""
+  return get_settings().validation_batch_max_workers or os.cpu_count() or 1
+
+
+def get_batch_executor() -> ProcessPoolExecutor:
+  """Return the process pool used to fan out batch validations across cores.
+
+  Workers start from a forkserver rather than forking the API process, which holds
+  the validation threads and database/Redis client locks a fork would copy mid-use.
+  """
+  global _batch_executor
+  if _batch_executor is None:
+    _batch_executor = ProcessPoolExecutor(
+      max_workers=batch_worker_count(),
+      mp_context=multiprocessing.get_context("forkserver"),
+      initializer=_warm_batch_worker
+    )
+  return _batch_executor
+
+
+def shutdown_validation_pool() -> None:
+  """Shut down the validation pools, if they were started."""
+  global _validation_pool, _batch_executor
+  if _validation_pool is not None:
+    _validation_pool.shutdown()
+    _validation_pool = None
+  if _batch_executor is not None:
+    _batch_executor.shutdown(wait=False, cancel_futures=True)
+    _batch_executor = None
+
+
+def graph_size(graph: Any) -> int:
+  """Return the node plus edge count used to decide whether to offload validation."""
+  if not isinstance(graph, dict):
+    return 0
+  nodes = graph.get("nodes")
+  edges = graph.get("edges")
+  return (len(nodes) if isinstance(nodes, list) else 0) + (len(edges) if isinstance(edges, list) else 0)
+
+
+def deferred_validation_issue() -> tuple[Any, ...]:
+  """Compact issue returned when validation did not finish within the request budget."""
+  return ValidationIssue(IssueCode.VALIDATION_DEFERRED).to_compact()
+
+
+async def validate_graph_async(
+  graph: dict[str, Any],
+  plan: str,
+  *,
+  previous_graph: dict[str, Any] | None = None,
+  previous_issues: Iterable[Any] | None = None,
+  previous_fingerprint: str | None = None
+) -> ValidationOutcome:
+  """Validate without blocking the event loop for graphs above the offload threshold.
+
+  Small graphs are validated inline. Larger graphs run on the validation pool and
+  are given ``validation_budget_ms`` to finish; past that, or when the pool is full,
+  a ``validation_deferred`` warning is returned. A validation that outlives its
+  budget keeps running and populates the cache for the next request.
+  """
+  settings = get_settings()
+  run = partial(
+    validate_graph_outcome,
+    graph,
+    plan,
+    previous_graph=previous_graph,
+    previous_issues=previous_issues,
+    previous_fingerprint=previous_fingerprint
+  )
+  size = graph_size(graph)
+  with time_operation("graph_validation", settings.validation_budget_ms):
+    if size < settings.validation_offload_threshold:
+      return run()
+
+    future = get_validation_pool().try_submit(run)
+    if future is None:
+      performance_logger.warning(
+        "graph_validation.deferred",
+        extra={"reason": "pool_saturated", "graph_size": size, "plan": plan}
+      )
+      return ValidationOutcome(issues=[deferred_validation_issue()])
+
+    try:
+      return await asyncio.wait_for(
+        asyncio.shield(asyncio.wrap_future(future)),
+        timeout=settings.validation_budget_ms / 1000
+      )
+    except asyncio.TimeoutError:
+      performance_logger.warning(
+        "graph_validation.deferred",
+        extra={"reason": "budget_exceeded", "graph_size": size, "plan": plan}
+      )
+      return ValidationOutcome(issues=[deferred_validation_issue()])
+
+
+def _validate_batch_item(index: int, graph: dict[str, Any], plan: str) -> tuple[int, ValidationOutcome]:
+  # Module-level so it can be pickled into the process pool.
+  return index, validate_graph_outcome(graph, plan)
+
+
+async def validate_graphs_batch(
+  items: Iterable[tuple[dict[str, Any], str]]
+) -> AsyncIterator[tuple[int, ValidationOutcome]]:
+  """Validate ``(graph, plan)`` pairs across the process pool.
+
+  Yields ``(index, outcome)`` as each validation finishes, so results arrive in
+  completion order rather than request order.  At most twice the pool's worker
+  count is in flight at once: the next graph is submitted as each result drains,
+  so a client that disconnects leaves at most that much queued work behind.
+  """
+  loop = asyncio.get_running_loop()
+  executor = get_batch_executor()
+  window = 2 * batch_worker_count()
+  work = iter(enumerate(items))
+  pending: set[asyncio.Future[tuple[int, ValidationOutcome]]] = set()
+
+  def submit_next() -> None:
+    for index, (graph, plan) in work:
+      pending.add(loop.run_in_executor(executor, _validate_batch_item, index, graph, plan))
+      if len(pending) >= window:
+        return
+
+  try:
+    submit_next()
+    while pending:
+      done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+      pending.difference_update(done)
+      submit_next()
+      for future in done:
+        yield future.result()
+  finally:
+    for future in pending:
+      future.cancel()
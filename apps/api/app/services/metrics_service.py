@@ -0,0 +1,289 @@
+"""In-process latency histograms exposed in the Prometheus text format.
+
+Every request is timed by ``LatencyMetricsMiddleware`` and services wrap their hot
+paths in ``time_operation``.  Observations land in fixed buckets, so recording is a
+bisect and two increments under the family lock; percentiles are computed at query time
+(``histogram_quantile`` in Prometheus, or ``HistogramChild.quantile`` locally).
+Durations above their budget also increment a violation counter, which makes budget
+regressions alertable without shipping every request to the log pipeline.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from time import perf_counter
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.15, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_DURATION = "strategybuilder_http_request_duration_seconds"
+HTTP_BUDGET_VIOLATIONS = "strategybuilder_http_budget_violations_total"
+OPERATION_DURATION = "strategybuilder_operation_duration_seconds"
+OPERATION_BUDGET_VIOLATIONS = "strategybuilder_operation_budget_violations_total"
+
+
+def _format_value(value: float) -> str:
+  if value == math.inf:
+    return "+Inf"
+  return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+  return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+  pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+  if extra:
+    pairs.append(extra)
+  return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class HistogramChild:
+  """Bucket counts for one label combination.
+
+  Updates take the owning family's lock: ``time_operation`` also runs in worker
+  threads (``asyncio.to_thread``, the validation pool), where unlocked increments
+  could be lost.  The critical section is a bisect and two additions.
+  """
+
+  __slots__ = ("upper_bounds", "counts", "sum", "_lock")
+
+  def __init__(self, upper_bounds: tuple[float, ...], lock: threading.Lock) -> None:
+    self.upper_bounds = upper_bounds
+    self.counts = [0] * (len(upper_bounds) + 1)
+    self.sum = 0.0
+    self._lock = lock
+
+  def observe(self, value: float) -> None:
+    """Record ``value`` in the first bucket whose upper bound is not below it."""
+    index = bisect_left(self.upper_bounds, value)
+    with self._lock:
+      self.counts[index] += 1
+      self.sum += value
+
+  @property
+  def count(self) -> int:
+    with self._lock:
+      return sum(self.counts)
+
+  def quantile(self, q: float) -> float | None:
+    """Estimate the ``q`` quantile by interpolating within its bucket.
+
+    Follows ``histogram_quantile``: values past the last finite bound report that
+    bound.  Returns ``None`` when nothing has been observed.
+    """
+    with self._lock:
+      counts = list(self.counts)
+    total = sum(counts)
+    if total == 0:
+      return None
+    rank = q * total
+    cumulative = 0
+    for index, bucket_count in enumerate(counts):
+      if cumulative + bucket_count >= rank and bucket_count:
+        if index == len(self.upper_bounds):
+          return self.upper_bounds[-1]
+        lower = self.upper_bounds[index - 1] if index else 0.0
+        upper = self.upper_bounds[index]
+        return lower + (upper - lower) * (rank - cumulative) / bucket_count
+      cumulative += bucket_count
+    return self.upper_bounds[-1]
+
+
+class CounterChild:
+  """Monotonic counter for one label combination; updates take the family lock."""
+
+  __slots__ = ("value", "_lock")
+
+  def __init__(self, lock: threading.Lock) -> None:
+    self.value = 0.0
+    self._lock = lock
+
+  def inc(self, amount: float = 1.0) -> None:
+    with self._lock:
+      self.value += amount
+
+
+class _Family(ABC):
+  """Metric family: one child per label combination, sharing one lock."""
+
+  def __init__(self, name: str, documentation: str, labelnames: Sequence[str]) -> None:
+    self.name = name
+    self.documentation = documentation
+    self.labelnames = tuple(labelnames)
+    self._children: dict[tuple[str, ...], object] = {}
+    self._lock = threading.Lock()
+
+  @abstractmethod
+  def _new_child(self) -> object:
+    """Return an empty child bound to this family's lock."""
+
+  def _child(self, values: tuple[str, ...]) -> object:
+    # Lookups of existing children are lock-free; only first use of a label set locks.
+    child = self._children.get(values)
+    if child is None:
+      if len(values) != len(self.labelnames):
+        raise ValueError(f"{self.name} expects labels {self.labelnames}")
+      with self._lock:
+        child = self._children.setdefault(values, self._new_child())
+    return child
+
+  def _samples(self) -> list[tuple[tuple[str, ...], object]]:
+    with self._lock:
+      return sorted(self._children.items())
+
+  @abstractmethod
+  def render(self) -> list[str]:
+    """Return the family's lines in the Prometheus text format."""
+
+
+class Histogram(_Family):
+  """Histogram family with fixed bucket bounds shared by every label combination."""
+
+  def __init__(
+    self,
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS
+  ) -> None:
+    super().__init__(name, documentation, labelnames)
+    self.upper_bounds = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+
+  def _new_child(self) -> HistogramChild:
+    return HistogramChild(self.upper_bounds, self._lock)
+
+  def labels(self, *values: str) -> HistogramChild:
+    return self._child(values)  # type: ignore[return-value]
+
+  def render(self) -> list[str]:
+    lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+    for values, child in self._samples():
+      with self._lock:
+        counts, total = list(child.counts), child.sum
+      cumulative = 0
+      for bound, bucket_count in zip((*self.upper_bounds, math.inf), counts):
+        cumulative += bucket_count
+        labels = _label_text(self.labelnames, values, f'le="{_format_value(bound)}"')
+        lines.append(f"{self.name}_bucket{labels} {cumulative}")
+      labels = _label_text(self.labelnames, values)
+      lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+      lines.append(f"{self.name}_count{labels} {cumulative}")
+    return lines
+
+
+class Counter(_Family):
+  """Counter family; values only go up until the process restarts."""
+
+  def _new_child(self) -> CounterChild:
+    return CounterChild(self._lock)
+
+  def labels(self, *values: str) -> CounterChild:
+    return self._child(values)  # type: ignore[return-value]
+
+  def render(self) -> list[str]:
+    lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+    for values, child in self._samples():
+      lines.append(f"{self.name}{_label_text(self.labelnames, values)} {_format_value(child.value)}")
+    return lines
+
+
+class MetricsRegistry:
+  """Named metric families rendered together for ``/metrics``."""
+
+  def __init__(self) -> None:
+    self._families: dict[str, _Family] = {}
+    self._lock = threading.Lock()
+
+  def _family(self, name: str, factory: Callable[[], _Family]) -> _Family:
+    # Families are looked up on every observation, so only registration takes the lock.
+    family = self._families.get(name)
+    if family is None:
+      with self._lock:
+        family = self._families.get(name)
+        if family is None:
+          family = self._families[name] = factory()
+    return family
+
+  def histogram(
+    self,
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS
+  ) -> Histogram:
+    """Return the histogram called ``name``, registering it on first use."""
+    family = self._family(name, lambda: Histogram(name, documentation, labelnames, buckets))
+    if not isinstance(family, Histogram) or family.labelnames != tuple(labelnames):
+      raise ValueError(f"Metric {name} is already registered with a different shape")
+    return family
+
+  def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    """Return the counter called ``name``, registering it on first use."""
+    family = self._family(name, lambda: Counter(name, documentation, labelnames))
+    if not isinstance(family, Counter) or family.labelnames != tuple(labelnames):
+      raise ValueError(f"Metric {name} is already registered with a different shape")
+    return family
+
+  def render(self) -> str:
+    """Return every family in the Prometheus text exposition format."""
+    with self._lock:
+      families = sorted(self._families.values(), key=lambda family: family.name)
+    lines: list[str] = []
+    for family in families:
+      lines.extend(family.render())
+    return "\n".join(lines) + "\n"
+
+
+_registry: MetricsRegistry | None = None
+
+
+def get_metrics_registry() -> MetricsRegistry:
+  """Return the process-wide metrics registry."""
+  global _registry
+  if _registry is None:
+    _registry = MetricsRegistry()
+  return _registry
+
+
+def observe_request(method: str, route: str, duration_s: float, budget_ms: float | None) -> None:
+  """Record one HTTP request against its route template and latency budget."""
+  registry = get_metrics_registry()
+  registry.histogram(
+    HTTP_DURATION, "HTTP request latency by route template.", ("method", "route")
+  ).labels(method, route).observe(duration_s)
+  # The violation series is created alongside the histogram so it reports 0, not absent.
+  violations = registry.counter(
+    HTTP_BUDGET_VIOLATIONS, "HTTP requests slower than their route budget.", ("method", "route")
+  ).labels(method, route)
+  if budget_ms is not None and duration_s * 1000 > budget_ms:
+    violations.inc()
+
+
+def observe_operation(operation: str, duration_s: float, budget_ms: float | None = None) -> None:
+  """Record one timed service operation and whether it exceeded ``budget_ms``."""
+  registry = get_metrics_registry()
+  registry.histogram(
+    OPERATION_DURATION, "Service operation latency.", ("operation",)
+  ).labels(operation).observe(duration_s)
+  violations = registry.counter(
+    OPERATION_BUDGET_VIOLATIONS, "Service operations slower than their budget.", ("operation",)
+  ).labels(operation)
+  if budget_ms is not None and duration_s * 1000 > budget_ms:
+    violations.inc()
+
+
+@contextmanager
+def time_operation(operation: str, budget_ms: float | None = None) -> Iterator[None]:
+  """Time the enclosed block as ``operation``; failed attempts are recorded too."""
+  start = perf_counter()
+  try:
+    yield
+  finally:
+    observe_operation(operation, perf_counter() - start, budget_ms)
@@ -0,0 +1,51 @@
+"""Queue demo workspace provisioning on the Celery workers.
+
+Provisioning is requested as soon as a user records consent, so the workspace is
+usually seeded before their first ``/workspaces/bootstrap`` call.  Bootstrap never
+waits for the worker: if the workspace is still missing it seeds inline, and the
+unique ``workspaces.user_id`` constraint lets whichever writer loses adopt the
+winner's workspace.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from functools import lru_cache
+
+from celery import Celery
+from kombu.exceptions import KombuError
+
+from app.config import get_settings
+
+WORKSPACE_BOOTSTRAP_TASK = "worker.tasks.bootstrap_workspace"
+WORKSPACE_QUEUE = "workspace"
+
+logger = logging.getLogger("strategybuilder.performance")
+
+
+@lru_cache
+def get_task_client() -> Celery:
+  """Return a producer-only Celery app bound to the worker broker."""
+  return Celery("strategybuilder", broker=get_settings().redis_url)
+
+
+async def request_workspace_provisioning(user_id: str) -> bool:
+  """Queue the ``bootstrap_workspace`` task for ``user_id``.
+
+  Returns ``False`` when the broker is unreachable; bootstrap then seeds inline, so
+  failing to queue never blocks a user.
+  """
+  try:
+    await asyncio.to_thread(
+      get_task_client().send_task,
+      WORKSPACE_BOOTSTRAP_TASK,
+      args=[user_id],
+      queue=WORKSPACE_QUEUE,
+      retry=False
+    )
+  except (KombuError, OSError):
+    logger.warning("workspaces.provisioning.enqueue_failed", extra={"user_id": user_id}, exc_info=True)
+    return False
+  return True
+
@@ -2,22 +2,94 @@
 
 from __future__ import annotations
 
+import base64
+import binascii
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import partial
 import uuid
 
 from typing import Any, Iterable
 
 from fastapi import HTTPException, status
-from sqlalchemy import func, select
+from pydantic import ValidationError
+from sqlalchemy import and_, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import lazyload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.api.schemas.strategy_versions import StrategyVersionTransferRecord
 from app.auth.schemas import AuthenticatedUser
+from app.config import get_settings
+from app.db.session import call_after_commit
 from app.models.strategy import Strategy, StrategyVersion
 from app.models.workspace import Workspace
-from app.services.graph_validation_service import validate_graph
+from app.services.bootstrap_cache_service import get_bootstrap_cache
+from app.services.graph_diff_service import diff_graph_structure, get_diff_cache
+from app.services.metrics_service import time_operation
+from app.services.graph_validation_service import (
+  ValidationOutcome,
+  canonical_graph_hash,
+  render_issues,
+  validate_graph_async,
+  validate_graphs_batch
+)
+from app.services.version_storage_service import (
+  apply_graph_delta,
+  existing_blob_hashes,
+  graph_storage_fields,
+  resolve_version_graphs,
+  summary_fields
+)
 
+# Columns loaded for graph-free history summaries.
+SUMMARY_COLUMNS = (
+  StrategyVersion.id,
+  StrategyVersion.strategy_id,
+  StrategyVersion.version,
+  StrategyVersion.label,
+  StrategyVersion.node_count,
+  StrategyVersion.edge_count,
+  StrategyVersion.error_count,
+  StrategyVersion.warning_count,
+  StrategyVersion.created_at,
+  StrategyVersion.updated_at
+)
 
-def _determine_plan(user: AuthenticatedUser) -> str:
+
+@dataclass(slots=True)
+class VersionPage:
+  """One page of version history plus the cursor for the next page."""
+
+  versions: list[StrategyVersion]
+  next_cursor: str | None
+
+
+@dataclass(slots=True)
+class ImportSummary:
+  """Number of versions appended by an import and the strategy's new latest version."""
+
+  imported: int
+  latest_version: int
+
+
+@dataclass(slots=True)
+class VersionDiff:
+  """Structural changes between two versions of one strategy."""
+
+  before: StrategyVersion
+  after: StrategyVersion
+  changes: dict[str, Any]
+
+
+def _invalidate_bootstrap_after_commit(session: AsyncSession, user: AuthenticatedUser) -> None:
+  # Invalidating before commit lets a concurrent bootstrap re-cache the old history.
+  call_after_commit(session, partial(get_bootstrap_cache().invalidate, user.id))
+
+
+def determine_plan(user: AuthenticatedUser) -> str:
+  """Return the validation plan that applies to ``user``."""
   return "pro" if "pro" in user.roles else "free"
 
 
@@ -37,27 +109,223 @@ async def _fetch_strategy(
   return strategy
 
 
-async def list_versions(
+async def _fetch_version(
+  session: AsyncSession,
+  strategy: Strategy,
+  version_id: uuid.UUID
+) -> StrategyVersion:
+  version = await session.scalar(
+    select(StrategyVersion)
+    .where(StrategyVersion.id == version_id, StrategyVersion.strategy_id == strategy.id)
+  )
+  if not version:
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Version not found")
+  return version
+
+
+async def _allocate_version_number(session: AsyncSession, strategy: Strategy) -> int:
+  """Atomically bump ``strategy.latest_version`` and return the allocated number.
+
+  The UPDATE takes the strategy row lock, so concurrent writers for one strategy
+  serialise here and each sees the previous writer's version once it commits.
+  """
+  result = await session.execute(
+    update(Strategy)
+    .where(Strategy.id == strategy.id)
+    .values(latest_version=Strategy.latest_version + 1)
+    .returning(Strategy.latest_version)
+    .execution_options(synchronize_session=False)
+  )
+  number = result.scalar_one()
+  set_committed_value(strategy, "latest_version", number)
+  return number
+
+
+def _delta_base(latest: StrategyVersion | None, next_version: int) -> StrategyVersion | None:
+  """Return ``latest`` if it directly precedes ``next_version`` and can anchor a delta."""
+  if latest is not None and latest.version == next_version - 1:
+    return latest
+  return None
+
+
+async def _lock_strategy(session: AsyncSession, strategy: Strategy, timestamp: datetime) -> int:
+  """Touch ``strategy`` under its row lock and return the current ``latest_version``."""
+  result = await session.execute(
+    update(Strategy)
+    .where(Strategy.id == strategy.id)
+    .values(updated_at=timestamp)
+    .returning(Strategy.latest_version)
+    .execution_options(synchronize_session=False)
+  )
+  number = result.scalar_one()
+  set_committed_value(strategy, "latest_version", number)
+  set_committed_value(strategy, "updated_at", timestamp)
+  return number
+
+
+async def _fetch_recent_versions(session: AsyncSession, strategy: Strategy) -> list[StrategyVersion]:
+  """Return the newest versions (newest first) with graphs resolved from the delta chain."""
+  result = await session.execute(
+    select(StrategyVersion)
+    .where(StrategyVersion.strategy_id == strategy.id)
+    .order_by(StrategyVersion.version.desc())
+    .limit(get_settings().version_keyframe_interval)
+  )
+  recent = list(result.scalars())
+  await resolve_version_graphs(session, recent)
+  return recent
+
+
+def _coalescible(
+  latest: StrategyVersion | None,
+  latest_number: int,
+  user: AuthenticatedUser,
+  timestamp: datetime
+) -> bool:
+  """Return whether an autosave at ``timestamp`` may overwrite ``latest`` in place.
+
+  The window is a debounce: it is measured from the row's last write, so a steady
+  stream of autosaves keeps folding into one row until the editor pauses.
+  """
+  window = get_settings().autosave_coalesce_seconds
+  if latest is None or latest.version != latest_number or not latest.is_autosave:
+    return False
+  last_write = latest.updated_at or latest.created_at
+  if latest.author_id != uuid.UUID(user.id) or last_write is None:
+    return False
+  if last_write.tzinfo is None:
+    last_write = last_write.replace(tzinfo=timezone.utc)
+  return (timestamp - last_write).total_seconds() <= window
+
+
+def encode_version_cursor(version: StrategyVersion) -> str:
+  """Return the opaque keyset cursor that resumes history after ``version``."""
+  raw = f"{version.created_at.isoformat()}|{version.id}"
+  return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_version_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+  """Parse a cursor produced by ``encode_version_cursor``."""
+  try:
+    created_at, version_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+    return datetime.fromisoformat(created_at), uuid.UUID(version_id)
+  except (binascii.Error, UnicodeError, ValueError) as exc:
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+async def history_marker(
   session: AsyncSession,
   strategy_id: uuid.UUID,
   user: AuthenticatedUser
-) -> list[StrategyVersion]:
+) -> tuple[int, datetime | None]:
+  """Return ``(latest_version, updated_at)``, which changes whenever history changes.
+
+  Every write path (create, coalesce, revert, retention) bumps ``Strategy.updated_at``,
+  so this single indexed lookup is enough to validate cached history responses.
+  """
+  result = await session.execute(
+    select(Strategy.latest_version, Strategy.updated_at)
+    .join(Workspace, Strategy.workspace_id == Workspace.id)
+    .where(Strategy.id == strategy_id, Workspace.user_id == uuid.UUID(user.id))
+  )
+  row = result.first()
+  if row is None:
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Strategy not found")
+  return row.latest_version, row.updated_at
+
+
+async def list_version_page(
+  session: AsyncSession,
+  strategy_id: uuid.UUID,
+  user: AuthenticatedUser,
+  *,
+  limit: int,
+  cursor: str | None = None,
+  include_graphs: bool = True
+) -> VersionPage:
+  """Return up to ``limit`` versions, newest first, starting after ``cursor``.
+
+  Pages are keyed on ``(created_at, id)`` so each request is a bounded index scan
+  regardless of history length.  With ``include_graphs=False`` only the summary
+  columns are loaded.
+  """
   strategy = await _fetch_strategy(session, strategy_id, user)
   stmt = (
     select(StrategyVersion)
     .where(StrategyVersion.strategy_id == strategy.id)
-    .order_by(StrategyVersion.created_at.desc())
+    .order_by(StrategyVersion.created_at.desc(), StrategyVersion.id.desc())
+    .limit(limit + 1)
   )
+  if cursor:
+    created_at, version_id = decode_version_cursor(cursor)
+    stmt = stmt.where(
+      or_(
+        StrategyVersion.created_at < created_at,
+        and_(StrategyVersion.created_at == created_at, StrategyVersion.id < version_id)
+      )
+    )
+  if not include_graphs:
+    stmt = stmt.options(load_only(*SUMMARY_COLUMNS), lazyload(StrategyVersion.blob))
+
   result = await session.execute(stmt)
-  return list(result.scalars())
+  versions = list(result.scalars())
+  next_cursor = encode_version_cursor(versions[limit - 1]) if len(versions) > limit else None
+  versions = versions[:limit]
+  if include_graphs:
+    await resolve_version_graphs(session, versions)
+  return VersionPage(versions=versions, next_cursor=next_cursor)
+
+
+async def get_version(
+  session: AsyncSession,
+  strategy_id: uuid.UUID,
+  version_id: uuid.UUID,
+  user: AuthenticatedUser
+) -> StrategyVersion:
+  """Return a single version with its graph resolved."""
+  strategy = await _fetch_strategy(session, strategy_id, user)
+  version = await _fetch_version(session, strategy, version_id)
+  await resolve_version_graphs(session, [version])
+  return version
+
+
+async def diff_versions(
+  session: AsyncSession,
+  strategy_id: uuid.UUID,
+  from_version_id: uuid.UUID,
+  to_version_id: uuid.UUID,
+  user: AuthenticatedUser
+) -> VersionDiff:
+  """Return the structural diff from one version's graph to another's.
+
+  Diffs are cached per version pair.  Coalesced autosaves are rewritten in place, so
+  each side's ``updated_at`` is part of the cache key.
+  """
+  strategy = await _fetch_strategy(session, strategy_id, user)
+  before = await _fetch_version(session, strategy, from_version_id)
+  after = await _fetch_version(session, strategy, to_version_id)
+  key = (before.id, before.updated_at, after.id, after.updated_at)
+  cache = get_diff_cache()
+  changes = cache.get(key)
+  if changes is None:
+    with time_operation("versions.diff"):
+      # Resolved separately so distant versions do not load every row in between.
+      await resolve_version_graphs(session, [before])
+      await resolve_version_graphs(session, [after])
+      changes = diff_graph_structure(before.graph, after.graph)
+    cache.put(key, changes)
+  return VersionDiff(before=before, after=after, changes=changes)
 
 
 async def validate_version_graph(
   graph: dict[str, Any],
-  user: AuthenticatedUser
-) -> list[dict[str, Any]]:
-  plan = _determine_plan(user)
-  return validate_graph(graph, plan)
+  user: AuthenticatedUser,
+  *,
+  compact: bool = False
+) -> list[Any]:
+  plan = determine_plan(user)
+  outcome = await validate_graph_async(graph, plan)
+  return outcome.issues if compact else render_issues(outcome.issues)
 
 
 async def create_version(
@@ -71,25 +339,69 @@ async def create_version(
   educator_callouts: Iterable[dict[str, Any]] | None = None
 ) -> StrategyVersion:
   strategy = await _fetch_strategy(session, strategy_id, user)
-  plan = _determine_plan(user)
-  issues = validate_graph(graph, plan)
+  plan = determine_plan(user)
+  timestamp = datetime.now(timezone.utc)
 
-  result = await session.execute(
-    select(func.max(StrategyVersion.version)).where(StrategyVersion.strategy_id == strategy.id)
-  )
-  current_max = result.scalar() or 0
-  next_version = current_max + 1
+  # Autosaves may be folded into the latest autosave row; explicit saves always append.
+  # Either way the strategy row lock is taken before reading the chain, so concurrent
+  # writers never encode a delta against a row that is being replaced.
+  coalesce = label is None and get_settings().autosave_coalesce_seconds > 0
+  if coalesce:
+    latest_number = await _lock_strategy(session, strategy, timestamp)
+    recent = await _fetch_recent_versions(session, strategy)
+    latest = recent[0] if recent else None
+    coalesce = _coalescible(latest, latest_number, user, timestamp)
+    next_version = latest_number if coalesce else await _allocate_version_number(session, strategy)
+  else:
+    next_version = await _allocate_version_number(session, strategy)
+    recent = await _fetch_recent_versions(session, strategy)
+    latest = recent[0] if recent else None
 
-  timestamp = datetime.now(timezone.utc)
+  if latest is not None:
+    # Autosaves usually touch a single node or edge, so only the delta is re-validated.
+    outcome = await validate_graph_async(
+      graph,
+      plan,
+      previous_graph=latest.graph,
+      previous_issues=latest.validation_issues or [],
+      previous_fingerprint=latest.validation_fingerprint
+    )
+  else:
+    outcome = await validate_graph_async(graph, plan)
 
+  if coalesce:
+    version = recent[0]
+    base = _delta_base(recent[1] if len(recent) > 1 else None, next_version)
+    fields = {
+      **await graph_storage_fields(session, graph, base),
+      **summary_fields(graph, outcome.issues),
+      "notes": notes,
+      "educator_callouts": list(educator_callouts or []),
+      "validation_issues": outcome.issues,
+      "validation_fingerprint": outcome.fingerprint,
+      "execution_order": outcome.execution_order,
+      "updated_at": timestamp
+    }
+    for key, value in fields.items():
+      setattr(version, key, value)
+    await session.flush()
+    _invalidate_bootstrap_after_commit(session, user)
+    return version
+
+  storage = await graph_storage_fields(session, graph, _delta_base(latest, next_version))
   version = StrategyVersion(
     strategy=strategy,
     version=next_version,
     label=label or f"Auto Save v{next_version}",
-    graph_json=graph,
+    is_autosave=label is None,
+    author_id=uuid.UUID(user.id),
+    **storage,
+    **summary_fields(graph, outcome.issues),
     notes=notes,
     educator_callouts=list(educator_callouts or []),
-    validation_issues=issues,
+    validation_issues=outcome.issues,
+    validation_fingerprint=outcome.fingerprint,
+    execution_order=outcome.execution_order,
     created_at=timestamp,
     updated_at=timestamp
   )
@@ -97,6 +409,7 @@ async def create_version(
   strategy.updated_at = timestamp
 
   await session.flush()
+  _invalidate_bootstrap_after_commit(session, user)
   return version
 
 
@@ -107,30 +420,28 @@ async def revert_to_version(
   user: AuthenticatedUser
 ) -> StrategyVersion:
   strategy = await _fetch_strategy(session, strategy_id, user)
-  target_stmt = (
-    select(StrategyVersion)
-    .where(StrategyVersion.id == version_id, StrategyVersion.strategy_id == strategy.id)
-  )
-  target_version = await session.scalar(target_stmt)
-  if not target_version:
-    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Version not found")
+  target_version = await _fetch_version(session, strategy, version_id)
+  await resolve_version_graphs(session, [target_version])
 
-  result = await session.execute(
-    select(func.max(StrategyVersion.version)).where(StrategyVersion.strategy_id == strategy.id)
-  )
-  current_max = result.scalar() or 0
-  next_version = current_max + 1
+  next_version = await _allocate_version_number(session, strategy)
+  recent = await _fetch_recent_versions(session, strategy)
+  latest = recent[0] if recent else None
 
+  storage = await graph_storage_fields(session, target_version.graph, _delta_base(latest, next_version))
   timestamp = datetime.now(timezone.utc)
   clone_label = f"Revert to v{target_version.version}"
   version = StrategyVersion(
     strategy=strategy,
     version=next_version,
     label=clone_label,
-    graph_json=target_version.graph_json,
+    author_id=uuid.UUID(user.id),
+    **storage,
+    **summary_fields(target_version.graph, target_version.validation_issues),
     notes="Restored from prior version",
     educator_callouts=target_version.educator_callouts,
     validation_issues=target_version.validation_issues,
+    validation_fingerprint=target_version.validation_fingerprint,
+    execution_order=target_version.execution_order,
     created_at=timestamp,
     updated_at=timestamp
   )
@@ -138,4 +449,218 @@ async def revert_to_version(
   strategy.updated_at = timestamp
 
   await session.flush()
+  _invalidate_bootstrap_after_commit(session, user)
   return version
+
+
+def _transfer_record(version: StrategyVersion, graph: dict[str, Any]) -> StrategyVersionTransferRecord:
+  return StrategyVersionTransferRecord(
+    version=version.version,
+    label=version.label,
+    isAutosave=version.is_autosave,
+    authorId=version.author_id,
+    notes=version.notes,
+    graph=graph,
+    educatorCallouts=version.educator_callouts or [],
+    validationIssues=version.validation_issues or [],
+    executionOrder=version.execution_order,
+    createdAt=version.created_at,
+    updatedAt=version.updated_at
+  )
+
+
+async def _stream_export_lines(
+  session_factory: Callable[[], AsyncSession],
+  strategy_id: uuid.UUID,
+  batch_size: int
+) -> AsyncIterator[str]:
+  async with session_factory() as session:
+    result = await session.stream_scalars(
+      select(StrategyVersion)
+      .where(StrategyVersion.strategy_id == strategy_id)
+      .order_by(StrategyVersion.version)
+      .execution_options(yield_per=batch_size)
+    )
+    # Rows arrive oldest first, so each delta applies to the graph held from the
+    # previous row and only one graph is ever kept in memory.
+    current: dict[str, Any] | None = None
+    previous_number: int | None = None
+    async for version in result:
+      graph = version.graph
+      if graph is None:
+        if current is None or previous_number != version.version - 1:
+          raise RuntimeError(f"Strategy version {version.version} cannot be reconstructed")
+        graph = apply_graph_delta(current, version.graph_delta or {})
+      current, previous_number = graph, version.version
+      yield _transfer_record(version, graph).model_dump_json() + "\n"
+
+
+async def export_version_history(
+  session: AsyncSession,
+  session_factory: Callable[[], AsyncSession],
+  strategy_id: uuid.UUID,
+  user: AuthenticatedUser,
+  *,
+  batch_size: int | None = None
+) -> AsyncIterator[str]:
+  """Return an iterator of NDJSON lines, one per version, oldest first.
+
+  Ownership is checked on ``session`` before the iterator is returned, so a missing
+  strategy still produces a 404.  The rows themselves are read from a session opened
+  from ``session_factory`` when iteration starts: a streamed response body outlives
+  the request-scoped session.  Rows arrive through a server-side cursor
+  ``batch_size`` at a time and delta chains are replayed as they stream, keeping
+  memory flat for any history.
+  """
+  strategy = await _fetch_strategy(session, strategy_id, user)
+  size = batch_size or get_settings().version_transfer_batch_size
+  return _stream_export_lines(session_factory, strategy.id, size)
+
+
+def _parse_transfer_line(line_number: int, line: bytes) -> StrategyVersionTransferRecord:
+  try:
+    return StrategyVersionTransferRecord.model_validate_json(line)
+  except ValidationError as exc:
+    raise HTTPException(
+      status_code=status.HTTP_400_BAD_REQUEST,
+      detail=f"Line {line_number} is not a valid version record"
+    ) from exc
+
+
+def _line_too_long(line_number: int, limit: int) -> HTTPException:
+  return HTTPException(
+    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    detail=f"Line {line_number} exceeds {limit} bytes"
+  )
+
+
+async def _read_transfer_records(
+  chunks: AsyncIterable[bytes]
+) -> AsyncIterator[StrategyVersionTransferRecord]:
+  limit = get_settings().version_transfer_max_line_bytes
+  buffer = bytearray()
+  line_number = 0
+  async for chunk in chunks:
+    # Only the new bytes are scanned for a newline, so long lines stay linear.
+    scan_from = len(buffer)
+    buffer += chunk
+    start = 0
+    while (end := buffer.find(b"\n", scan_from)) != -1:
+      line_number += 1
+      if end - start > limit:
+        raise _line_too_long(line_number, limit)
+      line = bytes(buffer[start:end])
+      if line.strip():
+        yield _parse_transfer_line(line_number, line)
+      start = scan_from = end + 1
+    del buffer[:start]
+    if len(buffer) > limit:
+      raise _line_too_long(line_number + 1, limit)
+  if buffer.strip():
+    yield _parse_transfer_line(line_number + 1, bytes(buffer))
+
+
+async def _insert_import_batch(
+  session: AsyncSession,
+  strategy: Strategy,
+  records: list[StrategyVersionTransferRecord],
+  previous: StrategyVersion | None,
+  *,
+  user: AuthenticatedUser,
+  first_version: int,
+  plan: str,
+  timestamp: datetime
+) -> StrategyVersion | None:
+  """Validate ``records`` in parallel, bulk-insert them and return the new delta base."""
+  outcomes: list[ValidationOutcome | None] = [None] * len(records)
+  async for index, outcome in validate_graphs_batch((record.graph, plan) for record in records):
+    outcomes[index] = outcome
+
+  digests = [canonical_graph_hash(record.graph) for record in records]
+  known_blobs = await existing_blob_hashes(session, digests)
+  author_id = uuid.UUID(user.id)
+  rows: list[dict[str, Any]] = []
+  for offset, (record, outcome, digest) in enumerate(zip(records, outcomes, digests)):
+    number = first_version + offset
+    storage = await graph_storage_fields(
+      session, record.graph, previous, digest=digest, known_blobs=known_blobs
+    )
+    graph = storage.pop("materialized_graph")
+    created_at = record.createdAt or timestamp
+    rows.append({
+      "strategy_id": strategy.id,
+      "version": number,
+      "label": record.label,
+      "is_autosave": record.isAutosave,
+      # The client controls the payload, so authorship is the importer's, not the file's.
+      "author_id": author_id,
+      **storage,
+      **summary_fields(graph, outcome.issues),
+      "notes": record.notes,
+      "educator_callouts": record.educatorCallouts,
+      "validation_issues": outcome.issues,
+      "validation_fingerprint": outcome.fingerprint,
+      "execution_order": outcome.execution_order,
+      "created_at": created_at,
+      "updated_at": record.updatedAt or created_at
+    })
+    # Only the graph and depth of the last row are needed to encode the next delta.
+    previous = StrategyVersion(version=number, delta_depth=storage["delta_depth"], materialized_graph=graph)
+
+  await session.execute(insert(StrategyVersion), rows)
+  return previous
+
+
+async def import_version_history(
+  session: AsyncSession,
+  strategy_id: uuid.UUID,
+  user: AuthenticatedUser,
+  lines: AsyncIterable[bytes],
+  *,
+  batch_size: int | None = None
+) -> ImportSummary:
+  """Append the versions in an NDJSON stream to ``strategy_id``'s history.
+
+  Records are renumbered after the current latest version in stream order, keeping
+  their labels and timestamps; every imported row is authored by ``user``.  Every ``batch_size`` records are validated
+  across the batch process pool and written with one bulk INSERT, so memory stays
+  bounded by the batch rather than the history.  The strategy row lock is held for
+  the whole import; an invalid line aborts it and the caller's transaction rolls back.
+  """
+  strategy = await _fetch_strategy(session, strategy_id, user)
+  size = batch_size or get_settings().version_transfer_batch_size
+  plan = determine_plan(user)
+  timestamp = datetime.now(timezone.utc)
+  latest_number = await _lock_strategy(session, strategy, timestamp)
+  recent = await _fetch_recent_versions(session, strategy)
+  previous = _delta_base(recent[0] if recent else None, latest_number + 1)
+
+  imported = 0
+  batch: list[StrategyVersionTransferRecord] = []
+  async for record in _read_transfer_records(lines):
+    batch.append(record)
+    if len(batch) < size:
+      continue
+    previous = await _insert_import_batch(
+      session, strategy, batch, previous,
+      user=user, first_version=latest_number + imported + 1, plan=plan, timestamp=timestamp
+    )
+    imported += len(batch)
+    batch = []
+  if batch:
+    await _insert_import_batch(
+      session, strategy, batch, previous,
+      user=user, first_version=latest_number + imported + 1, plan=plan, timestamp=timestamp
+    )
+    imported += len(batch)
+
+  if imported:
+    await session.execute(
+      update(Strategy)
+      .where(Strategy.id == strategy.id)
+      .values(latest_version=latest_number + imported)
+      .execution_options(synchronize_session=False)
+    )
+    set_committed_value(strategy, "latest_version", latest_number + imported)
+    _invalidate_bootstrap_after_commit(session, user)
+  return ImportSummary(imported=imported, latest_version=latest_number + imported)
@@ -0,0 +1,95 @@
+"""Bounded in-process LRU shared by the service-level caches.
+
+Entries are evicted least recently used first once ``max_entries`` is exceeded and,
+when ``ttl_seconds`` is set, treated as missing once they are older than that.  All
+operations take one lock, so a cache may be shared by the event loop and worker
+threads.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+  """Thread-safe LRU bounded by entry count and, optionally, entry age.
+
+  Stored values are returned as-is, so callers sharing mutable values must copy.
+  """
+
+  def __init__(
+    self,
+    max_entries: int,
+    ttl_seconds: float | None = None,
+    clock: Callable[[], float] = time.monotonic
+  ) -> None:
+    self.max_entries = max_entries
+    self.ttl_seconds = ttl_seconds
+    self.hits = 0
+    self.misses = 0
+    self._clock = clock
+    self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, key: K, *, record: bool = True) -> V | None:
+    """Return the live value for ``key``, or ``None`` when missing or expired.
+
+    With ``record=False`` the hit/miss counters are left for the caller to update
+    through ``record``, e.g. after consulting another tier.
+    """
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is not None and entry[0] <= self._clock():
+        del self._entries[key]
+        entry = None
+      if entry is not None:
+        self._entries.move_to_end(key)
+      if record:
+        if entry is None:
+          self.misses += 1
+        else:
+          self.hits += 1
+      return None if entry is None else entry[1]
+
+  def put(self, key: K, value: V) -> None:
+    """Store ``value``, evicting the least recently used entries beyond capacity."""
+    if self.max_entries <= 0:
+      return
+    expires_at = self._clock() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+    with self._lock:
+      self._entries[key] = (expires_at, value)
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+
+  def pop(self, key: K) -> None:
+    """Drop ``key`` if present."""
+    with self._lock:
+      self._entries.pop(key, None)
+
+  def record(self, hit: bool) -> None:
+    """Count one lookup answered outside ``get``."""
+    with self._lock:
+      if hit:
+        self.hits += 1
+      else:
+        self.misses += 1
+
+  def clear(self) -> None:
+    """Drop all entries and reset counters."""
+    with self._lock:
+      self._entries.clear()
+      self.hits = 0
+      self.misses = 0
+
+  def stats(self) -> dict[str, int]:
+    """Return hit/miss counters and current size."""
+    with self._lock:
+      return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
@@ -0,0 +1,220 @@
+"""Retention policy that thins old autosaves out of strategy version history."""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.graph_blob import GraphBlob
+from app.models.strategy import Strategy, StrategyVersion
+from app.services.version_storage_service import graph_storage_fields, resolve_version_graphs
+
+KEEP_ALL_WINDOW = timedelta(hours=1)
+HOURLY_WINDOW = timedelta(days=1)
+DAILY_WINDOW = timedelta(days=30)
+
+
+@dataclass(slots=True)
+class RetentionProgress:
+  """Outcome of one bounded thinning batch; ``last_strategy_id`` is the resume cursor."""
+
+  strategies: int
+  removed: int
+  last_strategy_id: uuid.UUID | None
+  done: bool
+
+
+def _as_utc(value: datetime) -> datetime:
+  return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def select_versions_to_keep(versions: Sequence[Any], now: datetime) -> set[uuid.UUID]:
+  """Return the ids that survive thinning.
+
+  Labelled saves, reverts and the newest version are always kept.  Autosaves are kept
+  in full for the last hour, then the newest per hour for a day and the newest per day
+  for a month; older autosaves are dropped.  ``versions`` may be models or rows; only
+  ``id``, ``version``, ``created_at`` and ``is_autosave`` are read.
+  """
+  if not versions:
+    return set()
+  keep = {max(versions, key=lambda version: version.version).id}
+  buckets: set[tuple[str, datetime]] = set()
+  for version in sorted(versions, key=lambda item: _as_utc(item.created_at), reverse=True):
+    created_at = _as_utc(version.created_at)
+    age = now - created_at
+    if not version.is_autosave or age <= KEEP_ALL_WINDOW:
+      keep.add(version.id)
+      continue
+    if age <= HOURLY_WINDOW:
+      bucket = ("hour", created_at.replace(minute=0, second=0, microsecond=0))
+    elif age <= DAILY_WINDOW:
+      bucket = ("day", created_at.replace(hour=0, minute=0, second=0, microsecond=0))
+    else:
+      continue
+    if bucket not in buckets:
+      buckets.add(bucket)
+      keep.add(version.id)
+  return keep
+
+
+async def thin_strategy_versions(
+  session: AsyncSession,
+  strategy_id: uuid.UUID,
+  *,
+  now: datetime | None = None,
+  page_size: int = 200
+) -> int:
+  """Delete thinned autosaves for one strategy and repair the surviving delta chain.
+
+  The strategy row is locked first so concurrent saves cannot extend the chain while
+  it is rewritten.  History is walked in ``version`` keyset pages: one pass over the
+  summary columns picks survivors, a second rewrites any surviving delta whose
+  predecessor is deleted as a keyframe and renumbers ``delta_depth``.  Only rewritten
+  rows have their graphs resolved.  Returns the rows removed.
+  """
+  now = now or datetime.now(timezone.utc)
+  locked = await session.execute(
+    select(Strategy.id).where(Strategy.id == strategy_id).with_for_update()
+  )
+  if locked.scalar_one_or_none() is None:
+    return 0
+
+  summaries: list[Any] = []
+  last_number = 0
+  while True:
+    page = (
+      await session.execute(
+        select(
+          StrategyVersion.id,
+          StrategyVersion.version,
+          StrategyVersion.created_at,
+          StrategyVersion.is_autosave
+        )
+        .where(StrategyVersion.strategy_id == strategy_id, StrategyVersion.version > last_number)
+        .order_by(StrategyVersion.version)
+        .limit(page_size)
+      )
+    ).all()
+    summaries.extend(page)
+    if len(page) < page_size:
+      break
+    last_number = page[-1].version
+  keep = select_versions_to_keep(summaries, now)
+  doomed = [summary.id for summary in summaries if summary.id not in keep]
+  if not doomed:
+    return 0
+
+  previous: tuple[int, int] | None = None  # (version, delta_depth) of the last survivor
+  last_number = 0
+  while True:
+    result = await session.execute(
+      select(StrategyVersion)
+      .where(StrategyVersion.strategy_id == strategy_id, StrategyVersion.version > last_number)
+      .order_by(StrategyVersion.version)
+      .limit(page_size)
+    )
+    page = list(result.scalars())
+    for version in page:
+      if version.id not in keep:
+        continue
+      is_delta = version.graph_hash is None and version.graph_json is None
+      if is_delta and (previous is None or previous[0] != version.version - 1):
+        await resolve_version_graphs(session, [version])
+        fields: dict[str, Any] = await graph_storage_fields(session, version.graph, None)
+        for key, value in fields.items():
+          setattr(version, key, value)
+      elif is_delta and version.delta_depth != previous[1] + 1:
+        version.delta_depth = previous[1] + 1
+      previous = (version.version, version.delta_depth)
+    # Flushed rows drop out of the identity map once the page is released.
+    await session.flush()
+    if len(page) < page_size:
+      break
+    last_number = page[-1].version
+
+  for start in range(0, len(doomed), page_size):
+    await session.execute(
+      delete(StrategyVersion)
+      .where(StrategyVersion.id.in_(doomed[start:start + page_size]))
+      .execution_options(synchronize_session=False)
+    )
+  # History changed, so cached history responses (ETags) must be invalidated.  The row
+  # lock taken above is still held, so this cannot race a concurrent save.
+  await session.execute(
+    update(Strategy)
+    .where(Strategy.id == strategy_id)
+    .values(updated_at=now)
+    .execution_options(synchronize_session=False)
+  )
+  return len(doomed)
+
+
+async def thin_version_history(
+  session: AsyncSession,
+  *,
+  after: uuid.UUID | None = None,
+  batch_size: int = 50,
+  page_size: int = 200,
+  now: datetime | None = None
+) -> RetentionProgress:
+  """Thin up to ``batch_size`` strategies with ids greater than ``after``.
+
+  Only strategies holding autosaves older than the keep-all window are visited.  Each
+  batch is flushed but committing is left to the caller, so callers can checkpoint
+  ``last_strategy_id`` after every commit and resume from it.
+  """
+  now = now or datetime.now(timezone.utc)
+  has_old_autosaves = exists().where(
+    StrategyVersion.strategy_id == Strategy.id,
+    StrategyVersion.is_autosave.is_(True),
+    StrategyVersion.created_at < now - KEEP_ALL_WINDOW
+  )
+  stmt = select(Strategy.id).where(has_old_autosaves).order_by(Strategy.id).limit(batch_size)
+  if after is not None:
+    stmt = stmt.where(Strategy.id > after)
+  strategy_ids = list((await session.execute(stmt)).scalars())
+
+  removed = 0
+  for strategy_id in strategy_ids:
+    removed += await thin_strategy_versions(session, strategy_id, now=now, page_size=page_size)
+  return RetentionProgress(
+    strategies=len(strategy_ids),
+    removed=removed,
+    last_strategy_id=strategy_ids[-1] if strategy_ids else after,
+    done=len(strategy_ids) < batch_size
+  )
+
+
+async def collect_orphan_blobs(
+  session: AsyncSession,
+  *,
+  older_than: timedelta = timedelta(hours=1),
+  limit: int = 500,
+  now: datetime | None = None
+) -> int:
+  """Delete up to ``limit`` graph blobs no version references any more.
+
+  Recently created blobs are skipped so a writer that has just stored a blob but not
+  yet inserted its version row never loses it.
+  """
+  now = now or datetime.now(timezone.utc)
+  referenced = exists().where(StrategyVersion.graph_hash == GraphBlob.hash)
+  result = await session.execute(
+    select(GraphBlob.hash)
+    .where(~referenced, GraphBlob.created_at < now - older_than)
+    .limit(limit)
+  )
+  hashes = list(result.scalars())
+  if hashes:
+    await session.execute(
+      delete(GraphBlob).where(GraphBlob.hash.in_(hashes), ~referenced)
+      .execution_options(synchronize_session=False)
+    )
+  return len(hashes)
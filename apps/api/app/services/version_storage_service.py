@@ -0,0 +1,293 @@
+"""Delta-encoded storage helpers for strategy version graphs.
+
+Most autosaves differ from their predecessor by a single node or edge, so only every
+``version_keyframe_interval``-th revision stores the full graph.  The rows in between
+hold an id-keyed delta against the previous version and a ``delta_depth`` counting
+the hops back to the nearest keyframe, which lets any revision be rebuilt from one
+contiguous range of rows.
+
+Keyframes do not embed the graph either: they reference a ``GraphBlob`` keyed by the
+canonical graph hash, so identical graphs (reverts, the seeded demo graph) are stored
+once across every strategy and workspace.
+"""
+
+from __future__ import annotations
+
+import json
+import uuid
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import flag_modified
+
+from app.config import get_settings
+from app.models.graph_blob import GraphBlob
+from app.models.strategy import StrategyVersion
+from app.services.graph_validation_service import canonical_graph_hash, count_issues
+
+COLLECTION_KEYS = ("nodes", "edges")
+COMPRESSIBLE_COLUMNS = {
+  GraphBlob: ("graph_json",),
+  StrategyVersion: ("graph_json", "graph_delta", "educator_callouts", "validation_issues")
+}
+
+
+def _index_collection(items: Any) -> dict[str, dict[str, Any]] | None:
+  if not isinstance(items, list):
+    return None
+  indexed: dict[str, dict[str, Any]] = {}
+  for item in items:
+    item_id = item.get("id") if isinstance(item, dict) else None
+    if not isinstance(item_id, str) or not item_id or item_id in indexed:
+      return None
+    indexed[item_id] = item
+  return indexed
+
+
+def _apply_collection(items: list[dict[str, Any]], change: dict[str, Any]) -> list[dict[str, Any]]:
+  removed = set(change.get("remove", ()))
+  updates = {item["id"]: item for item in change.get("set", ())}
+  result: list[dict[str, Any]] = []
+  for item in items:
+    item_id = item["id"]
+    if item_id in removed:
+      continue
+    result.append(updates.pop(item_id, item))
+  result.extend(updates.values())
+  if "order" in change:
+    by_id = {item["id"]: item for item in result}
+    result = [by_id[item_id] for item_id in change["order"]]
+  return result
+
+
+def _diff_collection(
+  previous: list[dict[str, Any]],
+  current: list[dict[str, Any]]
+) -> dict[str, Any] | None:
+  previous_index = _index_collection(previous)
+  current_index = _index_collection(current)
+  if previous_index is None or current_index is None:
+    return None
+
+  change: dict[str, Any] = {}
+  updated = [item for item_id, item in current_index.items() if previous_index.get(item_id) != item]
+  removed = [item_id for item_id in previous_index if item_id not in current_index]
+  if updated:
+    change["set"] = updated
+  if removed:
+    change["remove"] = removed
+
+  order = list(current_index)
+  if [item["id"] for item in _apply_collection(previous, change)] != order:
+    change["order"] = order
+  return change
+
+
+def encode_graph_delta(previous: dict[str, Any], current: dict[str, Any]) -> dict[str, Any] | None:
+  """Return a delta that rebuilds ``current`` from ``previous``.
+
+  Nodes and edges are diffed by id; any other top-level keys are replaced wholesale.
+  Returns ``None`` when a collection has missing or duplicate ids, in which case the
+  caller should store a keyframe instead.
+  """
+  if not isinstance(previous, dict) or not isinstance(current, dict):
+    return None
+
+  delta: dict[str, Any] = {}
+  replaced: dict[str, Any] = {}
+  for key in COLLECTION_KEYS:
+    if key in previous and key in current:
+      change = _diff_collection(previous[key], current[key])
+      if change is None:
+        return None
+      if change:
+        delta[key] = change
+    elif key in current:
+      replaced[key] = current[key]
+
+  for key, value in current.items():
+    if key not in COLLECTION_KEYS and previous.get(key, ...) != value:
+      replaced[key] = value
+  dropped = [key for key in previous if key not in current]
+  if replaced:
+    delta["replace"] = replaced
+  if dropped:
+    delta["drop"] = dropped
+  return delta
+
+
+def apply_graph_delta(base: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+  """Rebuild the graph described by ``delta`` on top of ``base``."""
+  graph = dict(base)
+  for key in delta.get("drop", ()):
+    graph.pop(key, None)
+  for key in COLLECTION_KEYS:
+    if key in delta:
+      graph[key] = _apply_collection(graph.get(key, []), delta[key])
+  graph.update(delta.get("replace", {}))
+  return graph
+
+
+def _encoded_size(payload: Any) -> int:
+  return len(json.dumps(payload, separators=(",", ":"), default=str))
+
+
+async def _blob_exists(session: AsyncSession, digest: str) -> bool:
+  return await session.scalar(select(GraphBlob.hash).where(GraphBlob.hash == digest)) is not None
+
+
+async def existing_blob_hashes(session: AsyncSession, digests: Iterable[str]) -> set[str]:
+  """Return which of ``digests`` are already stored, using one ``IN`` query."""
+  wanted = set(digests)
+  if not wanted:
+    return set()
+  result = await session.execute(select(GraphBlob.hash).where(GraphBlob.hash.in_(wanted)))
+  return set(result.scalars())
+
+
+async def _insert_blob(session: AsyncSession, digest: str, graph: dict[str, Any]) -> None:
+  """Insert a blob, tolerating a concurrent writer storing the same graph first."""
+  dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+  statement = (
+    dialect.insert(GraphBlob)
+    .values(hash=digest, graph_json=graph, created_at=datetime.now(timezone.utc))
+    .on_conflict_do_nothing(index_elements=["hash"])
+  )
+  await session.execute(statement)
+
+
+async def graph_storage_fields(
+  session: AsyncSession,
+  graph: dict[str, Any],
+  previous: StrategyVersion | None,
+  *,
+  keyframe_interval: int | None = None,
+  digest: str | None = None,
+  known_blobs: set[str] | None = None
+) -> dict[str, Any]:
+  """Return the ``StrategyVersion`` column values that store ``graph``.
+
+  Graphs already stored as a blob become a pointer to it regardless of the keyframe
+  cadence; otherwise a delta against ``previous`` is used until the interval is
+  reached.  ``previous`` must be the immediately preceding revision with its graph
+  resolved.  Batch writers pass ``known_blobs`` from ``existing_blob_hashes`` to skip
+  the per-graph lookup; blobs inserted here are added to it.
+  """
+  interval = keyframe_interval or get_settings().version_keyframe_interval
+  digest = digest or canonical_graph_hash(graph)
+  keyframe = {
+    "graph_hash": digest,
+    "graph_json": None,
+    "graph_delta": None,
+    "delta_depth": 0,
+    "materialized_graph": graph
+  }
+  if known_blobs is not None:
+    if digest in known_blobs:
+      return keyframe
+  elif await _blob_exists(session, digest):
+    return keyframe
+
+  depth = (previous.delta_depth or 0) + 1 if previous is not None else 0
+  if previous is not None and previous.graph is not None and depth < interval:
+    delta = encode_graph_delta(previous.graph, graph)
+    # Large rewrites (e.g. reverts far back in history) are cheaper as keyframes.
+    if delta is not None and _encoded_size(delta) < _encoded_size(graph):
+      return {**keyframe, "graph_hash": None, "graph_delta": delta, "delta_depth": depth}
+
+  await _insert_blob(session, digest, graph)
+  if known_blobs is not None:
+    known_blobs.add(digest)
+  return keyframe
+
+
+def summary_fields(graph: dict[str, Any], issues: Sequence[Any]) -> dict[str, int]:
+  """Return the denormalised counts shown in graph-free history summaries."""
+  totals = count_issues(issues)
+  nodes = graph.get("nodes") if isinstance(graph, dict) else None
+  edges = graph.get("edges") if isinstance(graph, dict) else None
+  return {
+    "node_count": len(nodes) if isinstance(nodes, list) else 0,
+    "edge_count": len(edges) if isinstance(edges, list) else 0,
+    "error_count": totals["error"],
+    "warning_count": totals["warning"]
+  }
+
+
+async def resolve_version_graphs(session: AsyncSession, versions: Sequence[StrategyVersion]) -> None:
+  """Reconstruct the graphs of delta-encoded ``versions`` in place.
+
+  Chains already covered by ``versions`` are replayed without touching the database;
+  otherwise the missing range back to the nearest keyframe is loaded in one query.
+  """
+  pending = [version for version in versions if version.graph is None]
+  if not pending:
+    return
+
+  known: dict[uuid.UUID, dict[int, StrategyVersion]] = {}
+  for version in versions:
+    known.setdefault(version.strategy_id, {})[version.version] = version
+
+  for strategy_id in {version.strategy_id for version in pending}:
+    chain = known[strategy_id]
+    targets = [version for version in pending if version.strategy_id == strategy_id]
+    low = min(version.version - (version.delta_depth or 0) for version in targets)
+    high = max(version.version for version in targets)
+    if any(number not in chain for number in range(low, high + 1)):
+      result = await session.execute(
+        select(StrategyVersion)
+        .where(
+          StrategyVersion.strategy_id == strategy_id,
+          StrategyVersion.version >= low,
+          StrategyVersion.version <= high
+        )
+      )
+      for row in result.scalars():
+        chain.setdefault(row.version, row)
+
+    current: dict[str, Any] | None = None
+    previous_number: int | None = None
+    for number in sorted(chain):
+      version = chain[number]
+      graph = version.graph
+      if graph is None and current is not None and previous_number == number - 1:
+        graph = apply_graph_delta(current, version.graph_delta or {})
+        version.materialized_graph = graph
+      current = graph
+      previous_number = number
+
+    for version in targets:
+      if version.graph is None:
+        raise RuntimeError(f"Strategy version {version.version} cannot be reconstructed")
+
+
+async def recompress_stored_payloads(session: AsyncSession, *, batch_size: int = 200) -> int:
+  """Rewrite compressible JSON columns so they match the current threshold.
+
+  Reading decodes both plain and compressed values, so this can run against a live
+  database after ``JSON_COMPRESSION_THRESHOLD_BYTES`` changes.  Returns the number of
+  rows rewritten; each batch is flushed but committing is left to the caller.
+  """
+  rewritten = 0
+  for model, columns in COMPRESSIBLE_COLUMNS.items():
+    key = model.__mapper__.primary_key[0]
+    last_key = None
+    while True:
+      stmt = select(model).order_by(key).limit(batch_size)
+      if last_key is not None:
+        stmt = stmt.where(key > last_key)
+      rows = list((await session.execute(stmt)).scalars())
+      if not rows:
+        break
+      for row in rows:
+        for column in columns:
+          if getattr(row, column) is not None:
+            flag_modified(row, column)
+      await session.flush()
+      rewritten += len(rows)
+      last_key = getattr(rows[-1], key.key)
+  return rewritten
@@ -4,16 +4,29 @@ from __future__ import annotations
 
 import logging
 import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from time import perf_counter
 
-from sqlalchemy import select
+from sqlalchemy import Select, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth.schemas import AuthenticatedUser
 from app.models.strategy import Strategy, StrategyVersion
+from app.models.user import User
 from app.models.workspace import Workspace
 from app.services.audit_service import record_workspace_bootstrap
+from app.services.bootstrap_cache_service import get_bootstrap_cache
+from app.services.graph_validation_service import render_issues
+from app.services.metrics_service import observe_operation
+from app.services.version_storage_service import (
+  graph_storage_fields,
+  resolve_version_graphs,
+  summary_fields
+)
 
 DEMO_STRATEGY_NAME = "Momentum Playground"
 DEMO_STRATEGY_DESCRIPTION = "Sample graph that showcases entry, risk, and analytics blocks."
@@ -75,6 +88,14 @@ DEMO_GRAPH = {
   ]
 }
 
+DEMO_EXECUTION_ORDER = [
+  "market-data",
+  "momentum-indicator",
+  "entry-condition",
+  "risk-controls",
+  "paper-broker"
+]
+
 DEMO_CALLOUTS = [
   {
     "id": "callout-consent",
@@ -95,54 +116,89 @@ LATENCY_BUDGET_MS = 150
 performance_logger = logging.getLogger("strategybuilder.performance")
 
 
-async def get_or_create_demo_workspace(
-  session: AsyncSession, actor: AuthenticatedUser
-) -> tuple[Workspace, Strategy, StrategyVersion, bool]:
-  """Ensure the demo workspace exists for the authenticated user."""
-  user_id = uuid.UUID(actor.id)
-
-  result = await session.execute(select(Workspace).where(Workspace.user_id == user_id))
-  workspace = result.scalar_one_or_none()
-
-  if workspace:
-    strategy_result = await session.execute(
-      select(Strategy)
-      .where(Strategy.workspace_id == workspace.id)
-      .order_by(Strategy.created_at)
-    )
-    strategy = strategy_result.scalars().first()
-    if not strategy:
-      raise RuntimeError("Workspace exists without a strategy")
-
-    version_result = await session.execute(
-      select(StrategyVersion)
-      .where(StrategyVersion.strategy_id == strategy.id)
-      .order_by(StrategyVersion.created_at)
-    )
-    version = version_result.scalars().first()
-    if not version:
-      raise RuntimeError("Strategy exists without a version")
-
-    return workspace, strategy, version, False
+@dataclass(slots=True)
+class CohortProvisioning:
+  """Outcome of provisioning one batch of a cohort."""
+
+  created: int = 0
+  existing: int = 0
+  missing: list[uuid.UUID] = field(default_factory=list)
+
+
+def _existing_workspace_statement(user_id: uuid.UUID) -> Select:
+  """Select the user's workspace with its first strategy and first version in one round trip.
+
+  The correlated subqueries pick a single row each (via the strategy and version
+  history indexes), so nothing beyond the returned row is materialised.  Outer joins
+  keep a half-provisioned workspace visible so it can be reported rather than re-seeded.
+  """
+  first_strategy = (
+    select(Strategy.id)
+    .where(Strategy.workspace_id == Workspace.id)
+    .order_by(Strategy.created_at, Strategy.id)
+    .limit(1)
+    .correlate(Workspace)
+    .scalar_subquery()
+  )
+  first_version = (
+    select(StrategyVersion.id)
+    .where(StrategyVersion.strategy_id == Strategy.id)
+    .order_by(StrategyVersion.created_at, StrategyVersion.id)
+    .limit(1)
+    .correlate(Strategy)
+    .scalar_subquery()
+  )
+  return (
+    select(Workspace, Strategy, StrategyVersion)
+    .outerjoin(Strategy, Strategy.id == first_strategy)
+    .outerjoin(StrategyVersion, StrategyVersion.id == first_version)
+    .where(Workspace.user_id == user_id)
+    .limit(1)
+  )
 
+
+async def _load_existing_workspace(
+  session: AsyncSession, user_id: uuid.UUID
+) -> tuple[Workspace, Strategy, StrategyVersion] | None:
+  result = await session.execute(_existing_workspace_statement(user_id))
+  row = result.first()
+  if not row:
+    return None
+
+  workspace, strategy, version = row
+  if not strategy:
+    raise RuntimeError("Workspace exists without a strategy")
+  if not version:
+    raise RuntimeError("Strategy exists without a version")
+  await resolve_version_graphs(session, [version])
+  return workspace, strategy, version
+
+
+async def _seed_demo_workspace(
+  session: AsyncSession, user_id: uuid.UUID
+) -> tuple[Workspace, Strategy, StrategyVersion]:
   workspace = Workspace(user_id=user_id, name="Demo Workspace", template_id=DEMO_TEMPLATE_ID)
   session.add(workspace)
 
   strategy = Strategy(
     workspace=workspace,
     name=DEMO_STRATEGY_NAME,
-    description=DEMO_STRATEGY_DESCRIPTION
+    description=DEMO_STRATEGY_DESCRIPTION,
+    latest_version=1
   )
   session.add(strategy)
 
+  storage = await graph_storage_fields(session, DEMO_GRAPH, None)
   timestamp = datetime.now(timezone.utc)
   version = StrategyVersion(
     strategy=strategy,
     version=1,
     label="Initial Seed",
-    graph_json=DEMO_GRAPH,
+    **storage,
+    **summary_fields(DEMO_GRAPH, []),
     educator_callouts=DEMO_CALLOUTS,
     validation_issues=[],
+    execution_order=DEMO_EXECUTION_ORDER,
     created_at=timestamp,
     updated_at=timestamp
   )
@@ -150,7 +206,135 @@ async def get_or_create_demo_workspace(
 
   await session.flush()
 
-  return workspace, strategy, version, True
+  return workspace, strategy, version
+
+
+async def _seed_or_adopt_workspace(
+  session: AsyncSession, user_id: uuid.UUID
+) -> tuple[Workspace, Strategy, StrategyVersion, bool]:
+  # The seed runs in a savepoint: if a concurrent bootstrap (API request or worker)
+  # commits first, the unique ``workspaces.user_id`` constraint rejects ours and the
+  # winner's workspace is returned instead.
+  try:
+    async with session.begin_nested():
+      seeded = await _seed_demo_workspace(session, user_id)
+  except IntegrityError:
+    existing = await _load_existing_workspace(session, user_id)
+    if existing is None:
+      raise
+    return (*existing, False)
+  return (*seeded, True)
+
+
+async def provision_demo_workspace(
+  session: AsyncSession, user_id: uuid.UUID
+) -> tuple[Workspace, Strategy, StrategyVersion, bool]:
+  """Return the user's demo workspace, seeding it if it does not exist yet.
+
+  Shared by the bootstrap endpoint and the ``bootstrap_workspace`` worker task; safe
+  to run concurrently for the same user.
+  """
+  existing = await _load_existing_workspace(session, user_id)
+  if existing:
+    return (*existing, False)
+  return await _seed_or_adopt_workspace(session, user_id)
+
+
+async def provision_cohort_workspaces(
+  session: AsyncSession, user_ids: Sequence[uuid.UUID]
+) -> CohortProvisioning:
+  """Seed demo workspaces for a batch of users with one multi-row INSERT per table.
+
+  Users who already have a workspace are counted as ``existing`` and ids without a
+  ``users`` row are reported as ``missing``, so re-running a partially applied cohort
+  is safe.  Workspaces are inserted with ``ON CONFLICT DO NOTHING`` and only the rows
+  actually inserted receive a strategy and seed version, which keeps concurrent
+  bootstraps for the same users from failing the batch.  Callers choose the batch
+  size and commit between batches.
+  """
+  outcome = CohortProvisioning()
+  requested = list(dict.fromkeys(user_ids))
+  if not requested:
+    return outcome
+
+  known = set((await session.execute(select(User.id).where(User.id.in_(requested)))).scalars())
+  provisioned = set(
+    (await session.execute(select(Workspace.user_id).where(Workspace.user_id.in_(requested)))).scalars()
+  )
+  outcome.missing = [user_id for user_id in requested if user_id not in known]
+  outcome.existing = len(provisioned)
+  pending = [user_id for user_id in requested if user_id in known and user_id not in provisioned]
+  if not pending:
+    return outcome
+
+  timestamp = datetime.now(timezone.utc)
+  dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+  result = await session.execute(
+    dialect.insert(Workspace)
+    .values([
+      {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "name": "Demo Workspace",
+        "template_id": DEMO_TEMPLATE_ID,
+        "created_at": timestamp,
+        "updated_at": timestamp
+      }
+      for user_id in pending
+    ])
+    .on_conflict_do_nothing(index_elements=["user_id"])
+    .returning(Workspace.id)
+  )
+  workspace_ids = list(result.scalars())
+  outcome.existing += len(pending) - len(workspace_ids)
+  outcome.created = len(workspace_ids)
+  if not workspace_ids:
+    return outcome
+
+  strategy_ids = [uuid.uuid4() for _ in workspace_ids]
+  await session.execute(insert(Strategy), [
+    {
+      "id": strategy_id,
+      "workspace_id": workspace_id,
+      "name": DEMO_STRATEGY_NAME,
+      "description": DEMO_STRATEGY_DESCRIPTION,
+      "latest_version": 1,
+      "created_at": timestamp,
+      "updated_at": timestamp
+    }
+    for workspace_id, strategy_id in zip(workspace_ids, strategy_ids)
+  ])
+
+  # Every seed is the same graph, so all versions point at one shared blob keyframe.
+  storage = await graph_storage_fields(session, DEMO_GRAPH, None)
+  storage.pop("materialized_graph")
+  seed = {
+    "version": 1,
+    "label": "Initial Seed",
+    **storage,
+    **summary_fields(DEMO_GRAPH, []),
+    "educator_callouts": DEMO_CALLOUTS,
+    "validation_issues": [],
+    "execution_order": DEMO_EXECUTION_ORDER,
+    "created_at": timestamp,
+    "updated_at": timestamp
+  }
+  await session.execute(
+    insert(StrategyVersion),
+    [{**seed, "strategy_id": strategy_id} for strategy_id in strategy_ids]
+  )
+  return outcome
+
+
+async def get_or_create_demo_workspace(
+  session: AsyncSession, actor: AuthenticatedUser
+) -> tuple[Workspace, Strategy, StrategyVersion, bool]:
+  """Ensure the demo workspace exists for the authenticated user.
+
+  A ``bootstrap_workspace`` task may still be in flight; rather than waiting for it
+  the workspace is seeded inline and the worker's copy adopted if it commits first.
+  """
+  return await provision_demo_workspace(session, uuid.UUID(actor.id))
 
 
 def workspace_response_payload(
@@ -174,9 +358,10 @@ def workspace_response_payload(
       "id": str(version.id),
       "version": version.version,
       "label": version.label,
-      "graph": version.graph_json,
+      "graph": version.graph,
       "educatorCallouts": version.educator_callouts,
-      "validationIssues": version.validation_issues,
+      "validationIssues": render_issues(version.validation_issues),
+      "executionOrder": version.execution_order,
       "createdAt": version.created_at.isoformat() if version.created_at else None,
       "updatedAt": version.updated_at.isoformat() if version.updated_at else None
     }
@@ -186,23 +371,40 @@ def workspace_response_payload(
 async def bootstrap_workspace_payload(
   session: AsyncSession, actor: AuthenticatedUser
 ) -> tuple[dict[str, object], float]:
-  """Provision the workspace payload and emit latency telemetry."""
-  start = perf_counter()
-  workspace, strategy, version, created = await get_or_create_demo_workspace(session, actor)
+  """Provision the workspace payload and emit latency telemetry.
 
-  payload = workspace_response_payload(workspace, strategy, version)
-  payload["created"] = created
-  payload["userId"] = str(workspace.user_id)
+  Payloads for existing workspaces are served from the bootstrap cache; a freshly
+  seeded workspace is not cached until its transaction has committed and a later
+  bootstrap reads it back.  Cache hits write the audit event at most once per user
+  per cache TTL window.
+  """
+  start = perf_counter()
+  cache = get_bootstrap_cache()
+  cached = await cache.get(actor.id)
+  if cached is not None:
+    payload = {**cached, "created": False}
+    created = False
+  else:
+    workspace, strategy, version, created = await get_or_create_demo_workspace(session, actor)
+    payload = workspace_response_payload(workspace, strategy, version)
+    payload["userId"] = str(workspace.user_id)
+    if not created:
+      await cache.put(actor.id, payload)
+    payload = {**payload, "created": created}
 
-  await record_workspace_bootstrap(session, actor, payload)
+  audit_due = cache.claim_audit(actor.id)
+  if cached is None or audit_due:
+    await record_workspace_bootstrap(session, actor, payload)
 
   duration_ms = (perf_counter() - start) * 1000
+  observe_operation("workspaces.bootstrap", duration_ms / 1000, LATENCY_BUDGET_MS)
   performance_logger.info(
     "workspaces.bootstrap.latency",
     extra={
       "duration_ms": duration_ms,
       "latency_budget_ms": LATENCY_BUDGET_MS,
       "workspace_created": created,
+      "cache_hit": cached is not None,
       "user_id": actor.id
     }
   )
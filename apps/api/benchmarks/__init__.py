@@ -0,0 +1 @@
+"""Performance benchmarks for the Strategy Builder API."""
@@ -0,0 +1,218 @@
+"""Large-graph benchmark for ``GraphValidator``.
+
+Generates synthetic graphs from the shared block definitions and records wall time
+and peak traced memory for each validator phase. Results are compared against a
+JSON baseline recorded on the same machine, and the run fails if any phase regresses
+beyond the configured threshold. A missing baseline is an error unless
+``--write-baseline`` is passed, so a comparison can never pass vacuously.
+
+Usage::
+
+  cd apps/api
+  poetry run python -m benchmarks.graph_validation --write-baseline  # record a baseline
+  poetry run python -m benchmarks.graph_validation                   # compare against it
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+import json
+from pathlib import Path
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from app.data.block_definitions import load_block_definitions
+from app.services.graph_validation_service import ANALYSIS_PHASES, GraphValidator
+
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / "graph_validation_baseline.json"
+DEFAULT_SIZES = (100, 1_000, 10_000, 50_000)
+DEFAULT_THRESHOLD = 0.25
+# Phases faster than this are too noisy to compare on wall time alone.
+DEFAULT_MIN_SECONDS = 0.002
+PHASES = ANALYSIS_PHASES
+
+
+@dataclass(frozen=True)
+class Scenario:
+  """Shape of a synthetic graph."""
+
+  name: str
+  edges_per_node: float
+  unknown_ratio: float = 0.0
+  dangling_ratio: float = 0.0
+
+
+SCENARIOS = (
+  Scenario("sparse", edges_per_node=1.2),
+  Scenario("dense", edges_per_node=6.0),
+  Scenario("unknown-blocks", edges_per_node=1.2, unknown_ratio=0.4),
+  Scenario("dangling-edges", edges_per_node=1.2, dangling_ratio=0.4)
+)
+
+
+def generate_graph(size: int, scenario: Scenario, seed: int = 7) -> dict[str, Any]:
+  """Build an acyclic graph of ``size`` nodes using the real block catalogue."""
+  rng = random.Random(f"{scenario.name}:{size}:{seed}")
+  definitions = list(load_block_definitions().values())
+
+  nodes: list[dict[str, Any]] = []
+  for index in range(size):
+    if rng.random() < scenario.unknown_ratio:
+      nodes.append({"id": f"n{index}", "type": f"unknown-block-{index % 7}"})
+      continue
+    definition = definitions[index % len(definitions)]
+    parameters = {parameter.key: parameter.default for parameter in definition.parameters}
+    nodes.append({
+      "id": f"n{index}",
+      "type": definition.kind,
+      "label": definition.label,
+      "metadata": {"parameters": parameters}
+    })
+
+  edges: list[dict[str, Any]] = []
+  edge_count = int(size * scenario.edges_per_node)
+  for index in range(edge_count):
+    target = rng.randrange(1, size) if size > 1 else 0
+    source = rng.randrange(0, target) if target else 0
+    if rng.random() < scenario.dangling_ratio:
+      target_id = f"missing-{index}"
+    else:
+      target_id = f"n{target}"
+    edges.append({"id": f"e{index}", "source": f"n{source}", "target": target_id})
+
+  return {"nodes": nodes, "edges": edges}
+
+
+def measure(graph: dict[str, Any], plan: str = "pro", repeat: int = 3) -> dict[str, dict[str, float]]:
+  """Return the best wall time and peak traced memory per phase of ``GraphValidator.analyse``."""
+  validator = GraphValidator(plan=plan)
+  seconds = {phase: float("inf") for phase in PHASES}
+  peak_bytes = {phase: 0 for phase in PHASES}
+
+  @contextmanager
+  def time_phase(phase: str) -> Iterator[None]:
+    started = time.perf_counter()
+    yield
+    seconds[phase] = min(seconds[phase], time.perf_counter() - started)
+
+  @contextmanager
+  def trace_phase(phase: str) -> Iterator[None]:
+    tracemalloc.start()
+    try:
+      yield
+      peak_bytes[phase] = tracemalloc.get_traced_memory()[1]
+    finally:
+      tracemalloc.stop()
+
+  for _ in range(repeat):
+    validator.analyse(graph, phase_hook=time_phase)
+  # Memory is traced in a separate pass so tracemalloc overhead does not skew timings.
+  validator.analyse(graph, phase_hook=trace_phase)
+
+  results: dict[str, dict[str, float]] = {}
+  for phase in PHASES:
+    # Phases skipped by an early return (graphs without nodes) report zero.
+    elapsed = seconds[phase] if seconds[phase] != float("inf") else 0.0
+    results[phase] = {"seconds": elapsed, "peak_bytes": peak_bytes[phase]}
+  return results
+
+
+def run_suite(sizes: tuple[int, ...], repeat: int) -> dict[str, Any]:
+  """Benchmark every scenario at every size."""
+  cases: dict[str, Any] = {}
+  for scenario in SCENARIOS:
+    for size in sizes:
+      graph = generate_graph(size, scenario)
+      cases[f"{scenario.name}-{size}"] = {
+        "nodes": len(graph["nodes"]),
+        "edges": len(graph["edges"]),
+        "phases": measure(graph, repeat=repeat)
+      }
+  return {
+    "python": platform.python_version(),
+    "machine": platform.machine(),
+    "cases": cases
+  }
+
+
+def find_regressions(
+  baseline: dict[str, Any],
+  current: dict[str, Any],
+  threshold: float = DEFAULT_THRESHOLD,
+  min_seconds: float = DEFAULT_MIN_SECONDS
+) -> list[str]:
+  """Describe every phase whose time or peak memory grew beyond ``threshold``."""
+  regressions: list[str] = []
+  for case, result in current["cases"].items():
+    reference = baseline.get("cases", {}).get(case)
+    if not reference:
+      continue
+    for phase, measured in result["phases"].items():
+      expected = reference["phases"].get(phase)
+      if not expected:
+        continue
+      seconds_limit = max(expected["seconds"], min_seconds) * (1 + threshold)
+      if measured["seconds"] > seconds_limit:
+        regressions.append(
+          f"{case}/{phase}: {measured['seconds'] * 1000:.2f}ms > {seconds_limit * 1000:.2f}ms"
+        )
+      bytes_limit = expected["peak_bytes"] * (1 + threshold)
+      if expected["peak_bytes"] and measured["peak_bytes"] > bytes_limit:
+        regressions.append(
+          f"{case}/{phase}: peak {measured['peak_bytes']}B > {int(bytes_limit)}B"
+        )
+  return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+  parser.add_argument("--repeat", type=int, default=3)
+  parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_PATH)
+  parser.add_argument("--output", type=Path, help="Write this run's results to a JSON file")
+  parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+  parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS)
+  parser.add_argument(
+    "--write-baseline",
+    "--update",
+    dest="write_baseline",
+    action="store_true",
+    help="Record this run as the baseline instead of comparing against it"
+  )
+  args = parser.parse_args(argv)
+
+  current = run_suite(tuple(args.sizes), args.repeat)
+  for case, result in current["cases"].items():
+    total_ms = sum(phase["seconds"] for phase in result["phases"].values()) * 1000
+    print(f"{case:<24} nodes={result['nodes']:<6} edges={result['edges']:<7} total={total_ms:9.2f}ms")
+
+  if args.output:
+    args.output.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+
+  if args.write_baseline:
+    args.baseline.write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+    print(f"Baseline written to {args.baseline}")
+    return 0
+  if not args.baseline.exists():
+    print(
+      f"No baseline at {args.baseline}; rerun with --write-baseline to record one",
+      file=sys.stderr
+    )
+    return 2
+
+  baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+  regressions = find_regressions(baseline, current, args.threshold, args.min_seconds)
+  for regression in regressions:
+    print(f"REGRESSION {regression}", file=sys.stderr)
+  return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
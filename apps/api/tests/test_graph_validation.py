@@ -0,0 +1,455 @@
+"""Tests for the compiled block registry and graph validator internals."""
+
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.auth.dependencies import require_compliance_consent
+from app.auth.schemas import AuthenticatedUser, SupabaseJWTClaims
+from app.config import get_settings
+from app.data.block_definitions import load_block_definitions, load_block_registry
+from app.main import create_app
+from app.services import graph_validation_service
+from app.services.graph_validation_service import (
+  GraphValidator,
+  ValidationCache,
+  IssueCode,
+  ValidationIssue,
+  ValidationOutcome,
+  render_issues,
+  canonical_graph_hash,
+  get_validation_cache,
+  shutdown_validation_pool,
+  validate_graph,
+  validate_graph_async,
+  validate_graphs_batch
+)
+
+
+def test_registry_interns_signal_types_and_builds_masks():
+  registry = load_block_registry()
+
+  assert set(registry.signal_type_ids) >= {"timeseries", "signal", "risk", "order"}
+  assert registry.output_masks["market-data"] == registry.signal_bit("timeseries")
+  assert registry.input_masks["market-data"] == 0
+  assert registry.signal_bit("unknown-signal") == 0
+
+  required = registry.required_inputs["entry-condition"]
+  assert [port.id for port, _ in required] == ["momentum"]
+
+
+def test_registry_compatibility_matches_port_types():
+  registry = load_block_registry()
+  definitions = load_block_definitions()
+
+  for source_kind, source in definitions.items():
+    for target_kind, target in definitions.items():
+      source_types = {port.type for port in source.outputs}
+      target_types = {port.type for port in target.inputs}
+      expected = not target_types or bool(source_types & target_types)
+      assert registry.is_compatible(source_kind, target_kind) is expected
+
+  assert registry.is_compatible("market-data", "paper-broker") is False
+  assert registry.is_compatible("unknown", "paper-broker") is False
+
+
+def test_validator_flags_incompatible_connection():
+  graph = {
+    "nodes": [
+      {"id": "feed", "type": "market-data"},
+      {"id": "broker", "type": "paper-broker", "metadata": {"parameters": {"venue": "paper-trading"}}}
+    ],
+    "edges": [{"id": "e1", "source": "feed", "target": "broker"}]
+  }
+
+  codes = [issue.code for issue in GraphValidator(plan="free").validate(graph)]
+
+  assert IssueCode.INCOMPATIBLE_CONNECTION in codes
+  assert IssueCode.MISSING_INPUT in codes
+
+
+def _base_graph() -> dict:
+  return {
+    "nodes": [
+      {"id": "feed", "type": "market-data", "metadata": {"parameters": {"symbol": "BTC-USD", "granularity": "5m"}}},
+      {"id": "momentum", "type": "momentum-indicator", "metadata": {"parameters": {"fastLength": 12, "slowLength": 26}}},
+      {"id": "entry", "type": "entry-condition", "metadata": {"parameters": {"threshold": 0.5, "volatilityFloor": 0.2}}},
+      {"id": "risk", "type": "risk-controls", "metadata": {"parameters": {"maxRiskPerTrade": 1, "stopMultiple": 2}}},
+      {"id": "broker", "type": "paper-broker", "metadata": {"parameters": {"venue": "paper-trading"}}}
+    ],
+    "edges": [
+      {"id": "e1", "source": "feed", "target": "momentum"},
+      {"id": "e2", "source": "momentum", "target": "entry"},
+      {"id": "e3", "source": "entry", "target": "risk"},
+      {"id": "e4", "source": "risk", "target": "broker"}
+    ]
+  }
+
+
+def _assert_incremental_matches_full(previous: dict, current: dict) -> None:
+  validator = GraphValidator(plan="free")
+  previous_issues = [issue.to_compact() for issue in validator.validate(previous)]
+  full = [issue.to_payload() for issue in validator.validate(current)]
+  incremental = [
+    issue.to_payload() for issue in validator.validate_incremental(current, previous, previous_issues)
+  ]
+  assert incremental == full
+
+
+def test_incremental_validation_matches_full_validation_for_edits():
+  base = _base_graph()
+
+  retyped = _base_graph()
+  retyped["nodes"][1]["type"] = "volatility-indicator"
+  _assert_incremental_matches_full(base, retyped)
+
+  removed_edge = _base_graph()
+  removed_edge["edges"] = removed_edge["edges"][1:]
+  _assert_incremental_matches_full(base, removed_edge)
+
+  removed_node = _base_graph()
+  removed_node["nodes"] = [node for node in removed_node["nodes"] if node["id"] != "entry"]
+  _assert_incremental_matches_full(base, removed_node)
+  _assert_incremental_matches_full(removed_node, base)
+
+  bad_parameter = _base_graph()
+  bad_parameter["nodes"][3]["metadata"]["parameters"]["maxRiskPerTrade"] = 999
+  _assert_incremental_matches_full(base, bad_parameter)
+  _assert_incremental_matches_full(bad_parameter, base)
+
+  rewired = _base_graph()
+  rewired["edges"][3] = {"id": "e4", "source": "feed", "target": "broker"}
+  _assert_incremental_matches_full(base, rewired)
+  _assert_incremental_matches_full(rewired, base)
+
+
+def test_incremental_validation_carries_issues_for_untouched_nodes():
+  previous = _base_graph()
+  previous["nodes"][3]["metadata"]["parameters"]["maxRiskPerTrade"] = 999
+  current = _base_graph()
+  current["nodes"][3]["metadata"]["parameters"]["maxRiskPerTrade"] = 999
+  current["nodes"][0]["metadata"]["parameters"]["symbol"] = "ETH-USD"
+
+  stored = [{"nodeId": "risk", "edgeId": None, "code": "parameter_above_max", "message": "stored", "severity": "error"}]
+  issues = GraphValidator(plan="free").validate_incremental(current, previous, stored)
+
+  assert [(issue.node_id, issue.message) for issue in issues] == [("risk", "stored")]
+
+
+def test_incremental_validation_recomputes_issues_from_other_definitions():
+  previous = _base_graph()
+  previous["nodes"][3]["metadata"]["parameters"]["maxRiskPerTrade"] = 999
+  current = _base_graph()
+  current["nodes"][3]["metadata"]["parameters"]["maxRiskPerTrade"] = 999
+  current["nodes"][0]["metadata"]["parameters"]["symbol"] = "ETH-USD"
+  stored = [{"nodeId": "risk", "edgeId": None, "code": "parameter_above_max", "message": "stored", "severity": "error"}]
+
+  validator = GraphValidator(plan="free")
+  carried = validator.validate_incremental(
+    current, previous, stored, previous_fingerprint=validator.registry.fingerprint
+  )
+  reloaded = validator.validate_incremental(current, previous, stored, previous_fingerprint="stale")
+
+  assert [issue.message for issue in carried] == ["stored"]
+  assert [issue.to_payload() for issue in reloaded] == [issue.to_payload() for issue in validator.validate(current)]
+
+  get_validation_cache().clear()
+  outcome = graph_validation_service.validate_graph_outcome(
+    current, "free", previous_graph=previous, previous_issues=stored, previous_fingerprint=None
+  )
+  assert outcome.fingerprint == validator.registry.fingerprint
+  assert "stored" not in {issue["message"] for issue in render_issues(outcome.issues)}
+
+
+def test_incremental_validation_falls_back_for_legacy_issues():
+  previous = _base_graph()
+  previous["edges"].append({"id": "e5", "source": "feed", "target": "ghost"})
+  legacy = [{"nodeId": None, "code": "dangling_edge", "message": "Edge e5 references missing nodes", "severity": "error"}]
+
+  issues = GraphValidator(plan="free").validate_incremental(previous, previous, legacy)
+
+  assert [(issue.code, issue.edge_id) for issue in issues] == [(IssueCode.DANGLING_EDGE, "e5")]
+
+
+def test_validation_cache_evicts_lru_and_expires_entries():
+  now = [0.0]
+  cache = ValidationCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+
+  cache.put("a", ValidationOutcome(issues=[(1, None, None, ())], execution_order=["n"]))
+  cache.put("b", ValidationOutcome(issues=[]))
+  assert cache.get("a") == ValidationOutcome(issues=[(1, None, None, ())], execution_order=["n"])
+  cache.put("c", ValidationOutcome(issues=[]))
+
+  assert cache.get("b") is None
+  assert cache.get("c").issues == []
+
+  now[0] = 11.0
+  assert cache.get("a") is None
+  assert cache.stats() == {"hits": 2, "misses": 2, "size": 1}
+
+
+def test_validate_graph_reuses_cached_result_for_reordered_keys():
+  cache = get_validation_cache()
+  cache.clear()
+  graph = _base_graph()
+  reordered = {"edges": graph["edges"], "nodes": [dict(reversed(list(node.items()))) for node in graph["nodes"]]}
+
+  first = validate_graph(graph, "free")
+  second = validate_graph(reordered, "free")
+  validate_graph(graph, "pro")
+
+  assert first == second
+  assert cache.stats()["hits"] == 1
+  assert cache.stats()["misses"] == 2
+  assert canonical_graph_hash(graph) == canonical_graph_hash(reordered)
+
+
+@pytest.mark.asyncio
+async def test_large_graph_validation_runs_off_loop(monkeypatch):
+  settings = get_settings()
+  monkeypatch.setattr(settings, "validation_offload_threshold", 1)
+  get_validation_cache().clear()
+
+  outcome = await validate_graph_async(_base_graph(), "free")
+
+  assert render_issues(outcome.issues) == validate_graph(_base_graph(), "free")
+  assert outcome.execution_order == ["feed", "momentum", "entry", "risk", "broker"]
+  shutdown_validation_pool()
+
+
+@pytest.mark.asyncio
+async def test_slow_validation_returns_deferred_issue(monkeypatch):
+  settings = get_settings()
+  monkeypatch.setattr(settings, "validation_offload_threshold", 1)
+  monkeypatch.setattr(settings, "validation_budget_ms", 10)
+
+  def slow_validate(*args, **kwargs):
+    time.sleep(0.2)
+    return ValidationOutcome(issues=[])
+
+  monkeypatch.setattr(graph_validation_service, "validate_graph_outcome", slow_validate)
+
+  outcome = await validate_graph_async(_base_graph(), "free")
+
+  assert [(issue["code"], issue["severity"]) for issue in render_issues(outcome.issues)] == [
+    ("validation_deferred", "warning")
+  ]
+  assert outcome.execution_order is None
+  shutdown_validation_pool()
+
+
+@pytest.mark.asyncio
+async def test_batch_validation_keeps_a_bounded_window_in_flight(monkeypatch):
+  monkeypatch.setattr(get_settings(), "validation_batch_max_workers", 2)
+  executor = ThreadPoolExecutor(max_workers=2)
+  monkeypatch.setattr(graph_validation_service, "get_batch_executor", lambda: executor)
+  submitted: list[int] = []
+  original = graph_validation_service._validate_batch_item
+
+  def record(index, graph, plan):
+    submitted.append(index)
+    return original(index, graph, plan)
+
+  monkeypatch.setattr(graph_validation_service, "_validate_batch_item", record)
+  drained = 0
+  try:
+    batch = validate_graphs_batch((_base_graph(), "free") for _ in range(20))
+    async for _index, _outcome in batch:
+      drained += 1
+      # The window is twice the worker count, refilled only as results drain.
+      assert len(submitted) <= drained + 4
+      if drained == 3:
+        break
+    await batch.aclose()
+  finally:
+    executor.shutdown(wait=True)
+
+  assert len(submitted) < 20
+
+
+def test_batch_endpoint_streams_one_result_per_graph():
+  app = create_app()
+  user_id = str(uuid.uuid4())
+  user = AuthenticatedUser(
+    id=user_id,
+    email="batch@example.com",
+    roles=["builder"],
+    accepted_simulation_only=True,
+    accepted_simulation_only_at=datetime.now(timezone.utc),
+    raw_claims=SupabaseJWTClaims(sub=user_id, email="batch@example.com", aud="authenticated", exp=0)
+  )
+  app.dependency_overrides[require_compliance_consent] = lambda: user
+  overloaded = _base_graph()
+  overloaded["nodes"].append({"id": "broker-2", "type": "paper-broker"})
+
+  try:
+    with TestClient(app) as client:
+      response = client.post(
+        "/api/v1/graphs/validate-batch",
+        json={
+          "graphs": [
+            {"id": "valid", "graph": _base_graph()},
+            {"id": "overloaded-free", "graph": overloaded},
+            {"id": "claims-pro", "graph": overloaded, "plan": "pro"}
+          ]
+        }
+      )
+  finally:
+    shutdown_validation_pool()
+
+  assert response.status_code == 200
+  assert response.headers["content-type"].startswith("application/x-ndjson")
+  results = {line["id"]: line for line in map(json.loads, response.text.splitlines())}
+  assert sorted(line["index"] for line in results.values()) == [0, 1, 2]
+  assert results["valid"]["issues"] == []
+  assert results["valid"]["executionOrder"] == ["feed", "momentum", "entry", "risk", "broker"]
+  assert results["overloaded-free"]["plan"] == "free"
+  assert any(issue["code"] == "quota_exceeded" for issue in results["overloaded-free"]["issues"])
+  # A plan in the request body is ignored; only the caller's roles grant pro limits.
+  assert results["claims-pro"]["plan"] == "free"
+  assert any(issue["code"] == "quota_exceeded" for issue in results["claims-pro"]["issues"])
+
+
+def test_cycles_are_reported_per_strongly_connected_component():
+  graph = _base_graph()
+  graph["edges"] += [
+    {"id": "back", "source": "risk", "target": "momentum"},
+    {"id": "loop", "source": "broker", "target": "broker"}
+  ]
+
+  result = GraphValidator(plan="free").analyse(graph)
+
+  cycles = [issue.message for issue in result.issues if issue.code == IssueCode.CYCLE_DETECTED]
+  assert cycles == ["Nodes momentum, entry, risk form a cycle", "Nodes broker form a cycle"]
+  assert result.execution_order is None
+
+
+def test_acyclic_graph_returns_topological_order():
+  graph = _base_graph()
+  graph["nodes"].reverse()
+  graph["edges"].append({"id": "skip", "source": "feed", "target": "entry"})
+
+  result = GraphValidator(plan="free").analyse(graph)
+  order = result.execution_order
+
+  assert not [issue for issue in result.issues if issue.code == IssueCode.CYCLE_DETECTED]
+  assert sorted(order) == sorted(node["id"] for node in graph["nodes"])
+  for edge in graph["edges"]:
+    assert order.index(edge["source"]) < order.index(edge["target"])
+
+
+def test_benchmark_generator_and_regression_check():
+  from benchmarks.graph_validation import SCENARIOS, find_regressions, generate_graph, measure
+
+  graph = generate_graph(50, SCENARIOS[-1])
+  phases = measure(graph, repeat=1)
+  assert len(graph["nodes"]) == 50
+  assert set(phases) == {"index_nodes", "build_adjacency", "node_checks", "edges", "quota", "topology"}
+
+  baseline = {"cases": {"case": {"phases": {"edges": {"seconds": 0.01, "peak_bytes": 1000}}}}}
+  slower = {"cases": {"case": {"phases": {"edges": {"seconds": 0.02, "peak_bytes": 1000}}}}}
+  similar = {"cases": {"case": {"phases": {"edges": {"seconds": 0.011, "peak_bytes": 1100}}}}}
+  assert find_regressions(baseline, slower) == ["case/edges: 20.00ms > 12.50ms"]
+  assert find_regressions(baseline, similar) == []
+
+
+def test_block_registry_reloads_when_file_changes(tmp_path):
+  import os
+
+  from app.data.block_definitions import BlockDefinitionRegistry, get_block_registry
+
+  source = get_block_registry().path.read_text(encoding="utf-8")
+  path = tmp_path / "block-definitions.json"
+  path.write_text(source, encoding="utf-8")
+  registry = BlockDefinitionRegistry(path, check_interval_seconds=0)
+
+  first = registry.current()
+  assert registry.current() is first
+  assert first.generation == 1
+
+  payload = json.loads(source)
+  payload["blocks"][0]["label"] = "Renamed Feed"
+  path.write_text(json.dumps(payload), encoding="utf-8")
+  os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+  second = registry.current()
+  assert second.generation == 2
+  assert second.definitions[payload["blocks"][0]["kind"]].label == "Renamed Feed"
+
+  path.write_text("{not json", encoding="utf-8")
+  os.utime(path, ns=(0, path.stat().st_mtime_ns + 2_000_000))
+  assert registry.current() is second
+
+
+def test_validator_is_shared_per_plan():
+  assert graph_validation_service.get_validator("free") is graph_validation_service.get_validator("free")
+  assert graph_validation_service.get_validator("free") is not graph_validation_service.get_validator("pro")
+
+
+def test_concurrent_callers_share_one_validator(monkeypatch):
+  monkeypatch.setattr(graph_validation_service, "_validators", {})
+  with ThreadPoolExecutor(max_workers=8) as pool:
+    validators = list(pool.map(lambda _: graph_validation_service.get_validator("pro"), range(64)))
+  assert all(validator is validators[0] for validator in validators)
+
+
+def test_target_handles_satisfy_only_the_addressed_port():
+  graph = {
+    "nodes": [
+      {"id": "feed", "type": "market-data"},
+      {"id": "momentum", "type": "momentum-indicator"},
+      {"id": "entry", "type": "entry-condition"}
+    ],
+    "edges": [
+      {"id": "e1", "source": "feed", "target": "momentum", "sourceHandle": "timeseries", "targetHandle": "price"},
+      {"id": "e2", "source": "momentum", "target": "entry", "sourceHandle": "momentum", "targetHandle": "volatility"}
+    ]
+  }
+
+  issues = GraphValidator(plan="pro").validate(graph)
+
+  assert [(issue.node_id, issue.code) for issue in issues] == [("entry", IssueCode.MISSING_INPUT)]
+
+  graph["edges"][1]["targetHandle"] = "momentum"
+  assert GraphValidator(plan="pro").validate(graph) == []
+
+
+def test_unknown_handles_are_reported_per_edge():
+  graph = {
+    "nodes": [
+      {"id": "feed", "type": "market-data"},
+      {"id": "momentum", "type": "momentum-indicator"}
+    ],
+    "edges": [{"id": "e1", "source": "feed", "target": "momentum", "targetHandle": "volume"}]
+  }
+
+  issues = GraphValidator(plan="pro").validate(graph)
+
+  assert [(issue.code, issue.edge_id, issue.node_id) for issue in issues] == [
+    (IssueCode.MISSING_INPUT, None, "momentum"),
+    (IssueCode.UNKNOWN_PORT, "e1", "momentum")
+  ]
+
+
+def test_compact_issues_round_trip_and_render_lazily():
+  issue = ValidationIssue(IssueCode.QUOTA_EXCEEDED, params=("Paper Broker", "free", 2, 1))
+  stored = json.loads(json.dumps([issue.to_compact()]))
+
+  assert stored == [[IssueCode.QUOTA_EXCEEDED.value, None, None, ["Paper Broker", "free", 2, 1]]]
+  assert render_issues(stored) == [{
+    "nodeId": None,
+    "edgeId": None,
+    "code": "quota_exceeded",
+    "message": "Paper Broker exceeds the free plan quota (2/1)",
+    "severity": "error"
+  }]
+
+  legacy = {"nodeId": "risk", "code": "missing_input", "message": "Old text", "severity": "error"}
+  assert render_issues([legacy])[0]["message"] == "Old text"
+  assert ValidationIssue.from_stored(legacy).to_compact() == (IssueCode.MISSING_INPUT.value, "risk", None, (), "Old text")
@@ -0,0 +1,104 @@
+"""Latency histogram registry and /metrics endpoint tests."""
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+import pytest
+
+from app.api.middleware import UNMATCHED_ROUTE, route_template
+from app.config import get_settings
+from app.main import create_app
+from app.services import metrics_service
+from app.services.metrics_service import MetricsRegistry, time_operation
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+  monkeypatch.setattr(metrics_service, "_registry", None)
+
+
+def test_histogram_renders_cumulative_buckets_and_quantiles() -> None:
+  registry = MetricsRegistry()
+  histogram = registry.histogram("demo_seconds", "Demo latency.", ("route",), buckets=(0.1, 0.5, 1.0))
+  child = histogram.labels("/a")
+  for value in (0.05, 0.1, 0.2, 0.3, 2.0):
+    child.observe(value)
+
+  text = registry.render()
+
+  assert '# TYPE demo_seconds histogram' in text
+  assert 'demo_seconds_bucket{route="/a",le="0.1"} 2' in text
+  assert 'demo_seconds_bucket{route="/a",le="0.5"} 4' in text
+  assert 'demo_seconds_bucket{route="/a",le="+Inf"} 5' in text
+  assert 'demo_seconds_count{route="/a"} 5' in text
+  assert child.quantile(0.5) == pytest.approx(0.1 + 0.4 * 0.5 / 2)
+  assert child.quantile(0.99) == 1.0
+  assert histogram.labels("/b").quantile(0.5) is None
+  with pytest.raises(ValueError):
+    registry.counter("demo_seconds", "Clashing type.")
+
+
+def test_observations_from_worker_threads_are_not_lost() -> None:
+  registry = MetricsRegistry()
+  histogram = registry.histogram("threaded_seconds", "Threaded latency.", ("route",), buckets=(0.1,))
+  counter = registry.counter("threaded_total", "Threaded count.")
+
+  def record(_: int) -> None:
+    for _ in range(2_000):
+      histogram.labels("/a").observe(0.05)
+      counter.labels().inc()
+
+  with ThreadPoolExecutor(max_workers=8) as pool:
+    list(pool.map(record, range(8)))
+
+  assert histogram.labels("/a").count == 16_000
+  assert counter.labels().value == 16_000
+  with pytest.raises(TypeError):
+    metrics_service._Family("abstract", "Not instantiable.", ())
+
+
+def test_middleware_records_route_templates_and_budget_violations(monkeypatch: pytest.MonkeyPatch) -> None:
+  monkeypatch.setattr(get_settings(), "metrics_route_budgets_ms", {"/api/v1/health": 0.0})
+  monkeypatch.setattr(get_settings(), "metrics_default_budget_ms", 0.000001)
+  client = TestClient(create_app())
+
+  client.get("/api/v1/health")
+  client.get("/api/v1/health")
+  client.get("/api/v1/does-not-exist")
+  with time_operation("demo.operation", budget_ms=60_000):
+    pass
+  response = client.get("/metrics")
+
+  assert response.status_code == 200
+  assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+  text = response.text
+  assert (
+    'strategybuilder_http_request_duration_seconds_count{method="GET",route="/api/v1/health"} 2'
+    in text
+  )
+  assert 'strategybuilder_http_budget_violations_total{method="GET",route="/api/v1/health"} 0' in text
+  assert 'strategybuilder_http_budget_violations_total{method="GET",route="<unmatched>"} 1' in text
+  assert 'strategybuilder_operation_duration_seconds_count{operation="demo.operation"} 1' in text
+  assert 'strategybuilder_operation_budget_violations_total{operation="demo.operation"} 0' in text
+
+
+@pytest.mark.parametrize(
+  ("route_path", "request_path", "expected"),
+  [
+    # Router-relative templates, as lazily included routers report them.
+    ("/strategies/{strategy_id}", "/api/v1/strategies/abc", "/api/v1/strategies/{strategy_id}"),
+    ("/items/", "/api/v1/items/", "/api/v1/items/"),
+    # Complete templates, as eagerly included routers report them.
+    ("/api/v1/strategies/{strategy_id}", "/api/v1/strategies/abc", "/api/v1/strategies/{strategy_id}"),
+    ("/files/{rest:path}", "/api/v1/files/a/b", "/files/{rest:path}")
+  ]
+)
+def test_route_template_reads_the_matched_route(route_path: str, request_path: str, expected: str) -> None:
+  scope = {"route": SimpleNamespace(path=route_path), "path": request_path}
+  assert route_template(scope) == expected
+
+
+def test_route_template_falls_back_without_a_matched_route() -> None:
+  assert route_template({"path": "/nope"}) == UNMATCHED_ROUTE
+  assert route_template({"path": "/docs", "endpoint": object(), "path_params": {}}) == "/docs"
@@ -3,11 +3,17 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import asynccontextmanager
+import json
 import uuid
 from datetime import datetime, timedelta, timezone
 
 import pytest
-from sqlalchemy import create_engine
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -17,15 +23,38 @@ from app.auth.schemas import (
   SupabaseJWTClaims,
   SupabaseUserMetadata
 )
+from app.auth.dependencies import require_compliance_consent
+from app.config import get_settings
+from app.db.session import get_db, get_session_factory
+from app.main import create_app
 from app.db.base import Base
+from app.db.schema import renumber_duplicate_versions
+from app.db.types import COMPRESSION_MARKER, CompressedJSON, compress_json, decompress_json
+from app.models.graph_blob import GraphBlob
+from app.models.strategy import Strategy, StrategyVersion
+from app.services.graph_diff_service import diff_graph_structure, get_diff_cache
+from app.services.graph_validation_service import canonical_graph_hash
 from app.services.strategy_version_service import (
   create_version,
-  list_versions,
+  diff_versions,
+  get_version,
+  list_version_page,
+  _read_transfer_records,
   revert_to_version,
   validate_version_graph
 )
 from app.services.user_service import sync_user_from_claims
-from app.services.workspace_service import get_or_create_demo_workspace
+from app.services.version_retention_service import (
+  collect_orphan_blobs,
+  select_versions_to_keep,
+  thin_version_history
+)
+from app.services.version_storage_service import (
+  apply_graph_delta,
+  encode_graph_delta,
+  recompress_stored_payloads
+)
+from app.services.workspace_service import DEMO_GRAPH, get_or_create_demo_workspace
 
 pytestmark = pytest.mark.asyncio
 
@@ -35,6 +64,7 @@ class AsyncSessionWrapper:
 
   def __init__(self, sync_session):
     self._sync_session = sync_session
+    self.closed = False
 
   async def __aenter__(self):
     return self
@@ -45,7 +75,21 @@ class AsyncSessionWrapper:
   def add(self, instance):
     self._sync_session.add(instance)
 
+  @property
+  def info(self):
+    return self._sync_session.info
+
+  def get_bind(self):
+    return self._sync_session.get_bind()
+
+  @asynccontextmanager
+  async def begin_nested(self):
+    with self._sync_session.begin_nested():
+      yield
+
   async def execute(self, *args, **kwargs):
+    if self.closed:
+      raise RuntimeError("Session used after it was closed")
     return await asyncio.to_thread(self._sync_session.execute, *args, **kwargs)
 
   async def scalar(self, *args, **kwargs):
@@ -56,6 +100,18 @@ class AsyncSessionWrapper:
     result = await self.execute(*args, **kwargs)
     return result.scalars()
 
+  async def stream_scalars(self, *args, **kwargs):
+    result = await self.execute(*args, **kwargs)
+    # Like AsyncSession, fetch one ``yield_per`` partition at a time off the loop.
+    partitions = result.scalars().partitions()
+
+    async def iterate():
+      while (partition := await asyncio.to_thread(next, partitions, None)) is not None:
+        for item in partition:
+          yield item
+
+    return iterate()
+
   async def flush(self):
     return await asyncio.to_thread(self._sync_session.flush)
 
@@ -63,6 +119,7 @@ class AsyncSessionWrapper:
     return await asyncio.to_thread(self._sync_session.commit)
 
   async def close(self):
+    self.closed = True
     return await asyncio.to_thread(self._sync_session.close)
 
 
@@ -107,6 +164,18 @@ def _build_user(pro: bool = False) -> AuthenticatedUser:
   )
 
 
+async def list_versions(session, strategy_id, user) -> list[StrategyVersion]:
+  """Collect the full history, newest first, by following the page cursor."""
+  versions: list[StrategyVersion] = []
+  cursor = None
+  while True:
+    page = await list_version_page(session, strategy_id, user, limit=50, cursor=cursor)
+    versions.extend(page.versions)
+    cursor = page.next_cursor
+    if cursor is None:
+      return versions
+
+
 VALID_GRAPH = {
   "nodes": [
     {
@@ -172,6 +241,7 @@ async def test_create_version_persists_history():
     version = await create_version(session, strategy.id, VALID_GRAPH, user)
     assert version.version == 2
     assert version.validation_issues == []
+    assert version.execution_order == ["market-data", "momentum", "entry", "risk", "broker"]
 
     versions = await list_versions(session, strategy.id, user)
     assert [entry.version for entry in versions] == [2, 1]
@@ -188,10 +258,519 @@ async def test_revert_clones_target_version():
     restored = await revert_to_version(session, strategy.id, seed_version.id, user)
 
     assert restored.version == latest.version + 1
-    assert restored.graph_json == seed_version.graph_json
+    assert restored.graph == seed_version.graph
+    assert restored.graph_hash == seed_version.graph_hash
     assert restored.notes == "Restored from prior version"
 
 
+def _with_threshold(graph, threshold):
+  nodes = [
+    {**node, "metadata": {"parameters": {**node["metadata"]["parameters"], "threshold": threshold}}}
+    if node["id"] == "entry" else node
+    for node in graph["nodes"]
+  ]
+  return {**graph, "nodes": nodes}
+
+
+async def test_graph_delta_round_trip():
+  current = {
+    "nodes": [VALID_GRAPH["nodes"][1], VALID_GRAPH["nodes"][0]] + [
+      {"id": "extra", "type": "paper-broker", "metadata": {"parameters": {}}}
+    ],
+    "edges": VALID_GRAPH["edges"][1:],
+    "viewport": {"x": 10, "y": 5}
+  }
+  delta = encode_graph_delta(VALID_GRAPH, current)
+
+  assert delta is not None
+  assert delta["edges"] == {"remove": ["e1"]}
+  assert delta["replace"] == {"viewport": {"x": 10, "y": 5}}
+  assert apply_graph_delta(VALID_GRAPH, delta) == current
+  assert encode_graph_delta(VALID_GRAPH, VALID_GRAPH) == {}
+  assert encode_graph_delta(VALID_GRAPH, {"nodes": [{"label": "no id"}], "edges": []}) is None
+
+
+async def test_versions_store_deltas_between_keyframes(monkeypatch):
+  monkeypatch.setattr(get_settings(), "version_keyframe_interval", 3)
+  session_factory = await _create_session_factory()
+  async with session_factory() as session:
+    user = _build_user()
+    await sync_user_from_claims(session, user)
+    _, strategy, _, _ = await get_or_create_demo_workspace(session, user)
+    strategy_id = strategy.id
+
+    saved = {}
+    for index in range(5):
+      graph = _with_threshold(VALID_GRAPH, 0.1 * (index + 1))
+      version = await create_version(session, strategy.id, graph, user)
+      saved[version.version] = graph
+    await session.commit()
+
+  async with session_factory() as session:
+    versions = await list_versions(session, strategy_id, user)
+    by_number = {version.version: version for version in versions}
+
+    # v2 rewrites most of the seed graph, so it is stored as a keyframe.
+    assert [by_number[number].delta_depth for number in range(1, 7)] == [0, 0, 1, 2, 0, 1]
+    assert by_number[3].graph_hash is None
+    assert by_number[3].graph_delta["nodes"]["set"][0]["id"] == "entry"
+    for number, graph in saved.items():
+      assert by_number[number].graph == graph
+    target_id = by_number[6].id
+
+  async with session_factory() as session:
+    restored = await revert_to_version(session, strategy_id, target_id, user)
+    assert restored.graph == saved[6]
+    assert restored.delta_depth == 2
+    assert restored.graph_delta == {}
+
+
+async def test_identical_graphs_share_one_blob():
+  session_factory = await _create_session_factory()
+  async with session_factory() as session:
+    first_user, second_user = _build_user(), _build_user()
+    seeds = []
+    for user in (first_user, second_user):
+      await sync_user_from_claims(session, user)
+      _, _, seed_version, _ = await get_or_create_demo_workspace(session, user)
+      seeds.append(seed_version)
+
+    _, strategy, _, _ = await get_or_create_demo_workspace(session, first_user)
+    await create_version(session, strategy.id, VALID_GRAPH, first_user)
+    restored = await revert_to_version(session, strategy.id, seeds[0].id, first_user)
+
+    blobs = (await session.scalars(select(GraphBlob))).all()
+    assert seeds[0].graph_hash == seeds[1].graph_hash == restored.graph_hash
+    assert sorted(blob.hash for blob in blobs) == sorted({seeds[0].graph_hash, canonical_graph_hash(VALID_GRAPH)})
+
+
+async def test_large_payloads_are_compressed_transparently(monkeypatch):
+  session_factory = await _create_session_factory()
+  async with session_factory() as session:
+    user = _build_user()
+    await sync_user_from_claims(session, user)
+    _, strategy, seed_version, _ = await get_or_create_demo_workspace(session, user)
+    strategy_id = strategy.id
+    await session.commit()
+
+    raw = await session.execute(text("SELECT graph_json FROM graph_blobs"))
+    assert COMPRESSION_MARKER not in raw.scalar_one()
+
+    monkeypatch.setattr(get_settings(), "json_compression_threshold_bytes", 256)
+    assert await recompress_stored_payloads(session, batch_size=1) == 2
+    await session.commit()
+
+    raw = await session.execute(text("SELECT graph_json FROM graph_blobs"))
+    envelope = json.loads(raw.scalar_one())
+    assert envelope[COMPRESSION_MARKER] == 1
+    assert len(envelope["data"]) < len(json.dumps(seed_version.graph)) / 2
+    assert decompress_json(envelope) == seed_version.graph
+
+  async with session_factory() as session:
+    versions = await list_versions(session, strategy_id, user)
+    assert versions[0].graph == DEMO_GRAPH
+  assert decompress_json(compress_json(VALID_GRAPH)) == VALID_GRAPH
+
+
+async def test_values_using_the_compression_marker_round_trip(monkeypatch):
+  column = CompressedJSON()
+  lookalike = {COMPRESSION_MARKER: 1, "data": "eJwrSS0u0U1KLElVslIqS8wpTQUAMNAFlQ=="}
+  for threshold in (0, 1, 10_000):
+    monkeypatch.setattr(get_settings(), "json_compression_threshold_bytes", threshold)
+    stored = json.loads(json.dumps(column.process_bind_param(lookalike, None)))
+    assert column.process_result_value(stored, None) == lookalike
+    assert column.process_result_value(column.process_bind_param([lookalike], None), None) == [lookalike]
+
+
+async def test_history_pages_by_keyset_cursor_with_summaries(monkeypatch):
+  session_factory = await _create_session_factory()
+  async with session_factory() as session:
+    user = _build_user()
+    await sync_user_from_claims(session, user)
+    _, strategy, _, _ = await get_or_create_demo_workspace(session, user)
+    strategy_id = strategy.id
+    broken = {**VALID_GRAPH, "edges": VALID_GRAPH["edges"][:2]}
+    for graph in (VALID_GRAPH, broken, VALID_GRAPH, broken):
+      await create_version(session, strategy_id, graph, user)
+    await session.commit()
+
+  async with session_factory() as session:
+    pages, cursor = [], None
+    while True:
+      page = await list_version_page(session, strategy_id, user, limit=2, cursor=cursor, include_graphs=False)
+      pages.append(page.versions)
+      cursor = page.next_cursor
+      if cursor is None:
+        break
+
+    assert [[version.version for version in versions] for versions in pages] == [[5, 4], [3, 2], [1]]
+    newest = pages[0][0]
+    assert {"graph_json", "graph_delta", "validation_issues"} <= inspect(newest).unloaded
+    assert (newest.node_count, newest.edge_count) == (5, 2)
+    assert newest.error_count == 2 and newest.warning_count == 0
+
+    detail = await get_version(session, strategy_id, newest.id, user)
+    assert detail.graph == broken
+
+    with pytest.raises(HTTPException) as exc_info:
+      await list_version_page(session, strategy_id, user, limit=2, cursor="not-a-cursor")
+    assert exc_info.value.status_code == 400
+
+
+async def test_version_numbers_come_from_strategy_counter():
+  session_factory = await _create_session_factory()
+  async with session_factory() as session:
+    user = _build_user()
+    await sync_user_from_claims(session, user)
+    _, strategy, seed_version, _ = await get_or_create_demo_workspace(session, user)
+    strategy_id = strategy.id
+
+    created = await create_version(session, strategy_id, VALID_GRAPH, user)
+    restored = await revert_to_version(session, strategy_id, seed_version.id, user)
+    await session.commit()
+    assert (created.version, restored.version) == (2, 3)
+
+  async with session_factory() as session:
+    stored = await session.scalar(select(Strategy).where(Strategy.id == strategy_id))
+    assert stored.latest_version == 3
+
+    session.add(StrategyVersion(strategy_id=strategy_id, version=3, graph_json=VALID_GRAPH))
+    with pytest.raises(IntegrityError):
+      await session.flush()
+
+
+async def test_legacy_duplicate_versions_are_renumbered_before_indexing():
+  engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+  async with engine.begin() as connection:
+    await connection.run_sync(Base.metadata.create_all)
+    await connection.execute(text("DROP INDEX strategy_versions_strategy_id_version_idx"))
+
+  duplicated_id = uuid.uuid4()
+  clean_id = uuid.uuid4()
+  start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+  async with AsyncSession(engine) as session:
+    session.add_all(
+      [
+        Strategy(id=duplicated_id, workspace_id=uuid.uuid4(), name="Raced", latest_version=2),
+        Strategy(id=clean_id, workspace_id=uuid.uuid4(), name="Clean", latest_version=2)
+      ]
+    )
+    for offset, version in enumerate((1, 2, 2, 3)):
+      session.add(
+        StrategyVersion(
+          strategy_id=duplicated_id,
+          version=version,
+          label=f"v{offset}",
+          graph_json=VALID_GRAPH,
+          created_at=start + timedelta(minutes=offset)
+        )
+      )
+    for version in (1, 2):
+      session.add(StrategyVersion(strategy_id=clean_id, version=version, graph_json=VALID_GRAPH))
+    await session.commit()
+
+  async with engine.begin() as connection:
+    await renumber_duplicate_versions(connection)
+    await connection.execute(
+      text(
+        "CREATE UNIQUE INDEX strategy_versions_strategy_id_version_idx "
+        "ON strategy_versions (strategy_id, version)"
+      )
+    )
+
+  async with AsyncSession(engine) as session:
+    renumbered = (
+      await session.scalars(
+        select(StrategyVersion)
+        .where(StrategyVersion.strategy_id == duplicated_id)
+        .order_by(StrategyVersion.created_at)
+      )
+    ).all()
+    assert [(row.label, row.version) for row in renumbered] == [("v0", 1), ("v1", 2), ("v2", 3), ("v3", 4)]
+    counters = dict((await session.execute(select(Strategy.name, Strategy.latest_version))).all())
+    assert counters == {"Raced": 4, "Clean": 2}
+  await engine.dispose()
+
+
+async def test_autosaves_within_window_overwrite_latest_autosave(monkeypatch):
+  monkeypatch.setattr(get_settings(), "autosave_coalesce_seconds", 30)
+  session_factory = await _create_session_factory()
+  async with session_factory() as session:
+    user = _build_user()
+    await sync_user_from_claims(session, user)
+    _, strategy, _, _ = await get_or_create_demo_workspace(session, user)
+    strategy_id = strategy.id
+    broken = {**VALID_GRAPH, "edges": VALID_GRAPH["edges"][:2]}
+
+    first = await create_version(session, strategy_id, VALID_GRAPH, user)
+    coalesced = await create_version(session, strategy_id, broken, user)
+    assert coalesced.id == first.id and coalesced.version == 2
+    assert coalesced.graph == broken
+    assert coalesced.error_count == 2
+
+    labelled = await create_version(session, strategy_id, VALID_GRAPH, user, label="Checkpoint")
+    after_label = await create_version(session, strategy_id, broken, user)
+    assert [labelled.version, after_label.version] == [3, 4]
+
+    # The window restarts on every write, however old the row itself is.
+    after_label.created_at = after_label.created_at - timedelta(minutes=5)
+    await session.flush()
+    debounced = await create_version(session, strategy_id, broken, user)
+    assert debounced.id == after_label.id
+
+    after_label.updated_at = after_label.updated_at - timedelta(minutes=5)
+    await session.flush()
+    fresh = await create_version(session, strategy_id, VALID_GRAPH, user)
+    assert fresh.version == 5
+    await session.commit()
+
+  async with session_factory() as session:
+    versions = {version.version: version for version in await list_versions(session, strategy_id, user)}
+    assert sorted(versions) == [1, 2, 3, 4, 5]
+    assert versions[2].graph == versions[4].graph == broken
+    assert versions[5].graph == VALID_GRAPH
+
+
+async def test_retention_policy_thins_autosaves_by_age():
+  now = datetime(2026, 3, 31, 12, 0, tzinfo=timezone.utc)
+
+  def autosave(number, age, autosave=True):
+    return StrategyVersion(id=uuid.uuid4(), version=number, is_autosave=autosave, created_at=now - age)
+
+  versions = [
+    autosave(1, timedelta(days=40), autosave=False),
+    autosave(2, timedelta(days=40)),
+    autosave(3, timedelta(days=3, hours=2)),
+    autosave(4, timedelta(days=3, hours=1)),
+    autosave(5, timedelta(hours=5, minutes=40)),
+    autosave(6, timedelta(hours=5, minutes=10)),
+    autosave(7, timedelta(hours=3)),
+    autosave(8, timedelta(minutes=50)),
+    autosave(9, timedelta(minutes=5))
+  ]
+  keep = select_versions_to_keep(versions, now)
+  assert sorted(version.version for version in versions if version.id in keep) == [1, 4, 6, 7, 8, 9]
+
+
+async def test_retention_job_repairs_delta_chain(monkeypatch):
+  session_factory = await _create_session_factory()
+  async with session_factory() as session:
+    user = _build_user()
+    await sync_user_from_claims(session, user)
+    _, strategy, _, _ = await get_or_create_demo_workspace(session, user)
+    strategy_id = strategy.id
+    saved = {}
+    for index in range(5):
+      graph = _with_threshold(VALID_GRAPH, 0.1 * (index + 1))
+      version = await create_version(session, strategy_id, graph, user)
+      saved[version.version] = graph
+    # Versions 2-4 are two days old and share a day bucket; only v4 survives thinning.
+    for version in await list_versions(session, strategy_id, user):
+      if version.version in (2, 3, 4):
+        version.created_at = version.created_at - timedelta(days=2) + timedelta(minutes=version.version)
+    await session.commit()
+
+  async with session_factory() as session:
+    # Pages of two make both passes cross page boundaries mid-chain.
+    progress = await thin_version_history(session, batch_size=10, page_size=2)
+    await session.commit()
+    assert (progress.strategies, progress.removed, progress.done) == (1, 2, True)
+
+  async with session_factory() as session:
+    versions = {version.version: version for version in await list_versions(session, strategy_id, user)}
+    assert sorted(versions) == [1, 4, 5, 6]
+    assert versions[4].graph_hash is not None and versions[4].delta_depth == 0
+    assert versions[5].delta_depth == 1
+    for number in (4, 5, 6):
+      assert versions[number].graph == saved[number]
+
+    removed_blobs = await collect_orphan_blobs(session, older_than=timedelta(0))
+    assert removed_blobs == 1
+    blobs = (await session.scalars(select(GraphBlob))).all()
+    assert {blob.hash for blob in blobs} == {versions[1].graph_hash, versions[4].graph_hash}
+
+
+async def test_history_endpoints_answer_conditional_requests():
+  session_factory = await _create_session_factory()
+  async with session_factory() as session:
+    user = _build_user()
+    await sync_user_from_claims(session, user)
+    _, strategy, seed_version, _ = await get_or_create_demo_workspace(session, user)
+    strategy_id, seed_id = strategy.id, seed_version.id
+    await session.commit()
+
+  async def override_db():
+    async with session_factory() as session:
+      yield session
+      await session.commit()
+
+  app = create_app()
+  app.dependency_overrides[require_compliance_consent] = lambda: user
+  app.dependency_overrides[get_db] = override_db
+  base = f"/api/v1/strategies/{strategy_id}/versions"
+
+  def exercise():
+    # Not entered as a context manager: the lifespan would touch the global engine.
+    client = TestClient(app)
+    first = client.get(base, params={"view": "summary"})
+    cached = client.get(base, params={"view": "summary"}, headers={"If-None-Match": first.headers["etag"]})
+    full = client.get(base, headers={"If-None-Match": first.headers["etag"]})
+    detail = client.get(f"{base}/{seed_id}")
+    detail_cached = client.get(f"{base}/{seed_id}", headers={"If-None-Match": detail.headers["etag"]})
+    client.post(base, json={"graph": VALID_GRAPH})
+    after_write = client.get(base, params={"view": "summary"}, headers={"If-None-Match": first.headers["etag"]})
+    return first, cached, full, detail_cached, after_write
+
+  first, cached, full, detail_cached, after_write = await asyncio.to_thread(exercise)
+
+  assert first.status_code == 200 and first.headers["etag"].startswith('"')
+  assert cached.status_code == 304 and cached.content == b""
+  assert cached.headers["etag"] == first.headers["etag"]
+  assert full.status_code == 200 and full.headers["etag"] != first.headers["etag"]
+  assert detail_cached.status_code == 304
+  assert after_write.status_code == 200
+  assert [entry["version"] for entry in after_write.json()["versions"]] == [2, 1]
+
+
+async def test_transfer_lines_split_across_chunks_and_are_capped(monkeypatch):
+  record = json.dumps({"version": 1, "label": "One", "graph": VALID_GRAPH}).encode()
+  monkeypatch.setattr(get_settings(), "version_transfer_max_line_bytes", len(record))
+
+  async def chunks(payload: bytes, size: int):
+    for start in range(0, len(payload), size):
+      yield payload[start:start + size]
+
+  payload = record + b"\n\n" + record
+  parsed = [item async for item in _read_transfer_records(chunks(payload, 7))]
+  assert [item.label for item in parsed] == ["One", "One"]
+
+  with pytest.raises(HTTPException) as excinfo:
+    oversized = record + b" \n"
+    [item async for item in _read_transfer_records(chunks(oversized, len(oversized)))]
+  assert excinfo.value.status_code == 413 and "Line 1" in excinfo.value.detail
+
+  with pytest.raises(HTTPException) as excinfo:
+    [item async for item in _read_transfer_records(chunks(record + b"\n" + record + b"  ", 7))]
+  assert excinfo.value.status_code == 413 and "Line 2" in excinfo.value.detail
+
+
+async def test_history_export_streams_into_import(monkeypatch):
+  monkeypatch.setattr(get_settings(), "version_keyframe_interval", 3)
+  monkeypatch.setattr(get_settings(), "version_transfer_batch_size", 2)
+  session_factory = await _create_session_factory()
+  async with session_factory() as session:
+    user = _build_user()
+    await sync_user_from_claims(session, user)
+    workspace, strategy, _, _ = await get_or_create_demo_workspace(session, user)
+    source_id = strategy.id
+    for index in range(4):
+      await create_version(session, source_id, _with_threshold(VALID_GRAPH, 0.1 * (index + 1)), user)
+    target = Strategy(workspace_id=workspace.id, name="Imported copy")
+    session.add(target)
+    await session.flush()
+    target_id = target.id
+    await session.commit()
+
+  async def override_db():
+    async with session_factory() as session:
+      yield session
+      await session.commit()
+
+  streaming_sessions = []
+
+  def streaming_factory():
+    session = session_factory()
+    streaming_sessions.append(session)
+    return session
+
+  app = create_app()
+  app.dependency_overrides[require_compliance_consent] = lambda: user
+  app.dependency_overrides[get_db] = override_db
+  app.dependency_overrides[get_session_factory] = lambda: streaming_factory
+  forged_author = str(uuid.uuid4())
+
+  def exercise():
+    client = TestClient(app)
+    exported = client.get(f"/api/v1/strategies/{source_id}/versions/export")
+    forged = b"".join(
+      json.dumps({**json.loads(line), "authorId": forged_author}).encode() + b"\n"
+      for line in exported.content.splitlines()
+    )
+    imported = client.post(
+      f"/api/v1/strategies/{target_id}/versions/import",
+      content=forged,
+      headers={"Content-Type": "application/x-ndjson"}
+    )
+    rejected = client.post(f"/api/v1/strategies/{target_id}/versions/import", content=b'{"version": 1}\n')
+    return exported, imported, rejected
+
+  exported, imported, rejected = await asyncio.to_thread(exercise)
+
+  assert exported.status_code == 200
+  assert exported.headers["content-type"].startswith("application/x-ndjson")
+  records = [json.loads(line) for line in exported.text.splitlines()]
+  assert [record["version"] for record in records] == [1, 2, 3, 4, 5]
+  # The body is read from its own session, closed once the stream is exhausted.
+  assert len(streaming_sessions) == 1 and streaming_sessions[0].closed
+  assert imported.status_code == 201
+  assert imported.json() == {"imported": 5, "latestVersion": 5}
+  assert rejected.status_code == 400 and "Line 1" in rejected.json()["detail"]
+
+  async with session_factory() as session:
+    copies = {version.version: version for version in await list_versions(session, target_id, user)}
+    assert sorted(copies) == [1, 2, 3, 4, 5]
+    assert any(copy.graph_delta is not None for copy in copies.values())
+    for record in records:
+      copy = copies[record["version"]]
+      assert copy.graph == record["graph"]
+      assert copy.label == record["label"]
+      assert str(copy.author_id) == user.id
+      assert copy.node_count == len(record["graph"]["nodes"])
+
+
+async def test_graph_diff_reports_items_and_parameters():
+  after = _with_threshold(VALID_GRAPH, 0.9)
+  after = {
+    **after,
+    "nodes": after["nodes"][1:] + [{"id": "extra", "type": "paper-broker", "metadata": {"parameters": {}}}],
+    "edges": [{**VALID_GRAPH["edges"][0], "targetHandle": "in"}] + VALID_GRAPH["edges"][2:],
+    "viewport": {"zoom": 2}
+  }
+  diff = diff_graph_structure(VALID_GRAPH, after)
+
+  assert [node["id"] for node in diff["nodes"]["added"]] == ["extra"]
+  assert [node["id"] for node in diff["nodes"]["removed"]] == ["market-data"]
+  assert diff["nodes"]["changed"] == [
+    {"id": "entry", "fields": {}, "parameters": {"threshold": {"before": 0.5, "after": 0.9}}}
+  ]
+  assert [edge["id"] for edge in diff["edges"]["removed"]] == ["e2"]
+  assert diff["edges"]["changed"] == [
+    {"id": "e1", "fields": {"targetHandle": {"before": None, "after": "in"}}, "parameters": {}}
+  ]
+  assert diff["properties"] == {"viewport": {"before": None, "after": {"zoom": 2}}}
+  assert diff_graph_structure(VALID_GRAPH, VALID_GRAPH)["nodes"] == {"added": [], "removed": [], "changed": []}
+
+
+async def test_version_diff_is_cached_per_pair(monkeypatch):
+  get_diff_cache().clear()
+  session_factory = await _create_session_factory()
+  async with session_factory() as session:
+    user = _build_user()
+    await sync_user_from_claims(session, user)
+    _, strategy, _, _ = await get_or_create_demo_workspace(session, user)
+    first = await create_version(session, strategy.id, VALID_GRAPH, user)
+    second = await create_version(session, strategy.id, _with_threshold(VALID_GRAPH, 0.7), user)
+    await session.commit()
+
+    diff = await diff_versions(session, strategy.id, first.id, second.id, user)
+    again = await diff_versions(session, strategy.id, first.id, second.id, user)
+
+  assert (diff.before.version, diff.after.version) == (2, 3)
+  assert diff.changes["nodes"]["changed"][0]["parameters"] == {"threshold": {"before": 0.5, "after": 0.7}}
+  assert again.changes is diff.changes
+  assert get_diff_cache().stats()["hits"] == 1
+
+
 async def test_quota_issue_emitted_for_free_plan():
   user = _build_user(pro=False)
   overloaded_graph = {
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import asyncio
+from contextlib import asynccontextmanager
 import logging
 import uuid
 from datetime import datetime, timedelta
 
 import pytest
 from fastapi import HTTPException, status
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, event, select
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -21,12 +22,22 @@ from app.auth.schemas import (
   SupabaseUserMetadata
 )
 from app.db.base import Base
+from app.db.session import commit_session
 from app.models.compliance_event import ComplianceEvent
+from app.models.strategy import Strategy, StrategyVersion
+from app.models.user import User
+from app.models.workspace import Workspace
+from app.services.bootstrap_cache_service import BootstrapPayloadCache, get_bootstrap_cache
+from app.services.strategy_version_service import create_version
+from app.services import workspace_service
 from app.services.user_service import sync_user_from_claims
 from app.services.workspace_service import (
+  DEMO_GRAPH,
   LATENCY_BUDGET_MS,
   bootstrap_workspace_payload,
-  get_or_create_demo_workspace
+  get_or_create_demo_workspace,
+  provision_cohort_workspaces,
+  provision_demo_workspace
 )
 
 pytestmark = pytest.mark.asyncio
@@ -47,9 +58,25 @@ class AsyncSessionWrapper:
   def add(self, instance):
     self._sync_session.add(instance)
 
+  @property
+  def info(self):
+    return self._sync_session.info
+
+  def get_bind(self):
+    return self._sync_session.get_bind()
+
+  @asynccontextmanager
+  async def begin_nested(self):
+    with self._sync_session.begin_nested():
+      yield
+
   async def execute(self, *args, **kwargs):
     return await asyncio.to_thread(self._sync_session.execute, *args, **kwargs)
 
+  async def scalar(self, *args, **kwargs):
+    result = await self.execute(*args, **kwargs)
+    return result.scalar_one_or_none()
+
   async def flush(self):
     return await asyncio.to_thread(self._sync_session.flush)
 
@@ -126,6 +153,203 @@ async def test_bootstrap_creates_workspace_and_audit_event():
     assert str(workspace_again.id) == payload["workspace"]["id"]
 
 
+async def test_existing_workspace_loads_in_one_statement():
+  session_factory = await _create_session_factory()
+
+  async with session_factory() as session:
+    actor = _build_authenticated_user()
+    await sync_user_from_claims(session, actor)
+    workspace, strategy, version, _ = await get_or_create_demo_workspace(session, actor)
+    session.add(Strategy(
+      workspace_id=workspace.id,
+      name="Later strategy",
+      created_at=strategy.created_at + timedelta(minutes=5)
+    ))
+    await session.commit()
+    expected = (workspace.id, strategy.id, version.id)
+
+  async with session_factory() as session:
+    statements = []
+    engine = session.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+      statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+      workspace, strategy, version, created = await get_or_create_demo_workspace(session, actor)
+    finally:
+      event.remove(engine, "before_cursor_execute", record)
+
+    assert created is False
+    assert (workspace.id, strategy.id, version.id) == expected
+    assert version.graph["nodes"]
+    assert len(statements) == 1
+
+
+async def test_returning_user_bootstrap_is_served_from_cache():
+  session_factory = await _create_session_factory()
+
+  async with session_factory() as session:
+    actor = _build_authenticated_user()
+    await sync_user_from_claims(session, actor)
+    first, _ = await bootstrap_workspace_payload(session, actor)
+    await session.commit()
+    second, _ = await bootstrap_workspace_payload(session, actor)
+    await session.commit()
+
+  async with session_factory() as session:
+    statements = []
+    engine = session.get_bind()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+      statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+      cached, _ = await bootstrap_workspace_payload(session, actor)
+    finally:
+      event.remove(engine, "before_cursor_execute", record)
+    assert statements == []
+    assert cached["created"] is False and first["created"] is True
+    assert cached["workspace"] == second["workspace"] == first["workspace"]
+    await session.commit()
+    # Both bootstraps that read the database are audited; the cache hit within the
+    # same TTL window is not.
+    audits = (await session.execute(select(ComplianceEvent))).scalars().all()
+    assert len(audits) == 2
+
+    await create_version(session, uuid.UUID(cached["strategy"]["id"]), DEMO_GRAPH, actor, label="Checkpoint")
+    # The entry is only dropped once the new version is visible to other sessions.
+    assert await get_bootstrap_cache().get(actor.id) is not None
+    await commit_session(session)
+    assert await get_bootstrap_cache().get(actor.id) is None
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+      refreshed, _ = await bootstrap_workspace_payload(session, actor)
+    finally:
+      event.remove(engine, "before_cursor_execute", record)
+    assert statements
+    assert refreshed["strategy"] == cached["strategy"]
+
+
+async def test_bootstrap_adopts_workspace_provisioned_concurrently(monkeypatch):
+  session_factory = await _create_session_factory()
+
+  async with session_factory() as session:
+    actor = _build_authenticated_user()
+    await sync_user_from_claims(session, actor)
+    await session.commit()
+
+  async with session_factory() as worker_session:
+    provisioned, _, _, created = await provision_demo_workspace(worker_session, uuid.UUID(actor.id))
+    provisioned_id = provisioned.id
+    await worker_session.commit()
+    assert created is True
+
+  async with session_factory() as session:
+    # Simulate the request having checked for a workspace just before the worker committed.
+    load_existing = _miss_once(workspace_service._load_existing_workspace)
+    monkeypatch.setattr(workspace_service, "_load_existing_workspace", load_existing)
+    workspace, _, version, created = await get_or_create_demo_workspace(session, actor)
+
+    assert created is False
+    assert workspace.id == provisioned_id
+    assert version.graph["nodes"]
+
+
+async def test_cohort_provisioning_is_idempotent():
+  session_factory = await _create_session_factory()
+
+  async with session_factory() as session:
+    user_ids = [uuid.uuid4() for _ in range(5)]
+    for index, user_id in enumerate(user_ids):
+      session.add(User(id=user_id, email=f"cohort-{index}@example.com"))
+    await session.flush()
+    await provision_demo_workspace(session, user_ids[0])
+    await session.commit()
+
+  unknown = uuid.uuid4()
+  async with session_factory() as session:
+    outcome = await provision_cohort_workspaces(session, [*user_ids, unknown, user_ids[1]])
+    await session.commit()
+
+    assert (outcome.created, outcome.existing, outcome.missing) == (4, 1, [unknown])
+    versions = (await session.execute(select(StrategyVersion))).scalars().all()
+    assert len(versions) == 5
+    assert {version.graph_hash for version in versions} == {versions[0].graph_hash}
+
+  async with session_factory() as session:
+    outcome = await provision_cohort_workspaces(session, user_ids)
+    await session.commit()
+
+    assert (outcome.created, outcome.existing) == (0, 5)
+    workspaces = (await session.execute(select(Workspace))).scalars().all()
+    assert len(workspaces) == 5
+    workspace, _, version, created = await get_or_create_demo_workspace(session, _user_for(user_ids[3]))
+    assert created is False
+    assert version.graph == DEMO_GRAPH
+
+
+def _user_for(user_id: uuid.UUID) -> AuthenticatedUser:
+  user = _build_authenticated_user()
+  return user.model_copy(update={"id": str(user_id)})
+
+
+def _miss_once(load):
+  calls = []
+
+  async def loader(session, user_id):
+    calls.append(user_id)
+    if len(calls) == 1:
+      return None
+    return await load(session, user_id)
+
+  return loader
+
+
+class _FakeRedis:
+  def __init__(self):
+    self.values = {}
+
+  async def get(self, key):
+    return self.values.get(key)
+
+  async def set(self, key, value, px=None):
+    self.values[key] = value
+
+  async def delete(self, key):
+    self.values.pop(key, None)
+
+
+async def test_bootstrap_cache_shares_payloads_through_redis_tier():
+  redis = _FakeRedis()
+  writer = BootstrapPayloadCache(redis_client=redis, redis_ttl_seconds=60)
+  reader = BootstrapPayloadCache(redis_client=redis, redis_ttl_seconds=60)
+
+  await writer.put("user-1", {"workspace": {"id": "w1"}})
+  assert await reader.get("user-1") == {"workspace": {"id": "w1"}}
+  assert reader.stats() == {"hits": 1, "misses": 0, "size": 1}
+
+  await writer.invalidate("user-1")
+  assert redis.values == {}
+  assert await writer.get("user-1") is None
+
+
+async def test_bootstrap_audit_claims_once_per_ttl_window():
+  now = [0.0]
+  cache = BootstrapPayloadCache(ttl_seconds=30, clock=lambda: now[0])
+
+  assert cache.claim_audit("user-1") is True
+  assert cache.claim_audit("user-1") is False
+  assert cache.claim_audit("user-2") is True
+  await cache.invalidate("user-1")
+  assert cache.claim_audit("user-1") is False
+  now[0] = 31
+  assert cache.claim_audit("user-1") is True
+
+
 async def test_bootstrap_rejects_users_without_consent():
   actor = _build_authenticated_user(accepted=False)
 
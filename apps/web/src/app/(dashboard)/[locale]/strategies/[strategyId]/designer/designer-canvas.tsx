@@ -7,7 +7,7 @@ import type { StrategyVersionSummary } from "@strategybuilder/shared";
 import "@xyflow/react/dist/style.css";
 
 import { StrategyCanvas } from "@/components/canvas/StrategyCanvas";
-import { useStrategyVersions } from "@/hooks/use-strategy-versions";
+import { useStrategyVersion, useStrategyVersions } from "@/hooks/use-strategy-versions";
 import { isUuid } from "@/lib/is-uuid";
 import { useStrategyCanvas } from "@/stores/useStrategyCanvas";
 import { useWorkspaceStore } from "@/stores/workspace-store";
@@ -22,7 +22,9 @@ export default function DesignerCanvas({ strategyId }: DesignerCanvasProps) {
   const loadVersion = useStrategyCanvas((state) => state.loadVersion);
   const persistableStrategyId = isUuid(strategyId) ? strategyId : null;
   const versionsQuery = useStrategyVersions(persistableStrategyId);
-  const latestRemoteVersion = versionsQuery.data?.[0] ?? null;
+  const latestEntry = versionsQuery.data?.[0] ?? null;
+  const latestQuery = useStrategyVersion(persistableStrategyId, latestEntry?.id ?? null);
+  const latestRemoteVersion = latestQuery.data ?? null;
   const [currentVersion, setCurrentVersion] = useState<StrategyVersionSummary | null>(null);
   const initialisedRef = useRef(false);
 
@@ -105,11 +107,15 @@ export default function DesignerCanvas({ strategyId }: DesignerCanvasProps) {
   const loading = useMemo(
     () =>
       versionsQuery.isLoading ||
+      latestQuery.isLoading ||
       (!initialisedRef.current &&
         (!strategy || strategy.id !== strategyId) &&
         persistableStrategyId !== null &&
-        !versionsQuery.data),
+        (!versionsQuery.data || (latestEntry !== null && !latestRemoteVersion))),
     [
+      latestEntry,
+      latestQuery.isLoading,
+      latestRemoteVersion,
       persistableStrategyId,
       strategy,
       strategyId,
@@ -119,7 +125,7 @@ export default function DesignerCanvas({ strategyId }: DesignerCanvasProps) {
   );
 
   if (!currentVersion) {
-    if (versionsQuery.isError) {
+    if (versionsQuery.isError || latestQuery.isError) {
       return (
         <div className="flex min-h-[420px] flex-1 items-center justify-center rounded-2xl border border-rose-700 bg-rose-950/60 px-6 text-center text-sm text-rose-100">
           Failed to load the strategy canvas. Please refresh the page to try again.
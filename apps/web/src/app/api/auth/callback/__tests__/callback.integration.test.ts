@@ -56,6 +56,40 @@ describe("OAuth consent callback", () => {
     expect(response.headers.get("location")).toBe("https://example.com/en/strategies");
   });
 
+  it("queues workspace provisioning without waiting for the API", async () => {
+    // The request never settles; the redirect must not depend on it.
+    const fetchMock = vi.fn().mockReturnValue(new Promise<Response>(() => {}));
+    vi.stubGlobal("fetch", fetchMock);
+    supabaseAuthMocks.exchangeCodeForSession.mockResolvedValue({ error: null });
+    supabaseAuthMocks.getUser.mockResolvedValue({
+      data: {
+        user: {
+          user_metadata: {
+            accepted_simulation_only: false
+          }
+        }
+      },
+      error: null
+    });
+    supabaseAuthMocks.updateUser.mockResolvedValue({ error: null });
+    supabaseAuthMocks.refreshSession.mockResolvedValue({
+      data: { session: { access_token: "fresh-token" } },
+      error: null
+    });
+
+    const request = {
+      url: "https://example.com/api/auth/callback?code=test-code&consent=true&locale=en&next=%2Fen%2Fstrategies"
+    } as unknown as Parameters<typeof GET>[0];
+    const response = await GET(request);
+
+    expect(fetchMock).toHaveBeenCalledTimes(1);
+    const [url, init] = fetchMock.mock.calls[0];
+    expect(String(url)).toMatch(/\/workspaces\/provision$/);
+    expect(init.headers.Authorization).toBe("Bearer fresh-token");
+    expect(response.headers.get("location")).toBe("https://example.com/en/strategies");
+    vi.unstubAllGlobals();
+  });
+
   it("redirects to login when the session refresh fails", async () => {
     supabaseAuthMocks.exchangeCodeForSession.mockResolvedValue({ error: null });
     supabaseAuthMocks.getUser.mockResolvedValue({
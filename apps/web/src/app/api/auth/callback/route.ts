@@ -3,6 +3,24 @@ import type { NextRequest } from "next/server";
 
 import { createSupabaseServerClient } from "@/lib/supabase/server";
 
+const API_BASE_URL = process.env.NEXT_PUBLIC_API_BASE_URL ?? "http://localhost:8000/api/v1";
+const PROVISION_TIMEOUT_MS = 1000;
+
+// Queue workspace provisioning so the dashboard's first bootstrap finds it ready.
+// Fire-and-forget: the redirect never waits on the API, and failures are ignored
+// because bootstrap seeds the workspace itself when nothing was queued.
+async function requestWorkspaceProvisioning(accessToken: string) {
+  try {
+    await fetch(`${API_BASE_URL}/workspaces/provision`, {
+      method: "POST",
+      headers: { Authorization: `Bearer ${accessToken}` },
+      signal: AbortSignal.timeout(PROVISION_TIMEOUT_MS)
+    });
+  } catch {
+    // Best effort only.
+  }
+}
+
 function resolveLocale(requestedLocale?: string | null) {
   if (!requestedLocale) {
     return "en";
@@ -60,10 +78,15 @@ export async function GET(request: NextRequest) {
     return buildLoginRedirect("consent-update-failed");
   }
 
-  const { error: refreshError } = await supabase.auth.refreshSession();
+  const { data: refreshed, error: refreshError } = await supabase.auth.refreshSession();
   if (refreshError) {
     return buildLoginRedirect("session-refresh-failed");
   }
 
+  const accessToken = refreshed?.session?.access_token;
+  if (accessToken) {
+    void requestWorkspaceProvisioning(accessToken);
+  }
+
   return NextResponse.redirect(new URL(redirectTarget, requestUrl.origin));
 }
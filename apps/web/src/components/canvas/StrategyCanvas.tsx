@@ -20,11 +20,13 @@ import {
   type StrategyGraph,
   type StrategyNode,
   type StrategyNodePosition,
+  type StrategyVersionHistoryEntry,
   type StrategyVersionSummary
 } from "@strategybuilder/shared";
 
 import {
   useAutosaveStrategyVersion,
+  useLoadStrategyVersion,
   useRevertStrategyVersion,
   useStrategyVersions,
   useValidateStrategyGraph
@@ -74,13 +76,21 @@ function VersionHistory({
   currentVersionId,
   onLoad,
   onRevert,
-  revertingId
+  revertingId,
+  loadingId,
+  hasMore,
+  loadingMore,
+  onLoadMore
 }: {
-  versions: StrategyVersionSummary[];
+  versions: StrategyVersionHistoryEntry[];
   currentVersionId: string;
-  onLoad: (version: StrategyVersionSummary) => void;
-  onRevert: (version: StrategyVersionSummary) => void;
+  onLoad: (version: StrategyVersionHistoryEntry) => void;
+  onRevert: (version: StrategyVersionHistoryEntry) => void;
   revertingId: string | null;
+  loadingId: string | null;
+  hasMore: boolean;
+  loadingMore: boolean;
+  onLoadMore: () => void;
 }) {
   if (versions.length === 0) {
     return (
@@ -117,9 +127,10 @@ function VersionHistory({
                   <button
                     type="button"
                     onClick={() => onLoad(version)}
-                    className="rounded-md border border-slate-700 px-2 py-1 text-xs text-slate-200 hover:border-sky-500 hover:text-sky-300"
+                    disabled={loadingId === version.id}
+                    className="rounded-md border border-slate-700 px-2 py-1 text-xs text-slate-200 hover:border-sky-500 hover:text-sky-300 disabled:opacity-50"
                   >
-                    Load
+                    {loadingId === version.id ? "Loading" : "Load"}
                   </button>
                   <button
                     type="button"
@@ -135,6 +146,16 @@ function VersionHistory({
           );
         })}
       </ul>
+      {hasMore && (
+        <button
+          type="button"
+          onClick={onLoadMore}
+          disabled={loadingMore}
+          className="self-start rounded-md border border-slate-700 px-2 py-1 text-xs text-slate-300 hover:border-sky-500 hover:text-sky-300 disabled:opacity-50"
+        >
+          {loadingMore ? "Loading older versions" : "Load older versions"}
+        </button>
+      )}
     </section>
   );
 }
@@ -143,6 +164,7 @@ export function StrategyCanvas({ strategyId, versionId, onVersionSwitch }: Strat
   const [reactFlowInstance, setReactFlowInstance] = useState<ReactFlowInstance | null>(null);
   const [selectedNodeId, setSelectedNodeId] = useState<string | null>(null);
   const [revertingId, setRevertingId] = useState<string | null>(null);
+  const [loadingVersionId, setLoadingVersionId] = useState<string | null>(null);
   const [revertNotice, setRevertNotice] = useState<string | null>(null);
 
   const graph = useStrategyCanvas((state) => state.graphs[versionId]);
@@ -178,6 +200,7 @@ export function StrategyCanvas({ strategyId, versionId, onVersionSwitch }: Strat
   const autosaveMutation = useAutosaveStrategyVersion(persistableStrategyId);
   const validateMutation = useValidateStrategyGraph(persistableStrategyId);
   const revertMutation = useRevertStrategyVersion(persistableStrategyId);
+  const fetchVersion = useLoadStrategyVersion(persistableStrategyId);
 
   const issuesByNode = useMemo(() => buildIssuesMap(validationState?.issues ?? []), [validationState]);
   const globalIssues = useMemo(
@@ -430,21 +453,27 @@ export function StrategyCanvas({ strategyId, versionId, onVersionSwitch }: Strat
   );
 
   const handleLoadVersion = useCallback(
-    (version: StrategyVersionSummary) => {
-      loadVersion({
-        strategyId,
-        versionId: version.id,
-        graph: version.graph,
-        issues: version.validationIssues
-      });
-      setSelectedNodeId(null);
-      onVersionSwitch(version);
+    async (entry: StrategyVersionHistoryEntry) => {
+      setLoadingVersionId(entry.id);
+      try {
+        const version = await fetchVersion(entry.id);
+        loadVersion({
+          strategyId,
+          versionId: version.id,
+          graph: version.graph,
+          issues: version.validationIssues
+        });
+        setSelectedNodeId(null);
+        onVersionSwitch(version);
+      } finally {
+        setLoadingVersionId(null);
+      }
     },
-    [loadVersion, onVersionSwitch, strategyId]
+    [fetchVersion, loadVersion, onVersionSwitch, strategyId]
   );
 
   const handleRevertVersion = useCallback(
-    async (version: StrategyVersionSummary) => {
+    async (version: StrategyVersionHistoryEntry) => {
       setRevertingId(version.id);
       try {
         if (!persistableStrategyId) {
@@ -597,6 +626,10 @@ export function StrategyCanvas({ strategyId, versionId, onVersionSwitch }: Strat
                 onLoad={handleLoadVersion}
                 onRevert={handleRevertVersion}
                 revertingId={revertingId}
+                loadingId={loadingVersionId}
+                hasMore={Boolean(versionsQuery.hasNextPage)}
+                loadingMore={versionsQuery.isFetchingNextPage}
+                onLoadMore={() => void versionsQuery.fetchNextPage()}
               />
             </div>
           </div>
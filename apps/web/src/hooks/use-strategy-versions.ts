@@ -1,40 +1,150 @@
 "use client";
 
 import { useCallback } from "react";
-import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
+import {
+  type InfiniteData,
+  type QueryClient,
+  useInfiniteQuery,
+  useMutation,
+  useQuery,
+  useQueryClient
+} from "@tanstack/react-query";
 import { useSessionContext, useSupabaseClient } from "@supabase/auth-helpers-react";
 
-import type { CanvasValidationIssue, StrategyGraph, StrategyVersionSummary } from "@strategybuilder/shared";
+import type {
+  CanvasValidationIssue,
+  StrategyGraph,
+  StrategyVersionHistoryEntry,
+  StrategyVersionSummary
+} from "@strategybuilder/shared";
 import { resolveAccessToken } from "@/lib/resolve-access-token";
 import {
   createStrategyVersion,
-  listStrategyVersions,
+  getStrategyVersion,
+  listStrategyVersionHistory,
   revertStrategyVersion,
   validateStrategyGraph
 } from "@/services/strategy-versions";
 
 const versionsKey = (strategyId: string | null) => ["strategies", strategyId, "versions"] as const;
+// Autosaves may overwrite the latest version in place, so detail entries go stale like the list.
+const VERSION_STALE_TIME = 60 * 1000;
+
+const versionKey = (strategyId: string | null, versionId: string | null) =>
+  ["strategies", strategyId, "versions", "detail", versionId] as const;
+
+type HistoryPage = { versions: StrategyVersionHistoryEntry[]; nextCursor: string | null };
+
+function toHistoryEntry(version: StrategyVersionSummary): StrategyVersionHistoryEntry {
+  return {
+    id: version.id,
+    version: version.version,
+    label: version.label,
+    nodeCount: version.graph.nodes.length,
+    edgeCount: version.graph.edges.length,
+    errorCount: version.validationIssues.filter((issue) => issue.severity === "error").length,
+    warningCount: version.validationIssues.filter((issue) => issue.severity === "warning").length,
+    createdAt: version.createdAt,
+    updatedAt: version.updatedAt
+  };
+}
+
+function rememberVersion(queryClient: QueryClient, strategyId: string, version: StrategyVersionSummary) {
+  // The save response is the freshest copy of this row, so it can seed the detail cache directly.
+  queryClient.setQueryData(versionKey(strategyId, version.id), version);
+  queryClient.setQueryData(
+    versionsKey(strategyId),
+    (existing: InfiniteData<HistoryPage, string | null> | undefined) => {
+      const entry = toHistoryEntry(version);
+      if (!existing || existing.pages.length === 0) {
+        return {
+          pages: [{ versions: [entry], nextCursor: null }],
+          pageParams: [null]
+        };
+      }
+      const [first, ...rest] = existing.pages.map((page) => ({
+        ...page,
+        versions: page.versions.filter((item) => item.id !== version.id)
+      }));
+      return { ...existing, pages: [{ ...first, versions: [entry, ...first.versions] }, ...rest] };
+    }
+  );
+}
 
+/**
+ * Graph-free version history, newest first, paged with the API's `nextCursor`.
+ * Use `fetchNextPage` to load older entries and `useStrategyVersion` for a graph.
+ */
 export function useStrategyVersions(strategyId: string | null) {
   const supabase = useSupabaseClient();
   const { session } = useSessionContext();
 
-  const queryFn = useCallback(async () => {
-    if (!strategyId) {
-      return [] as StrategyVersionSummary[];
-    }
-    const token = await resolveAccessToken(session, supabase);
-    return listStrategyVersions(token, strategyId);
-  }, [session, strategyId, supabase]);
+  const queryFn = useCallback(
+    async ({ pageParam }: { pageParam: string | null }): Promise<HistoryPage> => {
+      if (!strategyId) {
+        return { versions: [], nextCursor: null };
+      }
+      const token = await resolveAccessToken(session, supabase);
+      return listStrategyVersionHistory(token, strategyId, pageParam);
+    },
+    [session, strategyId, supabase]
+  );
 
-  return useQuery({
+  return useInfiniteQuery({
     queryKey: versionsKey(strategyId),
     enabled: Boolean(strategyId),
     queryFn,
-    staleTime: 60 * 1000
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor ?? undefined,
+    select: (data) => data.pages.flatMap((page) => page.versions),
+    staleTime: VERSION_STALE_TIME
   });
 }
 
+function useVersionFetcher(strategyId: string | null) {
+  const supabase = useSupabaseClient();
+  const { session } = useSessionContext();
+
+  return useCallback(
+    async (versionId: string) => {
+      if (!strategyId) {
+        throw new Error("Strategy ID is required to load a version");
+      }
+      const token = await resolveAccessToken(session, supabase);
+      return getStrategyVersion(token, strategyId, versionId);
+    },
+    [session, strategyId, supabase]
+  );
+}
+
+/** Full version, graph included; fetched on demand and refetched once stale. */
+export function useStrategyVersion(strategyId: string | null, versionId: string | null) {
+  const fetchVersion = useVersionFetcher(strategyId);
+
+  return useQuery({
+    queryKey: versionKey(strategyId, versionId),
+    enabled: Boolean(strategyId && versionId),
+    queryFn: () => fetchVersion(versionId as string),
+    staleTime: VERSION_STALE_TIME
+  });
+}
+
+/** Imperative counterpart of `useStrategyVersion` for click handlers. */
+export function useLoadStrategyVersion(strategyId: string | null) {
+  const queryClient = useQueryClient();
+  const fetchVersion = useVersionFetcher(strategyId);
+
+  return useCallback(
+    (versionId: string) =>
+      queryClient.fetchQuery({
+        queryKey: versionKey(strategyId, versionId),
+        queryFn: () => fetchVersion(versionId),
+        staleTime: VERSION_STALE_TIME
+      }),
+    [fetchVersion, queryClient, strategyId]
+  );
+}
+
 export function useAutosaveStrategyVersion(strategyId: string | null) {
   const supabase = useSupabaseClient();
   const { session } = useSessionContext();
@@ -56,13 +166,7 @@ export function useAutosaveStrategyVersion(strategyId: string | null) {
       if (!strategyId) {
         return;
       }
-      queryClient.setQueryData(versionsKey(strategyId), (existing: StrategyVersionSummary[] | undefined) => {
-        if (!existing) {
-          return [version];
-        }
-        const deduped = existing.filter((item) => item.id !== version.id);
-        return [version, ...deduped];
-      });
+      rememberVersion(queryClient, strategyId, version);
     }
   });
 }
@@ -101,13 +205,7 @@ export function useRevertStrategyVersion(strategyId: string | null) {
       if (!strategyId) {
         return;
       }
-      queryClient.setQueryData(versionsKey(strategyId), (existing: StrategyVersionSummary[] | undefined) => {
-        if (!existing) {
-          return [version];
-        }
-        const deduped = existing.filter((item) => item.id !== version.id);
-        return [version, ...deduped];
-      });
+      rememberVersion(queryClient, strategyId, version);
     }
   });
 }
@@ -2,6 +2,8 @@ import type {
   CanvasValidationIssue,
   EducatorCallout,
   StrategyGraph,
+  StrategyVersionDiff,
+  StrategyVersionHistoryEntry,
   StrategyVersionSummary
 } from "@strategybuilder/shared";
 
@@ -40,15 +42,38 @@ async function request<T>(
   return (await response.json()) as T;
 }
 
-export async function listStrategyVersions(
+export async function listStrategyVersionHistory(
   token: string,
-  strategyId: string
-): Promise<StrategyVersionSummary[]> {
-  const payload = await request<{ versions: StrategyVersionSummary[] }>(
+  strategyId: string,
+  cursor?: string | null
+): Promise<{ versions: StrategyVersionHistoryEntry[]; nextCursor: string | null }> {
+  const params = new URLSearchParams({ view: "summary" });
+  if (cursor) {
+    params.set("cursor", cursor);
+  }
+  return request(token, `/strategies/${strategyId}/versions?${params.toString()}`);
+}
+
+export async function getStrategyVersion(
+  token: string,
+  strategyId: string,
+  versionId: string
+): Promise<StrategyVersionSummary> {
+  const payload = await request<{ version: StrategyVersionSummary }>(
     token,
-    `/strategies/${strategyId}/versions`
+    `/strategies/${strategyId}/versions/${versionId}`
   );
-  return payload.versions;
+  return payload.version;
+}
+
+export async function diffStrategyVersions(
+  token: string,
+  strategyId: string,
+  fromVersionId: string,
+  toVersionId: string
+): Promise<StrategyVersionDiff> {
+  const params = new URLSearchParams({ from: fromVersionId, to: toVersionId });
+  return request(token, `/strategies/${strategyId}/versions/diff?${params.toString()}`);
 }
 
 export async function createStrategyVersion(
@@ -2,7 +2,7 @@ import { act, fireEvent, render, screen, waitFor } from "@testing-library/react"
 import type { ReactNode } from "react";
 import { afterEach, beforeEach, describe, expect, it, vi } from "vitest";
 
-import type { StrategyVersionSummary } from "@strategybuilder/shared";
+import type { StrategyVersionHistoryEntry } from "@strategybuilder/shared";
 
 import { useStrategyCanvas } from "@/stores/useStrategyCanvas";
 
@@ -44,6 +44,7 @@ vi.mock("@xyflow/react", async () => {
 const validateSpy = vi.fn();
 const autosaveSpy = vi.fn();
 const revertSpy = vi.fn();
+const loadVersionSpy = vi.fn();
 
 const STRATEGY_ID = "11111111-1111-4111-8111-111111111111";
 
@@ -55,17 +56,29 @@ vi.mock("@/hooks/use-strategy-versions", () => {
           id: "version-history",
           version: 1,
           label: "Initial Seed",
-          graph: {
-            nodes: [],
-            edges: []
-          },
-          validationIssues: [],
+          nodeCount: 0,
+          edgeCount: 0,
+          errorCount: 0,
+          warningCount: 0,
           createdAt: new Date().toISOString(),
           updatedAt: new Date().toISOString()
         }
-      ] satisfies StrategyVersionSummary[],
-      isLoading: false
+      ] satisfies StrategyVersionHistoryEntry[],
+      isLoading: false,
+      hasNextPage: false,
+      isFetchingNextPage: false,
+      fetchNextPage: vi.fn()
     }),
+    useLoadStrategyVersion: () =>
+      loadVersionSpy.mockResolvedValue({
+        id: "version-history",
+        version: 1,
+        label: "Initial Seed",
+        graph: { nodes: [], edges: [] },
+        validationIssues: [],
+        createdAt: new Date().toISOString(),
+        updatedAt: new Date().toISOString()
+      }),
     useAutosaveStrategyVersion: () => ({
       mutateAsync: autosaveSpy.mockResolvedValue({
         id: "version-history",
@@ -139,6 +152,7 @@ afterEach(() => {
   validateSpy.mockClear();
   autosaveSpy.mockClear();
   revertSpy.mockClear();
+  loadVersionSpy.mockClear();
 });
 
 describe("StrategyCanvas integration", () => {
@@ -173,6 +187,7 @@ describe("StrategyCanvas integration", () => {
 
     fireEvent.click(screen.getByRole("button", { name: /Load/i }));
 
+    await waitFor(() => expect(loadVersionSpy).toHaveBeenCalledWith("version-history"));
     await waitFor(() => expect(onVersionSwitch).toHaveBeenCalled());
   });
 
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import asyncio
 import importlib
 import sys
+import uuid
 from collections.abc import Iterator
 from pathlib import Path
 
@@ -11,8 +13,10 @@ import pytest
 from celery import Celery
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-if str(PROJECT_ROOT) not in sys.path:
-    sys.path.insert(0, str(PROJECT_ROOT))
+API_ROOT = PROJECT_ROOT.parent / "api"
+for path in (PROJECT_ROOT, API_ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
 
 
 @pytest.fixture(autouse=True)
@@ -40,6 +44,9 @@ def test_celery_app_has_expected_configuration(celery_app: Celery) -> None:
     assert celery_app.conf.result_backend == "redis://example.com:1234/9"
     assert celery_app.conf.task_default_queue == "default"
     assert celery_app.conf.task_routes["worker.tasks.bootstrap_workspace"]["queue"] == "workspace"
+    assert celery_app.conf.task_routes["worker.tasks.provision_cohort"]["queue"] == "workspace"
+    assert celery_app.conf.task_routes["worker.tasks.thin_version_history"]["queue"] == "maintenance"
+    assert celery_app.conf.beat_schedule["thin-version-history"]["task"] == "worker.tasks.thin_version_history"
 
 
 
@@ -51,10 +58,134 @@ def test_health_check_returns_ok() -> None:
 
 
 
-def test_bootstrap_workspace_returns_pending_status() -> None:
-    """The workspace bootstrap task should echo the provided user identifier."""
-    from worker.tasks import bootstrap_workspace
+def test_bootstrap_workspace_provisions_once(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """The bootstrap task should seed the demo workspace and reuse it on repeat runs."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
 
-    result = bootstrap_workspace.run("user-123")
+    from app import models  # noqa: F401  # pylint: disable=unused-import
+    from app.db.base import Base
+    from worker import tasks
 
-    assert result == {"status": "pending", "user_id": "user-123"}
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'worker.db'}", poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def create_schema() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+
+    def run_in_session(operation):
+        async def runner():
+            async with session_factory() as session:
+                result = await operation(session)
+                await session.commit()
+                return result
+
+        return asyncio.run(runner())
+
+    asyncio.run(create_schema())
+    monkeypatch.setattr(tasks, "run_in_session", run_in_session)
+    user_id = str(uuid.uuid4())
+
+    first = tasks.bootstrap_workspace.run(user_id)
+    second = tasks.bootstrap_workspace.run(user_id)
+
+    assert first["status"] == "created"
+    assert first["user_id"] == user_id
+    assert second["status"] == "exists"
+    assert second["workspace_id"] == first["workspace_id"]
+    assert second["version_id"] == first["version_id"]
+
+
+
+def test_provision_cohort_batches_and_skips_provisioned_users(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """The cohort task should seed every known user once across batches."""
+    from sqlalchemy import func, select
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app import models  # noqa: F401  # pylint: disable=unused-import
+    from app.db.base import Base
+    from app.models.strategy import StrategyVersion
+    from app.models.user import User
+    from worker import tasks
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cohort.db'}", poolclass=NullPool)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    user_ids = [uuid.uuid4() for _ in range(7)]
+
+    async def create_schema() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with session_factory() as session:
+            session.add_all(
+                User(id=user_id, email=f"learner-{index}@example.com")
+                for index, user_id in enumerate(user_ids)
+            )
+            await session.commit()
+
+    async def count_versions() -> int:
+        async with session_factory() as session:
+            return await session.scalar(select(func.count()).select_from(StrategyVersion))
+
+    commits: list[object] = []
+
+    def run_in_session(operation):
+        async def runner():
+            async with session_factory() as session:
+                result = await operation(session)
+                await session.commit()
+                commits.append(result)
+                return result
+
+        return asyncio.run(runner())
+
+    asyncio.run(create_schema())
+    monkeypatch.setattr(tasks, "run_in_session", run_in_session)
+    unknown = str(uuid.uuid4())
+    cohort = [str(user_id) for user_id in user_ids]
+
+    first = tasks.provision_cohort.run(cohort[:4] + [unknown], batch_size=3)
+    second = tasks.provision_cohort.run(cohort, batch_size=3)
+
+    assert first == {"created": 4, "existing": 0, "missing": [unknown]}
+    assert second == {"created": 3, "existing": 4, "missing": []}
+    assert len(commits) == 5
+    assert asyncio.run(count_versions()) == 7
+
+
+
+def test_thin_version_history_requeues_until_done(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Each batch should checkpoint its cursor and queue the next batch until done."""
+    from app.services.version_retention_service import RetentionProgress
+    from worker import tasks
+
+    batches = iter([
+        RetentionProgress(strategies=2, removed=5, last_strategy_id=uuid.UUID(int=7), done=False),
+        3,
+    ])
+    queued: list[dict[str, object]] = []
+    monkeypatch.setattr(tasks, "run_in_session", lambda operation: next(batches))
+    monkeypatch.setattr(
+        tasks.thin_version_history_task, "apply_async", lambda kwargs: queued.append(kwargs)
+    )
+
+    first = tasks.thin_version_history_task.run(batch_size=2)
+
+    assert first["checkpoint"] == str(uuid.UUID(int=7))
+    assert first["done"] is False
+    assert queued == [{"after": str(uuid.UUID(int=7)), "batch_size": 2}]
+
+    batches = iter([
+        RetentionProgress(strategies=1, removed=1, last_strategy_id=uuid.UUID(int=9), done=True),
+        3,
+    ])
+    last = tasks.thin_version_history_task.run(after=str(uuid.UUID(int=7)), batch_size=2)
+
+    assert last["done"] is True
+    assert last["blobs_removed"] == 3
+    assert len(queued) == 1
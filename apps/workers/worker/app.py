@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 from celery import Celery
+from celery.schedules import crontab
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,13 +15,22 @@ celery_app = Celery(
     "strategybuilder",
     broker=REDIS_URL,
     backend=REDIS_URL,
+    include=["worker.tasks"],
 )
 
 celery_app.conf.update(
     task_routes={
         "worker.tasks.bootstrap_workspace": {"queue": "workspace"},
+        "worker.tasks.provision_cohort": {"queue": "workspace"},
+        "worker.tasks.thin_version_history": {"queue": "maintenance"},
     },
     task_default_queue="default",
+    beat_schedule={
+        "thin-version-history": {
+            "task": "worker.tasks.thin_version_history",
+            "schedule": crontab(minute=15, hour=3),
+        },
+    },
 )
 
 
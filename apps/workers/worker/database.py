@@ -0,0 +1,31 @@
+"""Helpers for running the API's async database services from Celery tasks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_engine, session_scope
+
+T = TypeVar("T")
+
+
+def run_in_session(operation: Callable[[AsyncSession], Awaitable[T]]) -> T:
+    """Run ``operation`` inside a committed session on a fresh event loop.
+
+    Celery tasks are synchronous, so every call gets its own loop; the engine's pool is
+    disposed afterwards because pooled asyncpg connections are bound to the loop that
+    opened them.
+    """
+
+    async def runner() -> T:
+        try:
+            async with session_scope() as session:
+                return await operation(session)
+        finally:
+            await get_engine().dispose()
+
+    return asyncio.run(runner())
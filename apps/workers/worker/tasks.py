@@ -2,10 +2,111 @@
 
 from __future__ import annotations
 
+import logging
+import uuid
+from typing import Any
+
 from celery import shared_task
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.version_retention_service import collect_orphan_blobs, thin_version_history
+from app.services.workspace_service import provision_cohort_workspaces, provision_demo_workspace
+
+from .database import run_in_session
+
+logger = logging.getLogger(__name__)
+
+RETENTION_BATCH_SIZE = 50
+BOOTSTRAP_MAX_RETRIES = 5
+COHORT_BATCH_SIZE = 500
 
 
-@shared_task(name="worker.tasks.bootstrap_workspace")
+@shared_task(
+    name="worker.tasks.bootstrap_workspace",
+    autoretry_for=(IntegrityError,),
+    retry_backoff=True,
+    max_retries=BOOTSTRAP_MAX_RETRIES,
+)
 def bootstrap_workspace(user_id: str) -> dict[str, str]:
-    """Placeholder bootstrap task that will be expanded with actual provisioning logic."""
-    return {"status": "pending", "user_id": user_id}
+    """Provision the demo workspace, strategy and seeded version for ``user_id``.
+
+    Uses the same ``provision_demo_workspace`` path as ``/workspaces/bootstrap``, so
+    racing the user's first request is safe.  An ``IntegrityError`` means the user row
+    is not visible yet and the task is retried with backoff.
+    """
+
+    async def provision(session: AsyncSession) -> dict[str, str]:
+        workspace, strategy, version, created = await provision_demo_workspace(
+            session, uuid.UUID(user_id)
+        )
+        return {
+            "status": "created" if created else "exists",
+            "user_id": user_id,
+            "workspace_id": str(workspace.id),
+            "strategy_id": str(strategy.id),
+            "version_id": str(version.id),
+        }
+
+    result = run_in_session(provision)
+    logger.info("workspaces.provisioned", extra=result)
+    return result
+
+
+@shared_task(name="worker.tasks.provision_cohort")
+def provision_cohort(user_ids: list[str], batch_size: int = COHORT_BATCH_SIZE) -> dict[str, Any]:
+    """Provision demo workspaces for a cohort of users ahead of a class or workshop.
+
+    Each batch is seeded with multi-row inserts and committed on its own, so re-running
+    the task after a failure skips the users already provisioned.  Ids without a user
+    row are reported back rather than failing the cohort.
+    """
+    created = existing = 0
+    missing: list[str] = []
+    for start in range(0, len(user_ids), batch_size):
+        batch = [uuid.UUID(user_id) for user_id in user_ids[start:start + batch_size]]
+        outcome = run_in_session(lambda session, batch=batch: provision_cohort_workspaces(session, batch))
+        created += outcome.created
+        existing += outcome.existing
+        missing.extend(str(user_id) for user_id in outcome.missing)
+        logger.info(
+            "workspaces.cohort.batch",
+            extra={"offset": start, "created": outcome.created, "existing": outcome.existing},
+        )
+
+    return {"created": created, "existing": existing, "missing": missing}
+
+
+@shared_task(bind=True, name="worker.tasks.thin_version_history")
+def thin_version_history_task(
+    self, after: str | None = None, batch_size: int = RETENTION_BATCH_SIZE
+) -> dict[str, Any]:
+    """Thin old autosaves for one bounded batch of strategies.
+
+    Each batch commits before the next is queued with the last processed strategy id,
+    so an interrupted run resumes from its latest checkpoint instead of starting over.
+    Orphaned graph blobs are collected once the final batch completes.
+    """
+    cursor = uuid.UUID(after) if after else None
+    progress = run_in_session(
+        lambda session: thin_version_history(session, after=cursor, batch_size=batch_size)
+    )
+    checkpoint = str(progress.last_strategy_id) if progress.last_strategy_id else None
+    logger.info(
+        "versions.retention.batch",
+        extra={"strategies": progress.strategies, "removed": progress.removed, "checkpoint": checkpoint},
+    )
+
+    blobs_removed = 0
+    if progress.done:
+        blobs_removed = run_in_session(collect_orphan_blobs)
+    else:
+        self.apply_async(kwargs={"after": checkpoint, "batch_size": batch_size})
+
+    return {
+        "strategies": progress.strategies,
+        "removed": progress.removed,
+        "checkpoint": checkpoint,
+        "done": progress.done,
+        "blobs_removed": blobs_removed,
+    }
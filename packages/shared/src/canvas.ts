@@ -8,11 +8,21 @@ export type CanvasValidationSeverity = "error" | "warning";
 
 export type CanvasValidationIssue = {
   nodeId: string | null;
+  edgeId?: string | null;
   code: string;
   message: string;
   severity: CanvasValidationSeverity;
 };
 
+/** Compact issue returned with `issueFormat=compact`: [code, nodeId, edgeId, params]. */
+export type CanvasCompactValidationIssue = [
+  number,
+  string | null,
+  string | null,
+  Array<string | number>,
+  string?
+];
+
 export type CanvasBlockPortDefinition = {
   id: string;
   label: string;
@@ -95,10 +105,52 @@ export interface StrategyVersionSummary {
   label: string;
   graph: StrategyGraph;
   validationIssues: CanvasValidationIssue[];
+  executionOrder?: string[] | null;
   createdAt: string;
   updatedAt: string | null;
 }
 
+/** Graph-free history entry returned with `view=summary`. */
+export interface StrategyVersionHistoryEntry {
+  id: string;
+  version: number;
+  label: string;
+  nodeCount: number | null;
+  edgeCount: number | null;
+  errorCount: number | null;
+  warningCount: number | null;
+  createdAt: string;
+  updatedAt: string | null;
+}
+
+/** Old and new value of a field; `null` stands for an absent value. */
+export interface ValueChange {
+  before: unknown;
+  after: unknown;
+}
+
+/** Fields and block parameters that differ on a node or edge kept in both versions. */
+export interface GraphItemChange {
+  id: string;
+  fields: Record<string, ValueChange>;
+  parameters: Record<string, ValueChange>;
+}
+
+export interface GraphCollectionDiff<T> {
+  added: T[];
+  removed: T[];
+  changed: GraphItemChange[];
+}
+
+/** Structural diff between two versions returned by `GET /versions/diff`. */
+export interface StrategyVersionDiff {
+  fromVersion: number;
+  toVersion: number;
+  nodes: GraphCollectionDiff<StrategyNode>;
+  edges: GraphCollectionDiff<StrategyEdge>;
+  properties: Record<string, ValueChange>;
+}
+
 const { signalTypes = [], blocks = [] } = rawDefinitions as {
   signalTypes?: CanvasSignalType[];
   blocks?: CanvasBlockDefinition[];